@@ -8,7 +8,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
 import sys
-import time
+
+from waits import wait_for_count
 
 
 class Crawler():
@@ -123,7 +124,8 @@ class Crawler():
         result = []
         url = f'https://msearch.shopping.naver.com/search/all?query={keyword}&prevQuery={keyword}'
         self.driver.get(url=url)
-        time.sleep(delay)
+        # 연관 키워드가 나타나면 바로 진행 (최대 delay 초)
+        wait_for_count(self.driver, '.intentKeyword_list_pannel__thfp_ a', timeout=delay, key='naver_shopping', settle=0.5)
         try:
             page_source = self.driver.page_source
             soup = BeautifulSoup(page_source, 'html.parser')
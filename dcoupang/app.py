@@ -1,4 +1,5 @@
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 import logging
 from datetime import datetime
 import time
@@ -6,8 +7,13 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import traceback
 import atexit
+import os
 
 from scraper import Scraper
+from singleflight import SingleFlight
+from result_cache import ResultCache
+from batch import BatchRequest, BatchScheduler
+from streaming import negotiate, stream_response
 
 app = FastAPI(
     title="Coupang Suggestion Scraper",
@@ -16,7 +22,12 @@ app = FastAPI(
 )
 
 # ThreadPoolExecutor 설정
-executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scraper_worker")
+SCRAPER_MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "4"))
+executor = ThreadPoolExecutor(max_workers=SCRAPER_MAX_WORKERS, thread_name_prefix="scraper_worker")
+# 동일 키워드 동시 요청은 하나의 브라우저 작업 결과를 공유
+single_flight = SingleFlight()
+# 연관검색어 결과 캐시 (fresh 6시간, stale 24시간)
+result_cache = ResultCache({'coupang': (6 * 3600, 24 * 3600)})
 
 # 로거 설정
 logging.basicConfig(
@@ -55,6 +66,71 @@ def crawl_coupang_sync(keyword: str):
         # scraper.py 내부에서 로깅하고 있으므로 여기선 re-raise하거나 빈 리스트 반환
         raise e
 
+async def run_batch_keyword(endpoint: str, keyword: str, limit=None):
+    """배치 키워드 하나 실행 (단건 요청과 같은 캐시/single-flight 경로, 스크래핑 직전에 속도 제한)"""
+    loop = asyncio.get_running_loop()
+
+    async def scrape():
+        await batch_scheduler.throttle(endpoint)
+        return await loop.run_in_executor(executor, crawl_coupang_sync, keyword)
+
+    return await result_cache.get_or_load(
+        'coupang',
+        keyword,
+        lambda: single_flight.do('coupang', keyword, scrape)
+    )
+
+# 배치 요청은 키워드를 job 별로 돌아가며 실행
+batch_scheduler = BatchScheduler(run_batch_keyword, {'coupang': 'coupang'}, concurrency=SCRAPER_MAX_WORKERS)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await batch_scheduler.close()
+    result_cache.close()
+
+@app.post(
+    "/batch",
+    summary="쿠팡 연관검색어 배치 크롤링",
+    description="여러 키워드를 한 번에 받아 서버에서 나눠 실행합니다. job_id로 결과를 조회하거나 NDJSON/SSE로 바로 받습니다.",
+    response_model=None
+)
+async def batch(request: Request, body: BatchRequest):
+    """키워드 배치 엔드포인트
+
+    Args:
+        body: {'keywords': [str, ...]}
+
+    Returns:
+        {'job_id': str, ...} (GET /batch/{job_id} 로 진행 상황/결과 조회)
+        Accept: application/x-ndjson 또는 text/event-stream 이면 키워드 결과를 완료되는 대로 스트리밍
+    """
+    try:
+        job = batch_scheduler.submit(body.endpoint, body.keywords, body.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = negotiate(request)
+    if media_type is not None:
+        return stream_response(media_type, batch_scheduler.stream(job))
+    return JSONResponse(status_code=202, content=job.to_dict(offset=job.total))
+
+@app.get("/batch/{job_id}")
+async def batch_status(job_id: str, offset: int = 0):
+    """배치 진행 상황과 offset 이후에 완료된 결과"""
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job.to_dict(offset=offset)
+
+@app.delete("/batch/{job_id}")
+async def batch_cancel(job_id: str):
+    """아직 시작하지 않은 키워드 취소"""
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    batch_scheduler.cancel(job)
+    return job.to_dict(offset=len(job.results))
+
 @app.get("/search/coupang")
 async def search_suggestions(keyword: str):
     """
@@ -67,7 +143,15 @@ async def search_suggestions(keyword: str):
     try:
         loop = asyncio.get_running_loop()
         # ThreadPoolExecutor를 사용하여 동기 함수를 비동기로 실행
-        result = await loop.run_in_executor(executor, crawl_coupang_sync, keyword)
+        result = await result_cache.get_or_load(
+            'coupang',
+            keyword,
+            lambda: single_flight.do(
+                'coupang',
+                keyword,
+                lambda: loop.run_in_executor(executor, crawl_coupang_sync, keyword)
+            )
+        )
         return result
     except Exception as e:
         logger.error(f"API Error: {e}")
@@ -76,3 +160,11 @@ async def search_suggestions(keyword: str):
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/stats")
+async def get_stats():
+    return {
+        "single_flight_stats": single_flight.get_stats(),
+        "result_cache_stats": result_cache.get_stats(),
+        "batch_stats": batch_scheduler.get_stats()
+    }
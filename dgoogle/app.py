@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from scraper import Scraper
+from singleflight import SingleFlight
 import re
 from urllib.parse import unquote
 import time
@@ -15,6 +16,8 @@ app = FastAPI()
 
 # Google browser scraping uses a shared Xvfb display on Linux, so run one job at a time.
 executor = ThreadPoolExecutor(max_workers=1)
+# 동일 키워드 동시 요청은 하나의 브라우저 작업 결과를 공유 (작은 limit은 큰 limit 결과를 잘라서 사용)
+single_flight = SingleFlight()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
 def google_task(keywords: str, limit: int = 100):
@@ -67,7 +70,12 @@ async def search_google(keywords: str, limit: int = 100):
 
     try:
         loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(executor, google_task, keywords, limit)
+        result = await single_flight.do(
+            'google',
+            keywords,
+            lambda: loop.run_in_executor(executor, google_task, keywords, limit),
+            limit=limit
+        )
     except Exception as e:
         logger.error(f"Error: {e} keyword : {keywords} at traceback: {traceback.print_exc()}")
         traceback.print_exc()
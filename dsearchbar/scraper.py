@@ -1,12 +1,11 @@
 import json
 import logging
 import re
-import time
 import traceback
 from datetime import datetime, timezone, timedelta
 from dateutil.relativedelta import relativedelta
 
-from bs4 import BeautifulSoup
+from parsing import parse_html
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import (
@@ -17,7 +16,10 @@ from selenium.webdriver.support import expected_conditions as EC
 
 # 개선된 셀레니움 드라이버(사용 환경에 맞춰 구현)
 from selenium_driver import SeleniumDriver
+from waits import wait_for_count, wait_for_idle
 
+# 유튜브 검색창 자동완성 항목
+SUGGESTION_SELECTOR = "div.ytSuggestionComponentSuggestion"
 
 class Scraper:
     def __init__(self):
@@ -54,10 +56,11 @@ class Scraper:
 
                 self.logger.info("Start scrolling...")
                 self.scroll_down(driver, nloop=limit + 1)
-                time.sleep(2)  # 페이지 로딩이 완전히 끝날 때까지 대기
+                # 페이지 로딩이 끝날 때까지 대기 (DOM 변경과 요청이 멈추면 바로 진행, 최대 2초)
+                wait_for_idle(driver, quiet=0.3, timeout=2.0, key='youtube_results')
 
                 # 검색 결과 페이지 파싱
-                soup = BeautifulSoup(driver.page_source, "html.parser")
+                soup = parse_html(driver.page_source)
                 all_items = soup.select("ytd-video-renderer, ytd-reel-item-renderer")
 
                 self.logger.info(f"Parsed {len(all_items)} items from search page.")
@@ -209,7 +212,7 @@ class Scraper:
             scroll_increment = 300
             for i in range(nloop):
                 driver.execute_script(f"window.scrollBy(0, {scroll_increment});")
-                time.sleep(1)
+                wait_for_idle(driver, quiet=0.3, timeout=1.0, key='youtube_scroll')
                 self.logger.debug(f"Scrolled down by {scroll_increment} pixels")
         except WebDriverException as e:
             self.logger.error(f"Error during scroll: {e}")
@@ -315,10 +318,10 @@ class Scraper:
                 search.send_keys(query)
                 
                 # 검색어 제안이 로드될 때까지 대기
-                time.sleep(1)
+                wait_for_count(driver, "#suggest a.kwd", timeout=1.0, key='coupang_suggest', settle=0.5)
                 
                 # 검색어 제안 파싱
-                soup = BeautifulSoup(driver.page_source, "html.parser")
+                soup = parse_html(driver.page_source)
                 suggest_div = soup.find("div", id="suggest")
                 
                 if suggest_div:
@@ -358,10 +361,11 @@ class Scraper:
             # 검색창에 포커스
             search_input = driver.find_element(By.CSS_SELECTOR, "input[name='search_query']")
             search_input.click()
-            time.sleep(1)  # 자동완성 항목이 로드될 때까지 대기
+            # 자동완성 항목이 로드될 때까지 대기
+            wait_for_count(driver, SUGGESTION_SELECTOR, timeout=1.0, key='youtube_suggest', settle=0.5)
             
             # 자동완성 항목 파싱 - 더 정확한 선택자 사용
-            suggestion_elements = driver.find_elements(By.CSS_SELECTOR, "div.ytSuggestionComponentSuggestion")
+            suggestion_elements = driver.find_elements(By.CSS_SELECTOR, SUGGESTION_SELECTOR)
             
             for element in suggestion_elements:
                 try:
@@ -400,10 +404,11 @@ class Scraper:
                     # 검색창에 입력
                     search_input.clear()
                     search_input.send_keys("속건조")
-                    time.sleep(1)  # 자동완성 항목이 로드될 때까지 대기
+                    # 자동완성 항목이 다시 로드될 때까지 대기 (이전 항목이 남아 있으므로 개수 대신 변경이 멈출 때까지)
+                    wait_for_idle(driver, quiet=0.3, timeout=1.0, key='youtube_suggest_retype')
                     
                     # 자동완성 항목 다시 파싱
-                    suggestion_elements = driver.find_elements(By.CSS_SELECTOR, "div.ytSuggestionComponentSuggestion")
+                    suggestion_elements = driver.find_elements(By.CSS_SELECTOR, SUGGESTION_SELECTOR)
                     
                     for element in suggestion_elements:
                         try:
@@ -7,7 +7,7 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 from dateutil.relativedelta import relativedelta
 
-from bs4 import BeautifulSoup
+from parsing import parse_html
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import (
@@ -58,7 +58,7 @@ class Scraper:
                 time.sleep(2)  # 페이지 로딩이 완전히 끝날 때까지 대기
 
                 # 검색 결과 페이지 파싱
-                soup = BeautifulSoup(driver.page_source, "html.parser")
+                soup = parse_html(driver.page_source)
                 all_items = soup.select("ytd-video-renderer, ytd-reel-item-renderer")
 
                 self.logger.info(f"Parsed {len(all_items)} items from search page.")
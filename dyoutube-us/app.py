@@ -3,6 +3,7 @@ import logging
 from datetime import datetime
 import time
 import asyncio
+import os
 from concurrent.futures import ThreadPoolExecutor
 import traceback
 import atexit
@@ -16,8 +17,11 @@ app = FastAPI(
     version="2.0.0"
 )
 
-# ThreadPoolExecutor 설정 (8GB 메모리 안정을 위해 max_workers 제한)
-executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scraper_worker")
+# ThreadPoolExecutor 설정
+# 동시에 구동하는 브라우저 수는 드라이버 풀(SELENIUM_POOL_SIZE)과 호스트 메모리 상태로 제한되므로
+# 워커 스레드 수는 대기 요청을 받아둘 만큼만 별도로 조정한다.
+SCRAPER_MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "4"))
+executor = ThreadPoolExecutor(max_workers=SCRAPER_MAX_WORKERS, thread_name_prefix="scraper_worker")
 
 # 애플리케이션 시작 시 로거 설정
 logging.basicConfig(
@@ -26,6 +30,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("uvicorn")
 
+# 애플리케이션 시작 시 드라이버를 미리 띄워 첫 요청이 Chrome 구동을 기다리지 않도록 함
+@app.on_event("startup")
+async def startup_event():
+    """드라이버 풀 prewarm (백그라운드 진행)"""
+    get_driver_pool().prewarm()
+
 # 애플리케이션 종료 시 드라이버 풀 정리
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -162,7 +172,17 @@ async def get_stats():
         "description": {
             "total_requests": "총 Selenium 요청 수",
             "driver_restarts": "드라이버 재시작 횟수",
-            "driver_errors": "드라이버 에러 발생 횟수"
+            "driver_errors": "드라이버 에러 발생 횟수",
+            "pool_size": "동시에 구동하는 최대 브라우저 수 (SELENIUM_POOL_SIZE)",
+            "waiting": "유휴 드라이버를 기다리는 요청 수 (대기열 길이)",
+            "avg_wait_time": "드라이버 대여까지의 평균 대기 시간 (초)",
+            "inline_creations": "요청 처리 중 드라이버를 직접 생성한 횟수 (prewarm/백그라운드 교체 실패 시)",
+            "recycled_rss": "Chrome 프로세스 트리 RSS 초과로 교체한 횟수 (SELENIUM_DRIVER_MAX_RSS_MB)",
+            "concurrency_limit": "호스트 메모리 상태에 따른 현재 동시 대여 가능 드라이버 수",
+            "shed_waits": "호스트 메모리 부족으로 대기한 요청 수",
+            "tab_mode": "탭 사용 방식 (persistent: 작업 탭 재사용, new_tab: 요청마다 새 탭)",
+            "avg_tab_setup_ms": "요청 전 탭 준비 평균 시간 (ms)",
+            "avg_tab_teardown_ms": "요청 후 탭 정리 평균 시간 (ms)"
         }
     }
 
@@ -189,10 +209,10 @@ async def root():
         ],
         "performance": {
             "driver_pooling": "매 요청마다 Chrome을 열지 않고 재사용",
-            "first_request": "3-10초 (드라이버 생성 포함)",
+            "first_request": "시작 시 미리 띄운 드라이버 사용 (prewarm 완료 전에는 대기)",
             "subsequent_requests": "더 빠른 응답 (드라이버 재사용)",
-            "auto_restart": "100개 요청마다 드라이버 자동 재시작"
+            "auto_restart": "Chrome 메모리/핸들 사용량 초과 시 백그라운드에서 교체 드라이버를 만든 뒤 재시작 (최대 사용 횟수는 안전장치)"
         },
-        "note": "첫 요청은 드라이버 생성으로 느릴 수 있지만, 이후 요청은 더 빠릅니다!"
+        "note": "드라이버는 앱 시작 시 미리 생성되고 재시작도 백그라운드에서 진행되어 요청이 Chrome 구동 시간을 기다리지 않습니다."
     }
 
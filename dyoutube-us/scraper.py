@@ -7,7 +7,7 @@ import traceback
 from datetime import datetime, timezone, timedelta
 from dateutil.relativedelta import relativedelta
 
-from bs4 import BeautifulSoup
+from parsing import parse_html
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import (
@@ -127,14 +127,14 @@ class Scraper:
                     self.logger.error("[YOUTUBE] Page source is empty or too short")
                     return results
                 
-                soup = BeautifulSoup(html_content, "html.parser")
+                soup = parse_html(html_content)
                 all_items = soup.select("ytd-video-renderer, ytd-reel-item-renderer, ytm-shorts-lockup-view-model")
 
                 self.logger.info(f"[YOUTUBE] Parsed {len(all_items)} items from search page.")
                 results = self._parse_items(driver, all_items, limit)
                 self.logger.info(f"[YOUTUBE] Scraped total {len(results)} items.")
                 
-                # 메모리 안정성 개선: BeautifulSoup 객체 및 대용량 HTML 문자열 명시적 해제
+                # 메모리 안정성 개선: 파싱 결과 및 대용량 HTML 문자열 명시적 해제
                 soup.decompose()
                 del soup
                 del html_content
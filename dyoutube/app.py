@@ -1,14 +1,28 @@
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 import logging
 from datetime import datetime
 import time
 import asyncio
+import os
 from concurrent.futures import ThreadPoolExecutor
 import traceback
 import atexit
+import functools
+from typing import Optional
+from pydantic import BaseModel
 
 from scraper import Scraper
 from selenium_pool import get_driver_pool, cleanup_driver_pool
+from tab_pool import DRIVER_MODE, get_tab_pool, cleanup_tab_pool
+from singleflight import SingleFlight
+from streaming import iterate_in_thread, keyword_events, negotiate, stream_response
+from batch import BatchRequest, BatchScheduler
+from job_queue import JobQueue
+from resource_blocking import PROFILES, get_block_stats, resolve_profile
+from extraction import get_extraction_stats
+from search_data import get_search_data_stats
+from waits import get_wait_stats
 
 app = FastAPI(
     title="YouTube Scraper",
@@ -16,8 +30,17 @@ app = FastAPI(
     version="2.0.0"
 )
 
-# ThreadPoolExecutor 설정 (8GB 메모리 안정을 위해 max_workers 제한)
-executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scraper_worker")
+# ThreadPoolExecutor 설정
+# 동시에 구동하는 브라우저 수는 드라이버 풀(SELENIUM_POOL_SIZE)과 호스트 메모리 상태로 제한되므로
+# 워커 스레드 수는 대기 요청을 받아둘 만큼만 별도로 조정한다.
+SCRAPER_MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "4"))
+executor = ThreadPoolExecutor(max_workers=SCRAPER_MAX_WORKERS, thread_name_prefix="scraper_worker")
+
+# 동일 키워드 동시 요청은 하나의 스크래핑 결과를 공유
+single_flight = SingleFlight()
+
+# 오래 걸리는 크롤링은 큐에 넣고 별도 크롤링 워커 프로세스(crawl_worker.py)가 처리
+job_queue = JobQueue()
 
 # 애플리케이션 시작 시 로거 설정
 logging.basicConfig(
@@ -26,16 +49,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger("uvicorn")
 
+# 애플리케이션 시작 시 드라이버를 미리 띄워 첫 요청이 Chrome 구동을 기다리지 않도록 함
+@app.on_event("startup")
+async def startup_event():
+    """드라이버 풀 prewarm (백그라운드 진행)"""
+    if DRIVER_MODE == 'tabs':
+        get_tab_pool().prewarm()
+    else:
+        get_driver_pool().prewarm()
+
 # 애플리케이션 종료 시 드라이버 풀 정리
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 리소스 정리"""
     logger.info("Application shutting down, cleaning up driver pool...")
     cleanup_driver_pool()
+    cleanup_tab_pool()
+    await batch_scheduler.close()
+    job_queue.close()
     logger.info("Driver pool cleanup completed")
 
 # 프로세스 종료 시에도 정리
 atexit.register(cleanup_driver_pool)
+atexit.register(cleanup_tab_pool)
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -56,12 +92,13 @@ async def log_requests(request: Request, call_next):
 async def test():
     return {"result": "test success"}
 
-def list_task(keyword: str, limit: int = 3):
+def list_task(keyword: str, limit: int = 3, block: Optional[str] = None):
     """유튜브 검색 작업 (동기 함수)
     
     Args:
         keyword: 검색 키워드
         limit: 검색 결과 개수
+        block: 리소스 차단 프로필 (없으면 RESOURCE_BLOCK_PROFILE)
         
     Returns:
         검색 결과 딕셔너리
@@ -73,7 +110,7 @@ def list_task(keyword: str, limit: int = 3):
     }
     try:
         scraper = Scraper()
-        result_data = scraper.get_list(keyword, limit)
+        result_data = scraper.get_list(keyword, limit, block=block)
         result = {
             'keyword': keyword,
             'result': result_data
@@ -84,21 +121,145 @@ def list_task(keyword: str, limit: int = 3):
         logger.error(f"[WORKER] Exception in list_task: {e}")
     return result
 
+async def run_batch_keyword(endpoint: str, keyword: str, limit=None):
+    """배치 키워드 하나 실행 (단건 요청과 같은 single-flight 경로, 스크래핑 직전에 속도 제한)"""
+    loop = asyncio.get_running_loop()
+    limit = limit or 20
+    block = resolve_profile(None)
+
+    async def scrape():
+        await batch_scheduler.throttle(endpoint)
+        return await loop.run_in_executor(executor, list_task, keyword, limit, block)
+
+    # 차단 프로필마다 결과(누락 필드 등)가 다를 수 있으므로 프로필별로 묶음
+    return await single_flight.do('search_list', f'{keyword}|{block}', scrape, limit=limit)
+
+# 배치 요청은 키워드를 job 별로 돌아가며 실행
+batch_scheduler = BatchScheduler(run_batch_keyword, {'search_list': 'youtube'}, concurrency=SCRAPER_MAX_WORKERS)
+
+@app.post(
+    "/batch",
+    summary="유튜브 검색 결과 배치 스크래핑",
+    description="여러 키워드를 한 번에 받아 서버에서 나눠 실행합니다. job_id로 결과를 조회하거나 NDJSON/SSE로 바로 받습니다.",
+    response_model=None
+)
+async def batch(request: Request, body: BatchRequest):
+    """키워드 배치 엔드포인트
+
+    Args:
+        body: {'keywords': [str, ...], 'limit': 키워드별 검색 결과 개수 (기본값: 20)}
+
+    Returns:
+        {'job_id': str, ...} (GET /batch/{job_id} 로 진행 상황/결과 조회)
+        Accept: application/x-ndjson 또는 text/event-stream 이면 키워드 결과를 완료되는 대로 스트리밍
+    """
+    try:
+        job = batch_scheduler.submit(body.endpoint, body.keywords, body.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = negotiate(request)
+    if media_type is not None:
+        return stream_response(media_type, batch_scheduler.stream(job))
+    return JSONResponse(status_code=202, content=job.to_dict(offset=job.total))
+
+@app.get("/batch/{job_id}")
+async def batch_status(job_id: str, offset: int = 0):
+    """배치 진행 상황과 offset 이후에 완료된 결과"""
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job.to_dict(offset=offset)
+
+@app.delete("/batch/{job_id}")
+async def batch_cancel(job_id: str):
+    """아직 시작하지 않은 키워드 취소"""
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    batch_scheduler.cancel(job)
+    return job.to_dict(offset=len(job.results))
+
+class JobRequest(BaseModel):
+    keywords: str
+    limit: int = 20
+    priority: str = 'normal'
+
+@app.post(
+    "/jobs",
+    summary="유튜브 검색 크롤링 작업 등록",
+    description="검색 크롤링을 작업 큐에 넣고 바로 job_id를 반환합니다. 크롤링은 별도 워커 프로세스가 처리합니다.",
+    response_model=None
+)
+async def create_job(body: JobRequest):
+    """크롤링 작업 등록 엔드포인트
+
+    Args:
+        body: {'keywords': 검색 키워드, 'limit': 검색 결과 개수, 'priority': 'high' | 'normal' | 'low'}
+
+    Returns:
+        {'job_id': str, 'status': 'queued', ...} (GET /jobs/{job_id} 로 상태/결과 조회)
+    """
+    keywords = body.keywords.strip()
+    if not keywords:
+        raise HTTPException(status_code=400, detail="Keyword cannot be empty.")
+    if body.limit <= 0:
+        raise HTTPException(status_code=400, detail="Limit must be greater than 0.")
+    try:
+        job_id = job_queue.enqueue('search_list', {'keyword': keywords, 'limit': body.limit}, body.priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"[API] Queued job {job_id} for {keywords}, limit: {body.limit}, priority: {body.priority}")
+    return JSONResponse(status_code=202, content=job_status(job_id))
+
+def job_status(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    job.pop('payload')
+    if job['status'] == 'queued':
+        job['position'] = job_queue.position(job_id)
+    return job
+
+@app.get(
+    "/jobs/{job_id}",
+    summary="크롤링 작업 상태/결과 조회",
+    description="queued, running, done, failed, cancelled 상태와 완료된 경우 결과를 반환합니다.",
+    response_model=None
+)
+async def get_job(job_id: str):
+    return job_status(job_id)
+
+@app.delete(
+    "/jobs/{job_id}",
+    summary="크롤링 작업 취소",
+    description="아직 시작하지 않은 작업을 취소합니다.",
+    response_model=None
+)
+async def cancel_job(job_id: str):
+    if not job_queue.cancel(job_id):
+        job_status(job_id)
+        raise HTTPException(status_code=409, detail="Job is already running or finished.")
+    return job_status(job_id)
+
 @app.get(
     "/search/list",
     summary="유튜브 검색 결과 스크래핑",
     description="유튜브 검색 결과를 스크래핑합니다. 드라이버 풀을 사용하여 성능을 최적화했습니다.",
     response_model=None
 )
-async def search_list(keywords: str, limit: int = 20):
+async def search_list(request: Request, keywords: str, limit: int = 20, block: Optional[str] = None):
     """유튜브 검색 결과 스크래핑 엔드포인트
     
     Args:
         keywords: 검색 키워드
         limit: 검색 결과 개수 (기본값: 20)
+        block: 리소스 차단 프로필 (youtube, none 등, 기본값: RESOURCE_BLOCK_PROFILE)
         
     Returns:
         {'keyword': str, 'result': [동영상 정보들...]}
+        Accept: application/x-ndjson 또는 text/event-stream 이면 스크롤 중 파싱되는 결과를 하나씩 스트리밍
+        (streaming.py 참고, 동일 키워드 요청 합치기는 적용되지 않음)
         
     Raises:
         HTTPException: 입력 검증 실패 또는 스크래핑 실패 시
@@ -115,11 +276,27 @@ async def search_list(keywords: str, limit: int = 20):
         logger.error("[API] Invalid limit received.")
         raise HTTPException(status_code=400, detail="Limit must be greater than 0.")
 
+    try:
+        block = resolve_profile(block)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = negotiate(request)
+    if media_type is not None:
+        items = iterate_in_thread(executor, functools.partial(Scraper().get_list, block=block), keywords, limit)
+        # 최대 20분(1200초), 초과 시 그때까지 보낸 결과는 유지하고 error 이벤트로 종료
+        return stream_response(media_type, keyword_events(keywords, items), timeout=1200)
+
     try:
         loop = asyncio.get_running_loop()
         # 최대 20분(1200초)까지 대기
         result = await asyncio.wait_for(
-            loop.run_in_executor(executor, list_task, keywords, limit),
+            single_flight.do(
+                'search_list',
+                f'{keywords}|{block}',
+                lambda: loop.run_in_executor(executor, list_task, keywords, limit, block),
+                limit=limit
+            ),
             timeout=1200
         )
         logger.info(f"[API] Successfully completed search for {keywords}")
@@ -154,15 +331,38 @@ async def health_check():
 )
 async def get_stats():
     """드라이버 풀 통계 엔드포인트"""
-    pool = get_driver_pool()
+    pool = get_tab_pool() if DRIVER_MODE == 'tabs' else get_driver_pool()
     stats = pool.get_stats()
     
     return {
         "driver_pool_stats": stats,
+        "single_flight_stats": single_flight.get_stats(),
+        "batch_stats": batch_scheduler.get_stats(),
+        "job_queue_stats": job_queue.get_stats(),
+        "resource_block_stats": get_block_stats().get_stats(),
+        "wait_stats": get_wait_stats(),
+        "extraction_stats": get_extraction_stats(),
+        "search_data_stats": get_search_data_stats(),
         "description": {
             "total_requests": "총 Selenium 요청 수",
             "driver_restarts": "드라이버 재시작 횟수",
-            "driver_errors": "드라이버 에러 발생 횟수"
+            "driver_errors": "드라이버 에러 발생 횟수",
+            "pool_size": "동시에 구동하는 최대 브라우저 수 (SELENIUM_POOL_SIZE)",
+            "waiting": "유휴 드라이버를 기다리는 요청 수 (대기열 길이)",
+            "avg_wait_time": "드라이버 대여까지의 평균 대기 시간 (초)",
+            "inline_creations": "요청 처리 중 드라이버를 직접 생성한 횟수 (prewarm/백그라운드 교체 실패 시)",
+            "recycled_rss": "Chrome 프로세스 트리 RSS 초과로 교체한 횟수 (SELENIUM_DRIVER_MAX_RSS_MB)",
+            "concurrency_limit": "호스트 메모리 상태에 따른 현재 동시 대여 가능 드라이버 수",
+            "shed_waits": "호스트 메모리 부족으로 대기한 요청 수",
+            "tab_mode": "탭 사용 방식 (persistent: 작업 탭 재사용, new_tab: 요청마다 새 탭)",
+            "avg_tab_setup_ms": "요청 전 탭 준비 평균 시간 (ms)",
+            "avg_tab_teardown_ms": "요청 후 탭 정리 평균 시간 (ms)",
+            "coalesced": "진행 중인 동일 요청에 합류한 요청 수",
+            "queued": "배치 대기 키워드 수 (job 별로 돌아가며 실행)",
+            "rate_limits": "배치 사이트별 초당 스크래핑 수와 속도 제한으로 대기한 횟수",
+            "queued_by_priority": "작업 큐의 우선순위별 대기 작업 수 (크롤링 워커 프로세스가 처리)",
+            "blocked_by_type": "리소스 차단 프로필별로 네트워크 단계에서 차단한 요청 수 (리소스 종류별)",
+            "estimated_bytes_saved": "none 프로필 페이지 평균 전송량 대비 절약한 바이트 추정치 (block=none 요청이 있어야 계산)"
         }
     }
 
@@ -177,7 +377,10 @@ async def root():
         "service": "YouTube Scraper API",
         "version": "2.0.0",
         "endpoints": {
-            "search": "/search/list?keywords={keyword}&limit={limit}",
+            "search": "/search/list?keywords={keyword}&limit={limit}&block={profile}",
+            "block_profiles": sorted(PROFILES),
+            "batch": "POST /batch {'keywords': [...], 'limit': n}, GET /batch/{job_id}",
+            "jobs": "POST /jobs {'keywords': ..., 'limit': n, 'priority': 'high|normal|low'}, GET /jobs/{job_id}",
             "health": "/health",
             "stats": "/stats"
         },
@@ -189,10 +392,10 @@ async def root():
         ],
         "performance": {
             "driver_pooling": "매 요청마다 Chrome을 열지 않고 재사용",
-            "first_request": "3-10초 (드라이버 생성 포함)",
+            "first_request": "시작 시 미리 띄운 드라이버 사용 (prewarm 완료 전에는 대기)",
             "subsequent_requests": "더 빠른 응답 (드라이버 재사용)",
-            "auto_restart": "100개 요청마다 드라이버 자동 재시작"
+            "auto_restart": "Chrome 메모리/핸들 사용량 초과 시 백그라운드에서 교체 드라이버를 만든 뒤 재시작 (최대 사용 횟수는 안전장치)"
         },
-        "note": "첫 요청은 드라이버 생성으로 느릴 수 있지만, 이후 요청은 더 빠릅니다!"
+        "note": "드라이버는 앱 시작 시 미리 생성되고 재시작도 백그라운드에서 진행되어 요청이 Chrome 구동 시간을 기다리지 않습니다."
     }
 
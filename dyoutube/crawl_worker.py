@@ -0,0 +1,153 @@
+"""
+크롤링 워커 프로세스
+job_queue 의 작업을 가져와 HTTP 워커(gunicorn)와 분리된 프로세스에서 크롤링한다.
+gunicorn 마스터가 준비되면 함께 실행되고(gunicorn.conf.py, CRAWL_WORKERS=0 이면 실행 안 함), 직접 실행도 가능하다.
+
+    python crawl_worker.py
+
+- CRAWL_WORKERS 개의 자식 프로세스가 각각 작업을 하나씩 처리하고, 죽은 자식 프로세스는 다시 띄운다
+  (처리 중이던 작업은 임대가 만료되면 다른 프로세스가 다시 가져감)
+- 실행 중에는 임대를 주기적으로 연장하고, JOB_TIMEOUT_SEC 가 지나면 작업을 실패로 기록(시도 횟수가 남았으면
+  다시 대기열로)한 뒤 멈춘 크롤링을 끝낼 수 없으므로 워커 프로세스 그룹(Chrome 포함)을 종료해 다시 띄우게 한다
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+from job_queue import JobQueue
+
+CRAWL_WORKERS = int(os.environ.get('CRAWL_WORKERS', '1'))
+JOB_POLL_SEC = float(os.environ.get('JOB_POLL_SEC', '1'))
+JOB_TIMEOUT_SEC = float(os.environ.get('JOB_TIMEOUT_SEC', '1200'))
+# 보관 기간이 지난 작업 정리 주기 (초)
+PRUNE_INTERVAL_SEC = 600
+
+logger = logging.getLogger('uvicorn')
+
+
+def run_search_list(payload: dict) -> dict:
+    """/search/list 와 같은 유튜브 검색 결과 크롤링"""
+    from scraper import Scraper
+    keyword = payload['keyword']
+    return {
+        'keyword': keyword,
+        'result': Scraper().get_list(keyword, payload.get('limit', 20)),
+    }
+
+
+HANDLERS = {
+    'search_list': run_search_list,
+}
+
+
+def _keep_leased(queue: JobQueue, job_id: str, worker: str, done: threading.Event):
+    """작업이 끝날 때까지 임대 연장 (JOB_TIMEOUT_SEC 가 지나면 실패로 기록하고 워커 프로세스 그룹 종료)"""
+    deadline = time.monotonic() + JOB_TIMEOUT_SEC
+    while not done.wait(queue.lease_sec / 3):
+        if time.monotonic() > deadline:
+            logger.error(f"[CRAWL_WORKER] Job {job_id} exceeded {JOB_TIMEOUT_SEC}s, killing {worker}")
+            queue.fail(job_id, worker, f"timed out after {JOB_TIMEOUT_SEC}s")
+            # 감시 프로세스(main)가 종료를 보고 새 워커를 띄움
+            os.killpg(os.getpid(), signal.SIGKILL)
+            return
+        if not queue.heartbeat(job_id, worker):
+            return
+
+
+def worker_loop():
+    """작업을 하나씩 가져와 처리 (SIGTERM 을 받으면 현재 작업을 마친 뒤 종료)"""
+    # 시간 초과 시 Chrome/chromedriver 까지 한 번에 종료할 수 있도록 새 프로세스 그룹으로 분리
+    os.setsid()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - [%(processName)s] - %(message)s"
+    )
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    queue = JobQueue()
+    logger.info(f"[CRAWL_WORKER] {worker} started")
+
+    while not stop.is_set():
+        job = queue.claim(worker)
+        if job is None:
+            stop.wait(JOB_POLL_SEC)
+            continue
+
+        job_id = job['job_id']
+        logger.info(f"[CRAWL_WORKER] {worker} running job {job_id} ({job['kind']}, attempt {job['attempts']})")
+        done = threading.Event()
+        threading.Thread(target=_keep_leased, args=(queue, job_id, worker, done), daemon=True).start()
+        try:
+            handler = HANDLERS[job['kind']]
+            queue.complete(job_id, worker, handler(job['payload']))
+            logger.info(f"[CRAWL_WORKER] {worker} completed job {job_id}")
+        except Exception as e:
+            logger.error(f"[CRAWL_WORKER] {worker} job {job_id} failed: {e}")
+            logger.error(traceback.format_exc())
+            queue.fail(job_id, worker, str(e))
+        finally:
+            done.set()
+
+    from selenium_pool import cleanup_driver_pool
+    from tab_pool import cleanup_tab_pool
+    cleanup_driver_pool()
+    cleanup_tab_pool()
+    queue.close()
+    logger.info(f"[CRAWL_WORKER] {worker} stopped")
+
+
+def _signal_group(process: multiprocessing.Process, sig: int):
+    """워커의 프로세스 그룹(Chrome/chromedriver 포함)에 시그널 전송"""
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        # setsid 전에 종료하는 경우
+        if process.is_alive():
+            process.kill()
+
+
+def main():
+    """CRAWL_WORKERS 개의 워커 프로세스를 띄우고 죽으면 다시 띄움"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - [%(processName)s] - %(message)s"
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    queue = JobQueue()
+    processes = [None] * max(1, CRAWL_WORKERS)
+    last_prune = 0.0
+    while not stop.is_set():
+        for index, process in enumerate(processes):
+            if process is None or not process.is_alive():
+                if process is not None:
+                    logger.warning(f"[CRAWL_WORKER] crawl-worker-{index} exited ({process.exitcode}), restarting")
+                process = multiprocessing.Process(target=worker_loop, name=f"crawl-worker-{index}")
+                process.start()
+                processes[index] = process
+        if time.monotonic() - last_prune > PRUNE_INTERVAL_SEC:
+            queue.prune()
+            last_prune = time.monotonic()
+        stop.wait(5)
+
+    for process in processes:
+        _signal_group(process, signal.SIGTERM)
+    for process in processes:
+        # 진행 중인 작업은 임대 만료 후 재시도되므로 오래 기다리지 않음
+        process.join(timeout=30)
+        if process.is_alive():
+            _signal_group(process, signal.SIGKILL)
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+브라우저 안 추출 엔진
+페이지 전체 소스(page_source, 유튜브 검색 결과 1.4~2.4MB)를 Python 으로 가져와 다시 파싱하는 대신,
+사이트마다 선언한 필드 명세(선택자 + 속성/텍스트)를 페이지 안에서 실행해 필요한 값만 JSON 으로 받는다.
+같은 명세를 파싱 레이어(parsing.py)로 HTML 에 적용하는 대체 경로가 있어 결과 형식은 어느 쪽이든 같다.
+
+명세 형식 (JSON 으로 바꿀 수 있는 dict)
+    {
+        'selector': 아이템 선택자,
+        'variants': {아이템 태그 이름: {필드 이름: 필드 명세}},   # 태그마다 읽을 필드
+    }
+필드 명세
+    - selector: 아이템 안에서 찾을 CSS 선택자 (없으면 아이템 자신)
+    - attr: 속성 값 (속성이 없으면 '')
+    - text: 텍스트 구분자. get_text(text, strip=True) 와 같음 (script/style 제외, 텍스트 조각마다 strip)
+    - fields: 하위 필드 명세 (찾은 요소 안에서 다시 추출)
+    - all: True 면 맞는 요소 전체의 리스트, 아니면 첫 번째 요소 (요소가 없으면 None)
+
+- EXTRACTION_MODE=js (기본): 페이지 안에서 추출, 실패하면 page_source 파싱으로 대체
+- EXTRACTION_MODE=html: 항상 page_source 파싱 (결과 비교, 문제 발생 시 되돌리기용)
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from parsing import parse_html
+
+EXTRACTION_MODE = os.environ.get('EXTRACTION_MODE', 'js')
+
+# arguments[0]: 명세 JSON, arguments[1]/[2]: 아이템 범위 [start, end) (end 가 null 이면 끝까지)
+# 결과는 JSON 문자열 하나로 반환 (드라이버마다 다른 객체 변환을 피하고 전송 크기를 그대로 잴 수 있음)
+_EXTRACT_SCRIPT = """
+var spec = JSON.parse(arguments[0]);
+var start = arguments[1] || 0;
+var end = arguments[2] == null ? undefined : arguments[2];
+var textOf = function (node, separator) {
+    var parts = [];
+    var walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        var parent = walker.currentNode.parentNode;
+        var tag = parent && parent.nodeName;
+        if (tag === 'SCRIPT' || tag === 'STYLE') continue;
+        var text = walker.currentNode.nodeValue.trim();
+        if (text) parts.push(text);
+    }
+    return parts.join(separator);
+};
+var valueOf = function (node, field) {
+    if (field.attr) {
+        var value = node.getAttribute(field.attr);
+        return value == null ? '' : value;
+    }
+    if (field.fields) return record(node, field.fields);
+    return textOf(node, field.text || '');
+};
+var record = function (node, fields) {
+    var result = {};
+    for (var name in fields) {
+        var field = fields[name];
+        if (field.all) {
+            var nodes = field.selector ? node.querySelectorAll(field.selector) : [node];
+            result[name] = Array.prototype.map.call(nodes, function (match) { return valueOf(match, field); });
+        } else {
+            var match = field.selector ? node.querySelector(field.selector) : node;
+            result[name] = match ? valueOf(match, field) : null;
+        }
+    }
+    return result;
+};
+var items = Array.prototype.slice.call(document.querySelectorAll(spec.selector), start, end);
+return JSON.stringify(items.map(function (item) {
+    var tag = item.tagName.toLowerCase();
+    var result = record(item, spec.variants[tag] || {});
+    result._tag = tag;
+    return result;
+}));
+"""
+
+logger = logging.getLogger('uvicorn')
+
+
+class ExtractionStats:
+    """추출 경로별 호출 수, 아이템 수, 전송 바이트"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            'js': {'calls': 0, 'items': 0, 'bytes': 0},
+            'html': {'calls': 0, 'items': 0, 'bytes': 0},
+            'fallbacks': 0,
+        }
+
+    def record(self, mode: str, items: int, size: int):
+        with self._lock:
+            stats = self._stats[mode]
+            stats['calls'] += 1
+            stats['items'] += items
+            stats['bytes'] += size
+
+    def record_fallback(self):
+        with self._lock:
+            self._stats['fallbacks'] += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = {key: dict(value) if isinstance(value, dict) else value for key, value in self._stats.items()}
+        for mode in ('js', 'html'):
+            calls = stats[mode]['calls']
+            stats[mode]['avg_bytes_per_call'] = round(stats[mode]['bytes'] / calls) if calls else None
+        stats['mode'] = EXTRACTION_MODE
+        return stats
+
+
+_stats = ExtractionStats()
+
+
+def get_extraction_stats() -> dict:
+    return _stats.get_stats()
+
+
+def _value(node, field: Dict[str, Any]) -> Any:
+    if field.get('attr'):
+        value = node.get(field['attr'])
+        return '' if value is None else value
+    if field.get('fields'):
+        return _record(node, field['fields'])
+    return node.get_text(field.get('text') or '', strip=True)
+
+
+def _record(node, fields: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    result = {}
+    for name, field in fields.items():
+        selector = field.get('selector')
+        if field.get('all'):
+            matches = node.select(selector) if selector else [node]
+            result[name] = [_value(match, field) for match in matches]
+        else:
+            match = node.select_one(selector) if selector else node
+            result[name] = _value(match, field) if match is not None else None
+    return result
+
+
+def extract_from_html(root, spec: Dict[str, Any], start: int = 0, end: Optional[int] = None) -> List[Dict[str, Any]]:
+    """파싱한 HTML(parse_html 결과)에 명세 적용 (페이지 안 추출과 같은 결과)"""
+    records = []
+    for item in root.select(spec['selector'])[start:end]:
+        result = _record(item, spec['variants'].get(item.name, {}))
+        result['_tag'] = item.name
+        records.append(result)
+    return records
+
+
+def extract_from_page_source(html: str, spec: Dict[str, Any], start: int = 0,
+                             end: Optional[int] = None) -> List[Dict[str, Any]]:
+    """page_source 문자열을 파싱해서 명세 적용"""
+    root = parse_html(html)
+    try:
+        records = extract_from_html(root, spec, start, end)
+    finally:
+        root.decompose()
+    _stats.record('html', len(records), len(html))
+    return records
+
+
+def extract(driver, spec: Dict[str, Any], start: int = 0, end: Optional[int] = None) -> List[Dict[str, Any]]:
+    """명세에 맞는 아이템 [start, end) 를 레코드(dict, '_tag' 에 아이템 태그 이름) 리스트로 반환
+
+    EXTRACTION_MODE=js 면 페이지 안에서 추출하고, 실패하거나 html 모드면 driver.page_source 를 파싱한다.
+    """
+    if EXTRACTION_MODE == 'js':
+        try:
+            payload = driver.execute_script(_EXTRACT_SCRIPT, json.dumps(spec), start, end)
+            records = json.loads(payload)
+            _stats.record('js', len(records), len(payload))
+            return records
+        except Exception as e:
+            logger.warning(f"[EXTRACTION] In-page extraction failed, falling back to page source: {e}")
+            _stats.record_fallback()
+
+    return extract_from_page_source(driver.page_source or '', spec, start, end)
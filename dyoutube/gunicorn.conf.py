@@ -4,6 +4,8 @@ Gunicorn 설정 파일
 """
 import multiprocessing
 import os
+import subprocess
+import sys
 
 # 서버 소켓
 bind = "0.0.0.0:80"
@@ -55,9 +57,28 @@ def on_reload(server):
     """서버 리로드 시 호출"""
     server.log.info("Gunicorn server is reloading")
 
+# 크롤링 워커 프로세스 수 (job_queue 작업 처리, 0 이면 실행하지 않음)
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "1"))
+_crawl_worker_process = None
+
 def when_ready(server):
     """서버가 준비되었을 때 호출"""
+    global _crawl_worker_process
     server.log.info("Gunicorn server is ready. Spawning workers")
+    if CRAWL_WORKERS > 0:
+        _crawl_worker_process = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawl_worker.py")]
+        )
+        server.log.info(f"Crawl worker supervisor started (pid: {_crawl_worker_process.pid})")
+
+def on_exit(server):
+    """서버 종료 시 크롤링 워커 정리"""
+    if _crawl_worker_process is not None and _crawl_worker_process.poll() is None:
+        _crawl_worker_process.terminate()
+        try:
+            _crawl_worker_process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            _crawl_worker_process.kill()
 
 def pre_fork(server, worker):
     """워커 fork 전 호출"""
@@ -0,0 +1,209 @@
+"""
+크롤링 작업 큐 (SQLite)
+오래 걸리는 검색 크롤링을 HTTP 요청 안에서 기다리지 않고 큐에 넣은 뒤, 별도 크롤링 워커 프로세스(crawl_worker.py)가 처리한다.
+gunicorn 워커가 재시작되어도 작업이 사라지지 않고, 모든 HTTP 워커와 크롤링 워커가 같은 파일을 공유한다.
+
+- 우선순위: high > normal > low, 같은 우선순위는 먼저 들어온 순서
+- 임대(lease): 워커는 작업을 가져갈 때 JOB_LEASE_SEC 동안 임대하고 실행 중 주기적으로 연장한다.
+  워커 프로세스가 죽어 임대가 만료되면 다른 워커가 다시 가져가며, JOB_MAX_ATTEMPTS 회 시도 후에는 failed
+- 실패(예외)한 작업도 JOB_MAX_ATTEMPTS 회까지 다시 대기열로 돌아감
+- 끝난 작업은 JOB_RETENTION_SEC 후 삭제
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+JOB_QUEUE_PATH = os.environ.get('JOB_QUEUE_PATH', '/tmp/crawl_jobs.sqlite3')
+JOB_LEASE_SEC = float(os.environ.get('JOB_LEASE_SEC', '120'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+JOB_RETENTION_SEC = float(os.environ.get('JOB_RETENTION_SEC', str(24 * 3600)))
+
+PRIORITIES = {
+    'high': 0,
+    'normal': 1,
+    'low': 2,
+}
+STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+
+class JobQueue:
+    """SQLite 파일 하나를 공유하는 프로세스 간 작업 큐"""
+
+    def __init__(self, path: str = JOB_QUEUE_PATH, lease_sec: float = JOB_LEASE_SEC,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.logger = logging.getLogger('uvicorn')
+        self.path = path
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, '
+            'kind TEXT NOT NULL, '
+            'payload TEXT NOT NULL, '
+            'priority INTEGER NOT NULL, '
+            'status TEXT NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, '
+            'worker TEXT, '
+            'lease_until REAL, '
+            'result TEXT, '
+            'error TEXT, '
+            'created_at REAL NOT NULL, '
+            'started_at REAL, '
+            'finished_at REAL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority, created_at)')
+
+    def enqueue(self, kind: str, payload: dict, priority: str = 'normal') -> str:
+        """작업 추가 후 job id 반환 (알 수 없는 우선순위면 ValueError)"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {list(PRIORITIES)}")
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO jobs (id, kind, payload, priority, status, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), PRIORITIES[priority], 'queued', time.time())
+            )
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """대기 중이거나 임대가 만료된 작업 하나를 임대 (없으면 None)"""
+        now = time.time()
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._expire(now)
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY priority, created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    self._db.execute('COMMIT')
+                    return None
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, lease_until = ?, "
+                    "started_at = ? WHERE id = ?",
+                    (worker, now + self.lease_sec, now, row[0])
+                )
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return self.get(row[0])
+
+    def _expire(self, now: float):
+        """임대가 만료된 작업 중 시도 횟수를 다 쓴 작업은 failed (트랜잭션 안에서 호출)"""
+        self._db.execute(
+            "UPDATE jobs SET status = 'failed', error = 'worker lost (lease expired)', finished_at = ? "
+            "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+            (now, now, self.max_attempts)
+        )
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """임대 연장 (다른 워커에게 넘어갔거나 취소되었으면 False)"""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time() + self.lease_sec, job_id, worker)
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, worker: str, result: Any):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL, finished_at = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker)
+            )
+
+    def fail(self, job_id: str, worker: str, error: str):
+        """실패 기록 (시도 횟수가 남았으면 다시 대기열로)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                "error = ?, lease_until = NULL, "
+                "finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (self.max_attempts, error[:2000], self.max_attempts, time.time(), job_id, worker)
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중인 작업 취소 (이미 실행 중이거나 끝났으면 False)"""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+        return cursor.rowcount > 0
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT id, kind, payload, priority, status, attempts, worker, result, error, '
+                'created_at, started_at, finished_at FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        priority = {value: name for name, value in PRIORITIES.items()}.get(row[3], str(row[3]))
+        return {
+            'job_id': row[0],
+            'kind': row[1],
+            'payload': json.loads(row[2]),
+            'priority': priority,
+            'status': row[4],
+            'attempts': row[5],
+            'worker': row[6],
+            'result': json.loads(row[7]) if row[7] is not None else None,
+            'error': row[8],
+            'created_at': row[9],
+            'started_at': row[10],
+            'finished_at': row[11],
+        }
+
+    def position(self, job_id: str) -> Optional[int]:
+        """대기 중인 작업의 대기 순번 (0 이면 다음 차례)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM jobs AS other, jobs AS job WHERE job.id = ? AND job.status = 'queued' "
+                "AND other.status = 'queued' AND (other.priority < job.priority OR "
+                "(other.priority = job.priority AND other.created_at < job.created_at))",
+                (job_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def prune(self):
+        """보관 기간이 지난 끝난 작업 삭제"""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND finished_at < ?",
+                (time.time() - JOB_RETENTION_SEC,)
+            )
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            rows = self._db.execute('SELECT status, priority, COUNT(*) FROM jobs GROUP BY status, priority').fetchall()
+        stats = {status: 0 for status in STATUSES}
+        queued_by_priority = {name: 0 for name in PRIORITIES}
+        names = {value: name for name, value in PRIORITIES.items()}
+        for status, priority, count in rows:
+            stats[status] = stats.get(status, 0) + count
+            if status == 'queued':
+                queued_by_priority[names.get(priority, str(priority))] = count
+        stats['queued_by_priority'] = queued_by_priority
+        stats['lease_sec'] = self.lease_sec
+        stats['max_attempts'] = self.max_attempts
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,13 +1,14 @@
 import gc
 import json
 import logging
+import os
 import re
-import time
 import traceback
 from datetime import datetime, timezone, timedelta
 from dateutil.relativedelta import relativedelta
 
-from bs4 import BeautifulSoup
+from extraction import extract
+from search_data import fetch_search, parse_contents, read_initial_data, text_of
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import (
@@ -20,6 +21,81 @@ from selenium.webdriver.common.action_chains import ActionChains
 # 개선된 셀레니움 드라이버 풀 사용
 from selenium_driver import SeleniumDriver
 from selenium_pool import get_driver_pool
+from tab_pool import DRIVER_MODE, get_tab_pool
+from waits import wait_for_count, wait_until
+from urllib.parse import quote_plus
+
+# hybrid (기본): 브라우저가 받은 검색 API 응답(ytInitialData, 페이지 안 continuation 요청)에서 결과를 읽음,
+# 실패하면 dom 방식으로 대체 / dom: 검색 결과를 렌더링하고 스크롤해서 DOM 에서 읽음
+SEARCH_MODE = os.environ.get('YOUTUBE_SEARCH_MODE', 'hybrid')
+RESULT_SELECTOR = "ytd-video-renderer, ytd-reel-item-renderer, ytm-shorts-lockup-view-model"
+SEARCHBOX_READY_SCRIPT = "return !!(window.customElements && (customElements.get('yt-searchbox') || customElements.get('ytd-searchbox')));"
+# 다음 검색 결과를 불러오는 요소 (없으면 마지막 페이지)
+CONTINUATION_SCRIPT = "return !!document.querySelector('ytd-continuation-item-renderer');"
+# 스크롤 후 새 결과를 기다리는 최대 시간 (초, 실제 대기 시간은 waits.py 적응형 타임아웃)
+SCROLL_WAIT_TIMEOUT = 3.0
+# 새 결과 없이 페이지가 이 시간(초) 동안 변하지 않으면 대기 중단
+SCROLL_SETTLE = 1.0
+# 검색 결과 아이템별로 읽을 필드 (extraction.py 명세 형식, 페이지 안에서 추출)
+RESULT_SPEC = {
+    'selector': RESULT_SELECTOR,
+    'variants': {
+        'ytd-video-renderer': {
+            'title': {'selector': '#video-title', 'attr': 'title'},
+            'href': {'selector': '#video-title', 'attr': 'href'},
+            'aria_label': {'selector': 'a#video-title', 'attr': 'aria-label'},
+            'channel': {'selector': 'ytd-channel-name #text', 'text': ''},
+            'metadata': {'selector': '#metadata-line span', 'text': '', 'all': True},
+            'snippets': {
+                'selector': 'div.metadata-snippet-container-one-line',
+                'all': True,
+                'fields': {
+                    # 링크 영역에 들어간 snippet-text-navigation
+                    'link': {
+                        'selector': 'a.metadata-snippet-timestamp yt-formatted-string.metadata-snippet-text-navigation',
+                        'text': ' ',
+                    },
+                    # 링크 밖에 있는 snippet-text (hidden="" 이어도 텍스트를 가져옴)
+                    'text': {'selector': 'yt-formatted-string.metadata-snippet-text', 'text': ' '},
+                },
+            },
+        },
+        'ytd-reel-item-renderer': {
+            'title': {'selector': '#shorts-title', 'text': ''},
+            'href': {'selector': 'a#thumbnail', 'attr': 'href'},
+            'channel': {'selector': 'ytd-channel-name #text', 'text': ''},
+        },
+        'ytm-shorts-lockup-view-model': {
+            'title': {'selector': 'h3.shortsLockupViewModelHostMetadataTitle a', 'attr': 'title'},
+            'title_text': {'selector': 'h3.shortsLockupViewModelHostMetadataTitle a', 'text': ''},
+            'href': {'selector': 'h3.shortsLockupViewModelHostMetadataTitle a', 'attr': 'href'},
+            'reel_href': {'selector': 'a.reel-item-endpoint', 'attr': 'href'},
+            'view_count': {'selector': '.shortsLockupViewModelHostOutsideMetadataSubhead', 'text': ''},
+        },
+    },
+}
+
+
+class ResultStream:
+    """스트리밍 응답용 수집 상태
+
+    스크롤하는 동안 먼저 파싱해서 보낸 결과와, 다음에 파싱할 검색 결과 요소의 위치(cursor)를 기록한다.
+    """
+
+    def __init__(self, on_result, limit: int):
+        self.on_result = on_result
+        self.limit = limit
+        self.cursor = 0
+        self.results = []
+
+    @property
+    def remaining(self) -> int:
+        return self.limit - len(self.results)
+
+    def add(self, items: list):
+        for item in items[:max(self.remaining, 0)]:
+            self.results.append(item)
+            self.on_result(item)
 
 
 class Scraper:
@@ -27,12 +103,18 @@ class Scraper:
         # FastAPI 기반 uvicorn 로거 사용 가정
         self.logger = logging.getLogger("uvicorn")
 
-    def get_list(self, query: str, limit: int = 30):
+    def get_list(self, query: str, limit: int = 30, on_result=None, block=None):
         """
         주어진 query(검색어)로 유튜브 검색 결과를 크롤링.
         최대 limit개의 동영상 정보를 리스트 형태로 반환.
         드라이버 풀을 사용하여 성능을 개선합니다.
+        on_result를 주면 스크롤 중 렌더링된 결과부터 파싱해 하나씩 바로 호출합니다 (스트리밍 응답용).
+        block은 리소스 차단 프로필입니다 (없으면 RESOURCE_BLOCK_PROFILE, resource_blocking.py).
         """
+        stream = ResultStream(on_result, limit) if on_result is not None else None
+        if DRIVER_MODE == 'tabs':
+            return self._get_list_via_tab(query, limit, stream, block)
+
         # URL 파라미터로 언어/위치 조작이 되지 않아 쿠키를 통해 설정합니다.
         base_url = "https://www.youtube.com"
         results = []
@@ -43,7 +125,7 @@ class Scraper:
             # 드라이버 풀에서 드라이버 가져오기 (새 탭에서 실행)
             pool = get_driver_pool()
             
-            with pool.get_driver(base_url) as driver_wrapper:
+            with pool.get_driver(base_url, block_profile=block) as driver_wrapper:
                 driver = driver_wrapper.driver
                 wait = WebDriverWait(driver, 10)
                 
@@ -56,9 +138,17 @@ class Scraper:
                     self.logger.info("[YOUTUBE] Cookie for KR/ko set and page refreshed.")
                 except Exception as e:
                     self.logger.warning(f"[YOUTUBE] Failed to set cookie: {e}")
+
+                # hybrid 모드: 검색창 입력/렌더링/스크롤 없이 페이지 안 검색 API 요청으로 수집
+                if SEARCH_MODE == 'hybrid':
+                    hybrid_results = self._collect_search_data(driver, query, limit, stream)
+                    if hybrid_results is not None:
+                        results = hybrid_results
+                        return results
                 
                 # 1. 페이지 로딩 대기 (검색창이 나타날 때까지 대기)
-                time.sleep(0.5)  # 최소한의 스크립트 바인딩 시간 확보
+                # 검색창 컴포넌트가 정의될 때까지 대기 (스크립트 바인딩 전에 입력하면 검색이 무시될 수 있음)
+                wait_until(driver, SEARCHBOX_READY_SCRIPT, timeout=1.0, key='youtube_searchbox')
                 try:
                     search_input_home = wait.until(
                         EC.element_to_be_clickable((By.NAME, "search_query"))
@@ -88,57 +178,13 @@ class Scraper:
                     self.logger.warning(f"[YOUTUBE] Timeout waiting for search results: {e}, continuing...")
                 self.logger.info(f"[YOUTUBE] Current URL after search: {driver.current_url}")
 
-                self.logger.info("[YOUTUBE] Start scrolling...")
-                try:
-                    # 개선: limit 개수만큼만 확인하며 동적 스크롤 (속도 및 성능 최적화)
-                    last_height = driver.execute_script("return document.documentElement.scrollHeight")
-                    max_scrolls = (limit // 10) + 15  # 대략 1번 스크롤 시 최소 10~20개 로딩 가정
-                    
-                    for _ in range(max_scrolls):
-                        # 현재 렌더링된 아이템 개수 확인 (DOM 직접 조회로 Python 메모리 부하 및 통신 지연 최소화)
-                        current_count = driver.execute_script(
-                            "return document.querySelectorAll('ytd-video-renderer, ytd-reel-item-renderer, ytm-shorts-lockup-view-model').length;"
-                        )
-                        if current_count >= limit:
-                            self.logger.info(f"[YOUTUBE] Sufficient items loaded ({current_count} >= {limit}). Stop scrolling.")
-                            break
-                            
-                        # 끝까지 스크롤
-                        driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-                        time.sleep(1.5)  # 새로운 항목이 로딩될 때까지 대기
-                        
-                        new_height = driver.execute_script("return document.documentElement.scrollHeight")
-                        if new_height == last_height:
-                            # 더이상 높이 변화가 없으면 지연 대기 후 재확인
-                            time.sleep(1.5)
-                            new_height = driver.execute_script("return document.documentElement.scrollHeight")
-                            if new_height == last_height:
-                                self.logger.info("[YOUTUBE] Reached bottom of the page. No more items to load.")
-                                break
-                        last_height = new_height
-                        
-                except Exception as e:
-                    self.logger.warning(f"[YOUTUBE] Error during dynamic scroll: {e}, continuing anyway...")
-
-                # 검색 결과 페이지 파싱
-                html_content = driver_wrapper.get_page_source()
-                
-                if not html_content or len(html_content) < 100:
-                    self.logger.error("[YOUTUBE] Page source is empty or too short")
-                    return results
-                
-                soup = BeautifulSoup(html_content, "html.parser")
-                all_items = soup.select("ytd-video-renderer, ytd-reel-item-renderer, ytm-shorts-lockup-view-model")
+                self._scroll_results(driver, limit, stream)
 
-                self.logger.info(f"[YOUTUBE] Parsed {len(all_items)} items from search page.")
-                results = self._parse_items(driver, all_items, limit)
+                # 검색 결과 추출 (페이지 전체 소스 대신 페이지 안에서 필요한 필드만 받음)
+                records = self._extract_remaining(driver, stream)
+                self.logger.info(f"[YOUTUBE] Extracted {len(records)} items from search page.")
+                results = self._parse_remaining(records, limit, stream)
                 self.logger.info(f"[YOUTUBE] Scraped total {len(results)} items.")
-                
-                # 메모리 안정성 개선: BeautifulSoup 객체 및 대용량 HTML 문자열 명시적 해제
-                soup.decompose()
-                del soup
-                del html_content
-                del all_items
 
         except Exception as e:
             self.logger.error(f"[YOUTUBE] Unexpected error in get_list(): {e}")
@@ -152,78 +198,256 @@ class Scraper:
 
         return results
 
-    def _parse_items(self, driver, all_items, limit):
+    def _scroll_results(self, driver, limit: int, stream: ResultStream = None):
+        """검색 결과가 limit개 이상 렌더링되거나 페이지 끝에 도달할 때까지 스크롤"""
+        self.logger.info("[YOUTUBE] Start scrolling...")
+        try:
+            # 개선: limit 개수만큼만 확인하며 동적 스크롤 (속도 및 성능 최적화)
+            max_scrolls = (limit // 10) + 15  # 대략 1번 스크롤 시 최소 10~20개 로딩 가정
+            previous_count = 0
+            stalled = 0
+            # 현재 렌더링된 아이템 개수 확인 (DOM 직접 조회로 Python 메모리 부하 및 통신 지연 최소화)
+            current_count = driver.execute_script(
+                "return document.querySelectorAll(arguments[0]).length;", RESULT_SELECTOR
+            )
+
+            for _ in range(max_scrolls):
+                # 스트리밍: 직전 스크롤 전에 이미 렌더링되어 있던 결과는 스크롤을 기다리지 않고 먼저 전달
+                self._emit_rendered(driver, stream, previous_count)
+                previous_count = current_count
+                if current_count >= limit:
+                    self.logger.info(f"[YOUTUBE] Sufficient items loaded ({current_count} >= {limit}). Stop scrolling.")
+                    break
+
+                # 끝까지 스크롤
+                driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+                # 고정 대기 대신 새 항목이 렌더링될 때까지 대기 (요청/DOM 변경 없이 SCROLL_SETTLE 초가 지나면 중단)
+                new_count = wait_for_count(
+                    driver, RESULT_SELECTOR, current_count + 1,
+                    timeout=SCROLL_WAIT_TIMEOUT, key='youtube_scroll', settle=SCROLL_SETTLE
+                )
+                if new_count > current_count:
+                    stalled = 0
+                elif not driver.execute_script(CONTINUATION_SCRIPT):
+                    self.logger.info("[YOUTUBE] Reached bottom of the page. No more items to load.")
+                    break
+                else:
+                    # 다음 결과를 불러오는 요소가 남아 있으면 한 번 더 스크롤해서 확인
+                    stalled += 1
+                    if stalled >= 2:
+                        self.logger.info("[YOUTUBE] No new items after scrolling twice. Stop scrolling.")
+                        break
+                current_count = max(current_count, new_count)
+
+        except Exception as e:
+            self.logger.warning(f"[YOUTUBE] Error during dynamic scroll: {e}, continuing anyway...")
+
+    def _collect_search_data(self, driver, query: str, limit: int, stream: ResultStream = None):
+        """hybrid 모드: 검색 API 응답(JSON)을 페이지 단위로 읽어 limit개 수집
+
+        첫 페이지를 가져오지 못하면 None (DOM 스크롤 방식으로 대체), 다음 페이지 요청이 실패하면 지금까지의 결과 반환
+        """
+        try:
+            sections = read_initial_data(driver)
+            if sections is None:
+                sections = fetch_search(driver, query=query)
+        except Exception as e:
+            self.logger.warning(f"[YOUTUBE] Failed to read search data, falling back to scrolling: {e}")
+            return None
+
+        results = []
+        # 대략 한 페이지에 20개 내외, 쇼츠 선반만 있는 페이지 등을 고려해 여유 있게
+        max_pages = (limit // 10) + 5
+        for page in range(max_pages):
+            renderers, token = parse_contents(sections)
+            items = self._parse_renderers(renderers, limit - len(results))
+            results.extend(items)
+            if stream is not None:
+                stream.add(items)
+            self.logger.info(f"[YOUTUBE] Search data page {page + 1}: {len(items)} items (total {len(results)})")
+            if len(results) >= limit or not token:
+                break
+            try:
+                sections = fetch_search(driver, continuation=token)
+            except Exception as e:
+                self.logger.warning(f"[YOUTUBE] Continuation request failed, returning {len(results)} items: {e}")
+                break
+        return results
+
+    def _parse_renderers(self, renderers, limit):
+        """검색 API 응답의 renderer 목록(search_data.parse_contents)을 DOM 방식과 같은 형식의 결과로 변환"""
+        results = []
+        for kind, renderer in renderers:
+            if len(results) >= limit:
+                break
+            try:
+                if kind == "video":
+                    video_id = renderer.get("videoId", "")
+                    # 축약 조회수(예: 조회수 1.2만회) 대신 정확한 조회수가 있으면 사용
+                    short_view_count = text_of(renderer.get("shortViewCountText"))
+                    view_count = self.get_view_count(short_view_count) if short_view_count else ""
+                    match = re.search(r'(?:조회수\s+)?([\d,]+)(?:회| views)', text_of(renderer.get("viewCountText")))
+                    if match:
+                        view_count = match.group(1).replace(",", "")
+                    snippets = renderer.get("detailedMetadataSnippets") or []
+                    results.append({
+                        "VideoID": video_id,
+                        "title": text_of(renderer.get("title")),
+                        "channel": text_of(renderer.get("ownerText") or renderer.get("longBylineText")),
+                        "url": f"https://www.youtube.com/watch?v={video_id}",
+                        "description": "\n".join(text_of(snippet.get("snippetText")) for snippet in snippets).strip(),
+                        "publishedDate": self.calculate_before_date(text_of(renderer.get("publishedTimeText"))),
+                        "videoCount": view_count,
+                        "videoType": "video",
+                    })
+                    continue
+
+                if kind == "reel":
+                    video_id = renderer.get("videoId", "")
+                    title = text_of(renderer.get("headline"))
+                    # Shorts의 조회수/업로드 날짜는 검색결과에서 잘 안 보이므로 기본값 (DOM 방식과 같음)
+                    view_count = ""
+                else:
+                    video_id = renderer.get("onTap", {}).get("innertubeCommand", {}) \
+                        .get("reelWatchEndpoint", {}).get("videoId", "")
+                    metadata = renderer.get("overlayMetadata", {})
+                    title = metadata.get("primaryText", {}).get("content", "")
+                    view_count = metadata.get("secondaryText", {}).get("content", "")
+                    if view_count:
+                        view_count = self.get_view_count(view_count)
+                if not video_id:
+                    continue
+                results.append({
+                    "VideoID": video_id,
+                    "title": title,
+                    "channel": "",
+                    "url": f"https://www.youtube.com/shorts/{video_id}",
+                    "description": "",
+                    "publishedDate": "",
+                    "videoCount": view_count,
+                    "videoType": "shorts",
+                })
+            except Exception as e:
+                self.logger.warning(f"[YOUTUBE] Error parsing {kind} renderer: {e}")
+        return results
+
+    def _emit_rendered(self, driver, stream: ResultStream, upto: int):
+        """스트리밍 응답용: [stream.cursor, upto) 범위의 렌더링된 검색 결과만 추출해서 전달"""
+        if stream is None or upto <= stream.cursor or stream.remaining <= 0:
+            return
+        try:
+            records = extract(driver, RESULT_SPEC, stream.cursor, upto)
+            stream.cursor += len(records)
+            stream.add(self._parse_items(records, stream.remaining))
+        except Exception as e:
+            # 여기서 실패한 결과는 스크롤이 끝난 뒤 전체 추출에서 다시 처리
+            self.logger.warning(f"[YOUTUBE] Failed to emit rendered items: {e}")
+
+    def _extract_remaining(self, driver, stream: ResultStream = None):
+        """검색 결과 추출 (스트리밍이면 아직 보내지 않은 결과만)"""
+        return extract(driver, RESULT_SPEC, stream.cursor if stream is not None else 0)
+
+    def _parse_remaining(self, records, limit: int, stream: ResultStream = None):
+        """추출한 검색 결과 정리 (스트리밍이면 하나씩 전달)"""
+        if stream is None:
+            return self._parse_items(records, limit)
+        stream.add(self._parse_items(records, stream.remaining))
+        return stream.results
+
+    def _get_list_via_tab(self, query: str, limit: int = 30, stream: ResultStream = None, block=None):
+        """탭 풀(SCRAPER_DRIVER_MODE=tabs)을 사용한 검색 결과 크롤링
+
+        브라우저 하나의 여러 탭이 동시에 사용되므로 홈 화면 검색창 입력 대신 검색 결과 URL로 바로 이동하고,
+        언어/지역은 쿠키 대신 hl/gl 파라미터로 지정합니다.
+        """
+        search_url = f"https://www.youtube.com/results?search_query={quote_plus(query)}&hl=ko&gl=KR"
+        results = []
+
+        try:
+            self.logger.info(f"[YOUTUBE] Starting tab scrape for query: {query}, limit: {limit}")
+
+            with get_tab_pool().get_driver(search_url, block_profile=block) as driver:
+                # hybrid 모드: 검색 결과 페이지의 ytInitialData 와 continuation 요청으로 수집 (렌더링 대기/스크롤 없음)
+                if SEARCH_MODE == 'hybrid':
+                    hybrid_results = self._collect_search_data(driver, query, limit, stream)
+                    if hybrid_results is not None:
+                        results = hybrid_results
+                        return results
+
+                # 결과 렌더링 대기 (최대 10초)
+                for _ in range(20):
+                    if driver.execute_script(
+                        "return document.querySelectorAll('ytd-video-renderer, ytd-reel-item-renderer, ytm-shorts-lockup-view-model').length;"
+                    ):
+                        break
+                    driver.sleep(0.5)
+                else:
+                    self.logger.warning("[YOUTUBE] Timeout waiting for search results in tab, continuing...")
+
+                self._scroll_results(driver, limit, stream)
+
+                records = self._extract_remaining(driver, stream)
+                self.logger.info(f"[YOUTUBE] Extracted {len(records)} items from search page.")
+                results = self._parse_remaining(records, limit, stream)
+
+        except Exception as e:
+            self.logger.error(f"[YOUTUBE] Unexpected error in _get_list_via_tab(): {e}")
+            self.logger.error(traceback.format_exc())
+
+        finally:
+            self.logger.info(f"[YOUTUBE] Final result count: {len(results)}")
+            gc.collect()
+
+        return results
+
+    def _parse_items(self, records, limit):
         """
-        검색 결과 목록(여러 아이템)을 순회하며
-        동영상 상세 정보를 필요한 만큼(limit) 수집.
+        추출한 검색 결과 레코드(RESULT_SPEC)를 순회하며
+        동영상 정보를 필요한 만큼(limit) 수집.
         """
         results = []
-        original_window = driver.current_window_handle
 
-        for item in all_items:
+        for item in records:
             if len(results) >= limit:
                 break
 
             # 1) 일반 동영상 (ytd-video-renderer)
-            if item.name == "ytd-video-renderer":
-                title_tag = item.select_one("#video-title")
-                if not title_tag:
+            if item["_tag"] == "ytd-video-renderer":
+                if item["title"] is None:
                     continue
 
-                title = title_tag.get("title", "").strip()
-                href = title_tag.get("href", "")
+                title = item["title"].strip()
+                href = item["href"]
                 url = (
                     f"https://www.youtube.com{href}"
                     if href.startswith("/")
                     else href
                 )
 
-                channel_tag = item.select_one("ytd-channel-name #text")
-                channel = channel_tag.get_text(strip=True) if channel_tag else ""
+                channel = item["channel"] or ""
 
                 # 조회수, 업로드 날짜 파싱
-                meta_info = item.select_one("#metadata-line")
+                spans = item["metadata"]
                 view_count, published_date = "", ""
-                if meta_info:
-                    spans = meta_info.find_all("span")
-                    if len(spans) >= 2:
-                        try:
-                            view_count = self.get_view_count(spans[0].get_text(strip=True))
-                            published_date = self.calculate_before_date(spans[1].get_text(strip=True))
-                        except Exception as e:
-                            self.logger.warning(
-                                f"Error processing meta info: {e} - {spans}"
-                            )
-
-                # 동영상 상세 정보 확인 (새 탭 사용)
-                desc_texts = []
-                snippet_containers = item.select("div.metadata-snippet-container-one-line")
+                if len(spans) >= 2:
+                    try:
+                        view_count = self.get_view_count(spans[0])
+                        published_date = self.calculate_before_date(spans[1])
+                    except Exception as e:
+                        self.logger.warning(
+                            f"Error processing meta info: {e} - {spans}"
+                        )
 
-                video_title_tag = item.find('a', id='video-title')
-                aria_label = video_title_tag.get('aria-label', '')
-                #print(aria_label)
+                aria_label = item["aria_label"] or ""
                 match = re.search(r'(?:조회수\s+)?([\d,]+)(?:회| views)', aria_label)
                 if match:
                     view_count = match.group(1).replace(",", "")
 
-                for container in snippet_containers:
-                    # (1) 링크 영역에 들어간 snippet-text-navigation
-                    link_snippet = container.select_one("a.metadata-snippet-timestamp yt-formatted-string.metadata-snippet-text-navigation")
-                    if link_snippet:
-                        desc_texts.append(link_snippet.get_text(separator=" ", strip=True))
-
-                    # (2) 링크 밖에 있는 snippet-text
-                    no_link_snippet = container.select_one("yt-formatted-string.metadata-snippet-text")
-                    # 경우에 따라 hidden="" 되어 있을 수도 있는데, 일단 get_text()로 시도
-                    if no_link_snippet:
-                        desc_texts.append(no_link_snippet.get_text(separator=" ", strip=True))
-
-                # 최종적으로 2~3개의 문자열이 들어올 수 있으니 합쳐서 하나의 문자열로
+                # 설명 스니펫: 컨테이너마다 링크 안/밖 텍스트가 들어올 수 있으니 합쳐서 하나의 문자열로
+                desc_texts = []
+                for snippet in item["snippets"]:
+                    desc_texts.extend(text for text in (snippet["link"], snippet["text"]) if text is not None)
                 description = "\n".join(desc_texts).strip()
-                #description = self._open_new_tab_and_collect_info(
-                #    driver=driver,
-                #    url=url
-                #)
                 video_id = self.get_video_id_with_split(url)
 
                 results.append({
@@ -238,42 +462,27 @@ class Scraper:
                 })
 
             # 2) Shorts (ytd-reel-item-renderer & ytm-shorts-lockup-view-model)
-            elif item.name in ["ytd-reel-item-renderer", "ytm-shorts-lockup-view-model"]:
-                if item.name == "ytd-reel-item-renderer":
-                    title_tag = item.select_one("#shorts-title")
-                    if not title_tag:
+            elif item["_tag"] in ["ytd-reel-item-renderer", "ytm-shorts-lockup-view-model"]:
+                if item["_tag"] == "ytd-reel-item-renderer":
+                    if item["title"] is None or item["href"] is None:
                         continue
-                    title = title_tag.get_text(strip=True)
-
-                    shorts_link_tag = item.select_one("a#thumbnail")
-                    if not shorts_link_tag:
-                        continue
-
-                    href = shorts_link_tag.get("href", "")
-                    url = f"https://www.youtube.com{href}"
-
-                    channel_tag = item.select_one("ytd-channel-name #text")
-                    channel = channel_tag.get_text(strip=True) if channel_tag else ""
+                    title = item["title"]
+                    url = f"https://www.youtube.com{item['href']}"
+                    channel = item["channel"] or ""
 
                     # Shorts의 조회수/업로드 날짜는 검색결과에서 잘 안 보이므로 기본값
                     view_count, published_date = "", ""
                 else:
-                    title_tag = item.select_one("h3.shortsLockupViewModelHostMetadataTitle a")
-                    if not title_tag:
+                    if item["title"] is None:
                         continue
-                    title = title_tag.get("title", "").strip() or title_tag.get_text(strip=True)
+                    title = item["title"].strip() or item["title_text"]
 
-                    href = title_tag.get("href", "")
-                    if not href:
-                        shorts_link_tag = item.select_one("a.reel-item-endpoint")
-                        href = shorts_link_tag.get("href", "") if shorts_link_tag else ""
-                        
+                    href = item["href"] or item["reel_href"] or ""
                     url = f"https://www.youtube.com{href}"
 
                     channel = "" # 새로운 구조에서는 채널이 잘 노출되지 않음
 
-                    view_count_tag = item.select_one(".shortsLockupViewModelHostOutsideMetadataSubhead")
-                    view_count = view_count_tag.get_text(strip=True) if view_count_tag else ""
+                    view_count = item["view_count"] or ""
                     if view_count:
                         view_count = self.get_view_count(view_count)
                     published_date = ""
@@ -0,0 +1,166 @@
+"""
+검색 결과 JSON 수집 (hybrid 모드)
+쿠키/동의/봇 확인은 브라우저가 처리하고, 결과는 렌더링된 DOM 대신 검색 API 응답(JSON)에서 읽는다.
+
+- 첫 페이지: 검색 결과 URL 로 이동한 페이지면 window.ytInitialData, 아니면(홈 화면 검색창 입력은 SPA 이동이라
+  ytInitialData 가 바뀌지 않음) 페이지 안에서 /youtubei/v1/search 에 query 로 요청
+- 다음 페이지: 페이지 안 fetch() 로 /youtubei/v1/search 에 continuation 토큰으로 요청
+  (브라우저의 쿠키, ytcfg 의 INNERTUBE_CONTEXT 와 클라이언트 버전을 그대로 사용)
+
+응답 전체 대신 RESULT_KEYS 에 있는 키만 남긴 JSON 을 받는다 (JSON.stringify 의 키 목록 인자, 모든 깊이에 적용).
+"""
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# 결과를 만드는 데 필요한 키 (경로 중간의 키도 모두 포함해야 함)
+RESULT_KEYS = [
+    # 섹션 / 다음 페이지 토큰
+    'itemSectionRenderer', 'contents', 'continuationItemRenderer', 'continuationEndpoint',
+    'continuationCommand', 'token',
+    # 동영상
+    'videoRenderer', 'videoId', 'title', 'ownerText', 'longBylineText', 'viewCountText', 'shortViewCountText',
+    'publishedTimeText', 'detailedMetadataSnippets', 'snippetText', 'runs', 'text', 'simpleText',
+    # 쇼츠 (reelShelfRenderer/reelItemRenderer, 새 구조 gridShelfViewModel/shortsLockupViewModel)
+    'reelShelfRenderer', 'items', 'reelItemRenderer', 'headline', 'gridShelfViewModel',
+    'shortsLockupViewModel', 'onTap', 'innertubeCommand', 'reelWatchEndpoint', 'overlayMetadata',
+    'primaryText', 'secondaryText', 'content',
+]
+
+# arguments[0]: 검색 API 요청 본문 JSON (null 이면 ytInitialData 를 읽음, 검색 결과 페이지가 아니면 null 반환)
+# arguments[1]: RESULT_KEYS JSON
+_SEARCH_SCRIPT = """
+var keys = JSON.parse(arguments[1]);
+var sections = function (data) {
+    var results = data.contents && data.contents.twoColumnSearchResultsRenderer;
+    if (results) return results.primaryContents.sectionListRenderer.contents;
+    var items = [];
+    (data.onResponseReceivedCommands || []).forEach(function (command) {
+        var action = command.appendContinuationItemsAction || command.reloadContinuationItemsCommand;
+        if (action && action.continuationItems) items = items.concat(action.continuationItems);
+    });
+    return items;
+};
+if (arguments[0] === null) {
+    var initial = window.ytInitialData;
+    if (location.pathname !== '/results' || !initial || !initial.contents ||
+            !initial.contents.twoColumnSearchResultsRenderer) {
+        return null;
+    }
+    return JSON.stringify(sections(initial), keys);
+}
+var body = JSON.parse(arguments[0]);
+body.context = ytcfg.get('INNERTUBE_CONTEXT');
+var key = ytcfg.get('INNERTUBE_API_KEY');
+return fetch('/youtubei/v1/search?prettyPrint=false' + (key ? '&key=' + key : ''), {
+    method: 'POST',
+    credentials: 'include',
+    headers: {
+        'Content-Type': 'application/json',
+        'X-Youtube-Client-Name': String(ytcfg.get('INNERTUBE_CONTEXT_CLIENT_NAME')),
+        'X-Youtube-Client-Version': ytcfg.get('INNERTUBE_CLIENT_VERSION'),
+    },
+    body: JSON.stringify(body),
+}).then(function (response) {
+    if (!response.ok) throw new Error('search API status ' + response.status);
+    return response.json();
+}).then(function (data) {
+    return JSON.stringify(sections(data), keys);
+});
+"""
+
+
+class SearchDataError(Exception):
+    """검색 결과 JSON 을 가져오지 못함"""
+
+
+class SearchDataStats:
+    """첫 페이지 출처별 수, 다음 페이지 요청 수, 실패 수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {'initial_data': 0, 'search_requests': 0, 'continuations': 0, 'failures': 0, 'bytes': 0}
+
+    def record(self, key: str, size: int = 0):
+        with self._lock:
+            self._stats[key] += 1
+            self._stats['bytes'] += size
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+_stats = SearchDataStats()
+
+
+def get_search_data_stats() -> dict:
+    return _stats.get_stats()
+
+
+def _run(driver, body: Optional[dict]) -> Optional[list]:
+    try:
+        payload = driver.execute_script(_SEARCH_SCRIPT, json.dumps(body) if body is not None else None,
+                                        json.dumps(RESULT_KEYS))
+    except Exception as e:
+        _stats.record('failures')
+        raise SearchDataError(f"in-page search data request failed: {e}") from e
+    if payload is None:
+        return None
+    if body is None:
+        _stats.record('initial_data', len(payload))
+    else:
+        _stats.record('continuations' if 'continuation' in body else 'search_requests', len(payload))
+    return json.loads(payload)
+
+
+def read_initial_data(driver) -> Optional[list]:
+    """검색 결과 페이지의 ytInitialData 섹션 목록 (검색 결과 페이지가 아니면 None)"""
+    return _run(driver, None)
+
+
+def fetch_search(driver, query: Optional[str] = None, continuation: Optional[str] = None) -> list:
+    """페이지 안에서 검색 API 요청 (query 로 첫 페이지, continuation 으로 다음 페이지), 섹션 목록 반환"""
+    body = {'continuation': continuation} if continuation else {'query': query}
+    return _run(driver, body)
+
+
+def text_of(node: Optional[dict]) -> str:
+    """simpleText 또는 runs 형식의 텍스트 노드를 문자열로 변환"""
+    if not node:
+        return ""
+    if "simpleText" in node:
+        return node["simpleText"]
+    return "".join(run.get("text", "") for run in node.get("runs", []))
+
+
+def _shelf_items(item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if "reelShelfRenderer" in item:
+        return item["reelShelfRenderer"].get("items", [])
+    if "gridShelfViewModel" in item:
+        return item["gridShelfViewModel"].get("contents", [])
+    return [item]
+
+
+def parse_contents(sections: list) -> Tuple[List[Tuple[str, Dict[str, Any]]], str]:
+    """섹션 목록에서 (종류, renderer) 목록과 다음 페이지 토큰(없으면 '') 추출
+
+    종류: video(videoRenderer), reel(reelItemRenderer), shorts(shortsLockupViewModel)
+    """
+    renderers = []
+    token = ""
+    for section in sections:
+        if "continuationItemRenderer" in section:
+            endpoint = section["continuationItemRenderer"].get("continuationEndpoint", {})
+            token = endpoint.get("continuationCommand", {}).get("token", "")
+            continue
+        for item in section.get("itemSectionRenderer", {}).get("contents", []):
+            if "videoRenderer" in item:
+                renderers.append(("video", item["videoRenderer"]))
+                continue
+            for shelf_item in _shelf_items(item):
+                if "reelItemRenderer" in shelf_item:
+                    renderers.append(("reel", shelf_item["reelItemRenderer"]))
+                elif "shortsLockupViewModel" in shelf_item:
+                    renderers.append(("shorts", shelf_item["shortsLockupViewModel"]))
+    return renderers, token
@@ -14,6 +14,9 @@ import time
 import os
 import traceback
 import logging
+from typing import Optional
+
+from resource_blocking import DEFAULT_PROFILE, MEASURE, blocked_urls, summarize_performance_log
 
 CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH', '/usr/local/bin/chromedriver')
 
@@ -37,6 +40,8 @@ class SeleniumDriver:
         self.start_url = start_url
         self.options = self._get_options()
         self.logger = logging.getLogger('uvicorn')
+        # 마지막으로 적용한 리소스 차단 프로필 (resource_blocking.py)
+        self.block_profile = None
 
     def _get_options(self):
         options = ChromeOptions()
@@ -72,8 +77,30 @@ class SeleniumDriver:
             "profile.password_manager_enabled": False
         }
         options.add_experimental_option("prefs", prefs)
+        if MEASURE:
+            # 페이지별 전송 바이트/차단 요청 수 집계용 (Network 이벤트만 기록)
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
         return options
 
+    def set_block_profile(self, profile: str):
+        """현재 탭에 네트워크 단계 리소스 차단 프로필 적용 (CDP Network.setBlockedURLs)
+
+        차단 목록은 탭(target)마다 적용되므로 탭을 바꾼 뒤에는 다시 호출해야 한다.
+        """
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls(profile)})
+        self.block_profile = profile
+
+    def network_summary(self) -> Optional[dict]:
+        """마지막 호출 이후 쌓인 Network 이벤트 요약 (RESOURCE_BLOCK_MEASURE=0 이면 None)
+
+        호출할 때마다 성능 로그를 비우므로 요청 시작 전에 한 번 호출해 이전 기록을 버린다.
+        """
+        if not MEASURE or not self.driver:
+            return None
+        return summarize_performance_log(self.driver.get_log('performance'))
+
     def set_up(self):
         """드라이버 초기화 및 페이지 로드
         
@@ -88,6 +115,12 @@ class SeleniumDriver:
             self.driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
             self.driver.set_script_timeout(self.SCRIPT_TIMEOUT)
             self.driver.implicitly_wait(self.IMPLICIT_WAIT)
+
+            try:
+                self.set_block_profile(DEFAULT_PROFILE)
+            except WebDriverException as e:
+                # 차단 없이도 동작에는 문제 없음
+                self.logger.warning(f"[SELENIUM] Failed to apply block profile '{DEFAULT_PROFILE}': {e}")
             
             self.logger.info(f"[SELENIUM] Loading page: {self.start_url}")
             self.driver.get(self.start_url)
@@ -0,0 +1,83 @@
+"""
+동일 키워드 동시 요청 병합 (single-flight)
+같은 (엔드포인트, 정규화된 키워드) 스크래핑이 이미 진행 중이면 새 브라우저 작업을 시작하지 않고 결과를 공유한다.
+limit이 더 작은 요청은 진행 중인 더 큰 limit 작업의 결과를 잘라서 응답한다.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def normalize_keyword(keyword: str) -> str:
+    """공백/대소문자 차이를 무시한 키워드"""
+    return " ".join((keyword or "").split()).lower()
+
+
+def slice_result(result: Any, limit: Optional[int]) -> Any:
+    """limit 개수만큼 결과를 잘라 반환 ({'keyword', 'result'} 딕셔너리 또는 리스트)"""
+    if limit is None:
+        return result
+    if isinstance(result, list):
+        return result[:limit]
+    if isinstance(result, dict) and isinstance(result.get('result'), list):
+        sliced = dict(result)
+        sliced['result'] = result['result'][:limit]
+        return sliced
+    return result
+
+
+class _Call:
+    def __init__(self, limit: Optional[int], future: asyncio.Future):
+        self.limit = limit
+        self.future = future
+
+    def covers(self, limit: Optional[int]) -> bool:
+        """진행 중인 작업 결과로 요청한 limit을 충족할 수 있는지"""
+        if self.limit is None:
+            return True
+        return limit is not None and self.limit >= limit
+
+
+class SingleFlight:
+    """이벤트 루프 안에서 동일 요청의 진행 중 작업을 공유"""
+
+    def __init__(self):
+        self._calls: Dict[Tuple[str, str], List[_Call]] = {}
+        self._stats = {
+            'started': 0,
+            'coalesced': 0,
+        }
+
+    async def do(self, endpoint: str, keyword: str, func: Callable[[], Awaitable[Any]],
+                 limit: Optional[int] = None) -> Any:
+        """진행 중인 동일 작업이 있으면 그 결과를, 없으면 func()를 실행한 결과를 반환
+
+        호출자가 취소(타임아웃)되어도 작업은 계속 진행되어 다른 대기자에게 결과를 전달한다.
+        """
+        key = (endpoint, normalize_keyword(keyword))
+        for call in self._calls.get(key, []):
+            if call.covers(limit):
+                self._stats['coalesced'] += 1
+                result = await asyncio.shield(call.future)
+                return slice_result(result, limit)
+
+        call = _Call(limit, asyncio.ensure_future(func()))
+        self._calls.setdefault(key, []).append(call)
+        call.future.add_done_callback(lambda future: self._finish(key, call))
+        self._stats['started'] += 1
+        result = await asyncio.shield(call.future)
+        return slice_result(result, limit)
+
+    def _finish(self, key: Tuple[str, str], call: _Call):
+        calls = self._calls.get(key, [])
+        if call in calls:
+            calls.remove(call)
+        if not calls:
+            self._calls.pop(key, None)
+        # 모든 대기자가 취소된 경우에도 예외가 '처리되지 않음' 경고로 남지 않도록 조회
+        if not call.future.cancelled():
+            call.future.exception()
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats['in_flight'] = sum(len(calls) for calls in self._calls.values())
+        return stats
@@ -0,0 +1,163 @@
+"""
+페이지 준비 대기 도구
+고정 time.sleep 대신 페이지에서 오는 신호로 기다린다. Selenium WebDriver 와 탭 풀의 TabDriver 모두
+execute_script 만 사용하므로 같은 함수로 대기할 수 있다.
+
+- 요소 개수 조건: wait_for_count (선택자에 맞는 요소가 n 개 이상)
+- 페이지 안정 상태: wait_for_idle (DOM 변경(MutationObserver)과 fetch/XHR/리소스 로드가 quiet 초 동안 없음)
+  관찰 스크립트는 대기 함수를 처음 호출할 때 페이지에 설치되고, 페이지를 이동하면 다시 설치된다
+- 적응형 타임아웃: 대기 이름(key)별 최근 대기 시간의 p90 × WAIT_TIMEOUT_FACTOR 를 timeout 으로 사용
+  (최소 WAIT_MIN_TIMEOUT, 최대는 호출한 쪽이 준 timeout, 기록이 없으면 최대값).
+  타임아웃은 줄어든 대기 시간이 아니라 최대값으로 기록해서 timeout 이 계속 줄어들지 않게 한다.
+  wait_for_count 는 일찍 끝나면 결과가 덜 모인 채 캐시될 수 있으므로 기본값은 고정 timeout (adaptive=False)
+
+CDP 네트워크 이벤트는 selenium execute_cdp_cmd 로 받을 수 없으므로, 진행 중인 요청 수는 페이지에서
+fetch/XHR 을 감싸서 센다 (관찰 스크립트 설치 전에 시작된 요청은 세지 못함).
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+WAIT_POLL_INTERVAL = float(os.environ.get('WAIT_POLL_INTERVAL', '0.1'))
+WAIT_TIMEOUT_FACTOR = float(os.environ.get('WAIT_TIMEOUT_FACTOR', '2'))
+WAIT_MIN_TIMEOUT = float(os.environ.get('WAIT_MIN_TIMEOUT', '0.5'))
+# 적응형 타임아웃 계산에 사용할 최근 대기 기록 수
+WAIT_HISTORY = 50
+
+# 페이지 활동 관찰 설치 후, 마지막 활동 이후 지난 시간(ms) 반환 (요청이 진행 중이면 0)
+_WATCH_SCRIPT = """
+var w = window.__crawlWait;
+if (!w) {
+    w = window.__crawlWait = {last: performance.now(), inflight: 0};
+    var touch = function () { w.last = performance.now(); };
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true, characterData: true});
+    if (window.PerformanceObserver) {
+        try { new PerformanceObserver(touch).observe({type: 'resource'}); } catch (e) {}
+    }
+    var done = function () { w.inflight = Math.max(0, w.inflight - 1); touch(); };
+    if (window.fetch) {
+        var fetch_ = window.fetch;
+        window.fetch = function () {
+            w.inflight++; touch();
+            return fetch_.apply(this, arguments).finally(done);
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        w.inflight++; touch();
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+}
+return w.inflight > 0 ? 0 : performance.now() - w.last;
+"""
+
+# [선택자에 맞는 요소 수, 마지막 활동 이후 지난 시간(ms)]
+_COUNT_SCRIPT = (
+    "var idle = (function () {" + _WATCH_SCRIPT + "})();"
+    "return [document.querySelectorAll(arguments[0]).length, idle];"
+)
+
+logger = logging.getLogger('uvicorn')
+
+
+class AdaptiveTimeout:
+    """대기 이름별 최근 대기 시간으로 timeout 계산"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._history: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def timeout(self, key: str, maximum: float) -> float:
+        with self._lock:
+            history = sorted(self._history.get(key, ()))
+        if not history:
+            return maximum
+        p90 = history[min(len(history) - 1, int(len(history) * 0.9))]
+        return min(maximum, max(WAIT_MIN_TIMEOUT, p90 * WAIT_TIMEOUT_FACTOR))
+
+    def record(self, key: str, elapsed: float, timed_out: bool, maximum: float):
+        """대기 결과 기록 (타임아웃은 최대값 maximum 으로 기록해서 다음 timeout 이 늘어나게 함)"""
+        with self._lock:
+            self._history.setdefault(key, deque(maxlen=WAIT_HISTORY)).append(
+                max(elapsed, maximum) if timed_out else elapsed
+            )
+            stats = self._stats.setdefault(key, {'waits': 0, 'timeouts': 0, 'total_time': 0.0})
+            stats['waits'] += 1
+            stats['timeouts'] += int(timed_out)
+            stats['total_time'] += elapsed
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = {key: dict(value) for key, value in self._stats.items()}
+        for key, value in stats.items():
+            total_time = value.pop('total_time')
+            value['avg_ms'] = round(total_time / value['waits'] * 1000, 1) if value['waits'] else 0.0
+        return stats
+
+
+_timeouts = AdaptiveTimeout()
+
+
+def get_wait_stats() -> dict:
+    """대기 이름별 횟수, 타임아웃 수, 평균 대기 시간"""
+    return _timeouts.get_stats()
+
+
+def _poll(driver, script: str, args: tuple, done, key: str, timeout: float, adaptive: bool):
+    """done(결과) 가 참이 될 때까지 script 를 반복 실행 (마지막 결과와 성공 여부 반환)"""
+    maximum = timeout
+    if adaptive:
+        timeout = _timeouts.timeout(key, maximum)
+    start = time.monotonic()
+    deadline = start + timeout
+    result = None
+    while True:
+        try:
+            result = driver.execute_script(script, *args)
+        except Exception as e:
+            # 페이지 이동 중에는 스크립트 실행이 실패할 수 있음
+            logger.debug(f"[WAIT] {key}: script failed while waiting: {e}")
+            result = None
+        if result is not None and done(result):
+            _timeouts.record(key, time.monotonic() - start, False, maximum)
+            return result, True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _timeouts.record(key, time.monotonic() - start, True, maximum)
+            logger.debug(f"[WAIT] {key}: timed out after {timeout:.2f}s")
+            return result, False
+        time.sleep(min(WAIT_POLL_INTERVAL, remaining))
+
+
+def wait_until(driver, script: str, *args: Any, timeout: float = 5.0, key: Optional[str] = None,
+               adaptive: bool = True) -> Any:
+    """JS 조건(script 의 반환값)이 참이 될 때까지 대기 (타임아웃이면 None)"""
+    result, ok = _poll(driver, script, args, bool, key or script[:60], timeout, adaptive)
+    return result if ok else None
+
+
+def wait_for_idle(driver, quiet: float = 0.3, timeout: float = 3.0, key: str = 'idle',
+                  adaptive: bool = True) -> bool:
+    """DOM 변경과 네트워크 요청이 quiet 초 동안 없을 때까지 대기 (타임아웃이면 False)"""
+    _, ok = _poll(driver, _WATCH_SCRIPT, (), lambda idle: idle >= quiet * 1000, key, timeout, adaptive)
+    return ok
+
+
+def wait_for_count(driver, selector: str, count: int = 1, timeout: float = 5.0, key: Optional[str] = None,
+                   settle: Optional[float] = None, adaptive: bool = False) -> int:
+    """selector 에 맞는 요소가 count 개 이상이 될 때까지 대기하고 마지막으로 확인한 요소 수 반환
+
+    settle(초)을 주면 요소가 부족해도 페이지가 settle 초 동안 변하지 않으면 더 생기지 않는 것으로 보고 끝낸다
+    (요소가 아예 없는 페이지에서 timeout 까지 기다리지 않도록).
+    """
+    def done(result) -> bool:
+        current, idle = result
+        return current >= count or (settle is not None and idle >= settle * 1000)
+
+    result, _ = _poll(driver, _COUNT_SCRIPT, (selector,), done, key or selector, timeout, adaptive)
+    return result[0] if result else 0
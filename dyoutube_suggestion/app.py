@@ -1,4 +1,5 @@
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 import logging
 import time
 import asyncio
@@ -6,6 +7,10 @@ from concurrent.futures import ThreadPoolExecutor
 import os
 
 from scraper import Scraper
+from browser_worker import cleanup_browser_worker_pool, get_browser_worker_pool
+from result_cache import ResultCache
+from batch import BatchRequest, BatchScheduler
+from streaming import negotiate, stream_response
 
 app = FastAPI(
     title="YouTube Suggestion Scraper",
@@ -14,11 +19,15 @@ app = FastAPI(
 )
 
 # Browser crawling uses significant container resources, so keep it serial by default.
+SCRAPER_MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", "1"))
 executor = ThreadPoolExecutor(
-    max_workers=int(os.getenv("SCRAPER_MAX_WORKERS", "1")),
+    max_workers=SCRAPER_MAX_WORKERS,
     thread_name_prefix="scraper_worker"
 )
 
+# 추천 검색어 결과 캐시 (fresh 6시간, stale 24시간)
+result_cache = ResultCache({'suggestions': (6 * 3600, 24 * 3600)})
+
 # 로거 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -26,9 +35,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger("uvicorn")
 
+@app.on_event("startup")
+async def startup_event():
+    # 첫 요청 전에 상주 브라우저 워커를 띄워 둠 (브라우저 시작은 워커 프로세스에서 진행)
+    if Scraper().use_browser_worker:
+        get_browser_worker_pool()
+
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutting down")
+    await batch_scheduler.close()
+    result_cache.close()
+    cleanup_browser_worker_pool()
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -54,6 +72,66 @@ def get_suggestions_sync(keyword: str):
             "detail": str(e)[:500],
         }
 
+async def run_batch_keyword(endpoint: str, keyword: str, limit=None):
+    """배치 키워드 하나 실행 (단건 요청과 같은 캐시 경로, 스크래핑 직전에 속도 제한)"""
+    loop = asyncio.get_running_loop()
+
+    async def scrape():
+        await batch_scheduler.throttle(endpoint)
+        return await loop.run_in_executor(executor, get_suggestions_sync, keyword)
+
+    return await result_cache.get_or_load('suggestions', keyword, scrape)
+
+# 배치 요청은 키워드를 job 별로 돌아가며 실행 (브라우저 작업이므로 동시 실행 수는 executor 워커 수)
+batch_scheduler = BatchScheduler(
+    run_batch_keyword,
+    {'suggestions': 'youtube'},
+    concurrency=SCRAPER_MAX_WORKERS
+)
+
+@app.post(
+    "/batch",
+    summary="유튜브 추천 검색어 배치 스크래핑",
+    description="여러 키워드를 한 번에 받아 서버에서 나눠 실행합니다. job_id로 결과를 조회하거나 NDJSON/SSE로 바로 받습니다.",
+    response_model=None
+)
+async def batch(request: Request, body: BatchRequest):
+    """키워드 배치 엔드포인트
+
+    Args:
+        body: {'keywords': [str, ...]}
+
+    Returns:
+        {'job_id': str, ...} (GET /batch/{job_id} 로 진행 상황/결과 조회)
+        Accept: application/x-ndjson 또는 text/event-stream 이면 키워드 결과를 완료되는 대로 스트리밍
+    """
+    try:
+        job = batch_scheduler.submit(body.endpoint, body.keywords, body.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = negotiate(request)
+    if media_type is not None:
+        return stream_response(media_type, batch_scheduler.stream(job))
+    return JSONResponse(status_code=202, content=job.to_dict(offset=job.total))
+
+@app.get("/batch/{job_id}")
+async def batch_status(job_id: str, offset: int = 0):
+    """배치 진행 상황과 offset 이후에 완료된 결과"""
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job.to_dict(offset=offset)
+
+@app.delete("/batch/{job_id}")
+async def batch_cancel(job_id: str):
+    """아직 시작하지 않은 키워드 취소"""
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    batch_scheduler.cancel(job)
+    return job.to_dict(offset=len(job.results))
+
 @app.get("/search/suggestions")
 async def search_suggestions(keyword: str):
     """
@@ -67,7 +145,11 @@ async def search_suggestions(keyword: str):
     try:
         loop = asyncio.get_running_loop()
         # ThreadPoolExecutor를 사용하여 동기 함수를 비동기로 실행
-        result = await loop.run_in_executor(executor, get_suggestions_sync, keyword)
+        result = await result_cache.get_or_load(
+            'suggestions',
+            keyword,
+            lambda: loop.run_in_executor(executor, get_suggestions_sync, keyword)
+        )
         return result
     except Exception as e:
         logger.error(f"API Error: {e}")
@@ -81,3 +163,11 @@ async def search_suggestions(keyword: str):
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/stats")
+async def get_stats():
+    return {
+        "result_cache_stats": result_cache.get_stats(),
+        "batch_stats": batch_scheduler.get_stats(),
+        "browser_worker_stats": get_browser_worker_pool().get_stats() if Scraper().use_browser_worker else None,
+    }
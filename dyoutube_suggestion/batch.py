@@ -0,0 +1,487 @@
+"""
+키워드 배치 스케줄러 (POST /batch)
+키워드마다 HTTP 요청을 따로 보내지 않고 수백 개의 키워드를 한 번에 받아 서버에서 나눠 실행한다.
+
+- 공정 큐: 배치(job)별 대기열을 라운드 로빈으로 돌며 키워드를 꺼내므로, 큰 배치가 뒤에 들어온 작은 배치를 막지 않음
+- 동시 실행 수: BATCH_CONCURRENCY (기본값은 서비스의 스크래퍼 워커 수)
+- 사이트별 속도 제한: 토큰 버킷, BATCH_RATE_LIMITS="사이트=초당 요청 수,..." (기본 BATCH_RATE_PER_SEC),
+  캐시에 있는 키워드는 기다리지 않도록 실제 스크래핑 직전에 throttle() 로 적용
+- 결과는 완료되는 대로 job 에 쌓이고 GET /batch/{job_id} 로 조회하거나, NDJSON/SSE 로 요청하면 바로 받음
+- job 의 키워드는 요청을 받은 워커 프로세스가 실행하고, 상태와 결과는 같은 서버의 모든 gunicorn 워커가 공유하는
+  SQLite 파일(BATCH_DB_PATH)에 기록하므로 GET/DELETE /batch/{job_id} 는 어느 워커가 받아도 같은 결과
+- 실행하던 워커가 종료되면(max_requests 재시작 등) 남은 키워드는 실행되지 않고 job 은 interrupted 로 끝남
+- 끝난 job 은 BATCH_JOB_TTL 초 후 삭제
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+BATCH_DB_PATH = os.environ.get('BATCH_DB_PATH', '/tmp/batch_jobs.sqlite3')
+BATCH_MAX_KEYWORDS = int(os.environ.get('BATCH_MAX_KEYWORDS', '1000'))
+BATCH_JOB_TTL = float(os.environ.get('BATCH_JOB_TTL', '3600'))
+BATCH_RATE_PER_SEC = float(os.environ.get('BATCH_RATE_PER_SEC', '1'))
+BATCH_RATE_BURST = float(os.environ.get('BATCH_RATE_BURST', '2'))
+BATCH_RATE_LIMITS = os.environ.get('BATCH_RATE_LIMITS', '')
+
+Runner = Callable[[str, str, Optional[int]], Awaitable[Any]]
+
+
+class BatchRequest(BaseModel):
+    keywords: List[str]
+    endpoint: Optional[str] = None
+    limit: Optional[int] = None
+
+
+def parse_rate_limits(value: str) -> Dict[str, float]:
+    """'naver=1,youtube=0.5' 형식의 사이트별 초당 요청 수"""
+    limits = {}
+    for pair in value.split(','):
+        site, _, rate = pair.partition('=')
+        if site.strip() and rate.strip():
+            limits[site.strip()] = float(rate)
+    return limits
+
+
+class RateLimiter:
+    """토큰 버킷 속도 제한 (rate <= 0 이면 제한 없음)"""
+
+    def __init__(self, rate: float, burst: float = BATCH_RATE_BURST):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self.waits = 0
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # 대기 순서대로 토큰을 받도록 잠금 안에서 기다림
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                self.waits += 1
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+
+class BatchJob:
+    """키워드 배치 하나 (결과는 완료 순서대로 쌓임)"""
+
+    def __init__(self, endpoint: str, keywords: List[str], limit: Optional[int], job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.endpoint = endpoint
+        self.keywords = keywords
+        self.limit = limit
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancelled = False
+        self.interrupted = False
+        self.running = 0
+        self.results: List[dict] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.keywords)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def status(self) -> str:
+        if self.cancelled:
+            return 'cancelled'
+        if self.interrupted:
+            return 'interrupted'
+        if self.done:
+            return 'done'
+        return 'running' if self.started_at is not None else 'queued'
+
+    def add_result(self, record: dict):
+        self.results.append(record)
+        self._notify()
+
+    def finish(self):
+        if self.finished_at is None:
+            self.finished_at = time.time()
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def events(self) -> AsyncIterator[Tuple[str, dict]]:
+        """완료되는 결과를 순서대로 item/error 이벤트로 반환 (job 이 끝나면 종료)"""
+        sent = 0
+        while True:
+            changed = self._changed
+            while sent < len(self.results):
+                record = self.results[sent]
+                sent += 1
+                if 'error' in record:
+                    yield 'error', record
+                else:
+                    yield 'item', {'keyword': record['keyword'], 'item': record['result']}
+            if self.done:
+                return
+            await changed.wait()
+
+    def to_dict(self, offset: int = 0) -> dict:
+        failed = sum(1 for record in self.results if 'error' in record)
+        return {
+            'job_id': self.id,
+            'endpoint': self.endpoint,
+            'status': self.status,
+            'total': self.total,
+            'completed': len(self.results) - failed,
+            'failed': failed,
+            'offset': offset,
+            'results': self.results[offset:],
+        }
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BatchStore:
+    """gunicorn 워커들이 공유하는 job 상태/결과 저장소 (SQLite)
+
+    job 을 실행하는 워커(owner, pid)만 결과를 쓰고, 다른 워커는 읽거나 취소 표시만 한다.
+    owner 프로세스가 사라진 채 끝나지 않은 job 은 읽을 때 interrupted 로 마감한다.
+    """
+
+    def __init__(self, path: str = BATCH_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS batch_jobs ('
+            'id TEXT PRIMARY KEY, '
+            'endpoint TEXT NOT NULL, '
+            'keywords TEXT NOT NULL, '
+            'result_limit INTEGER, '
+            'owner INTEGER NOT NULL, '
+            'cancelled INTEGER NOT NULL DEFAULT 0, '
+            'interrupted INTEGER NOT NULL DEFAULT 0, '
+            'created_at REAL NOT NULL, '
+            'started_at REAL, '
+            'finished_at REAL)'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS batch_results ('
+            'job_id TEXT NOT NULL, '
+            'seq INTEGER NOT NULL, '
+            'record TEXT NOT NULL, '
+            'PRIMARY KEY (job_id, seq))'
+        )
+
+    def add(self, job: BatchJob):
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO batch_jobs (id, endpoint, keywords, result_limit, owner, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (job.id, job.endpoint, json.dumps(job.keywords, ensure_ascii=False), job.limit, os.getpid(),
+                 job.created_at)
+            )
+
+    def start(self, job: BatchJob):
+        with self._lock:
+            self._db.execute('UPDATE batch_jobs SET started_at = ? WHERE id = ?', (job.started_at, job.id))
+
+    def add_result(self, job: BatchJob, seq: int, record: dict):
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO batch_results (job_id, seq, record) VALUES (?, ?, ?)',
+                (job.id, seq, json.dumps(record, ensure_ascii=False))
+            )
+
+    def finish(self, job: BatchJob):
+        with self._lock:
+            self._db.execute(
+                'UPDATE batch_jobs SET finished_at = ?, cancelled = ?, interrupted = ? WHERE id = ?',
+                (job.finished_at, int(job.cancelled), int(job.interrupted), job.id)
+            )
+
+    def cancel(self, job_id: str):
+        """취소 표시 (owner 워커가 다음 키워드를 꺼내기 전에 확인)"""
+        with self._lock:
+            self._db.execute('UPDATE batch_jobs SET cancelled = 1 WHERE id = ? AND finished_at IS NULL', (job_id,))
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._db.execute('SELECT cancelled FROM batch_jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def load(self, job_id: str) -> Optional[BatchJob]:
+        """저장된 job 과 결과 (없으면 None)"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT endpoint, keywords, result_limit, owner, cancelled, interrupted, created_at, started_at, '
+                'finished_at FROM batch_jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            records = self._db.execute(
+                'SELECT record FROM batch_results WHERE job_id = ? ORDER BY seq', (job_id,)
+            ).fetchall()
+        endpoint, keywords, limit, owner, cancelled, interrupted, created_at, started_at, finished_at = row
+        job = BatchJob(endpoint, json.loads(keywords), limit, job_id=job_id)
+        job.created_at = created_at
+        job.started_at = started_at
+        job.finished_at = finished_at
+        job.cancelled = bool(cancelled)
+        job.interrupted = bool(interrupted)
+        job.results = [json.loads(record) for (record,) in records]
+        if not job.done and not _process_alive(owner):
+            job.interrupted = True
+            job.finish()
+            self.finish(job)
+        return job
+
+    def prune(self, ttl: float):
+        cutoff = time.time() - ttl
+        with self._lock:
+            self._db.execute(
+                'DELETE FROM batch_results WHERE job_id IN (SELECT id FROM batch_jobs WHERE finished_at < ?)',
+                (cutoff,)
+            )
+            self._db.execute('DELETE FROM batch_jobs WHERE finished_at < ?', (cutoff,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class BatchScheduler:
+    """배치 job 들의 키워드를 공정하게 돌아가며 실행
+
+    Args:
+        runner: runner(endpoint, keyword, limit) 키워드 하나의 결과 (서비스의 캐시/single-flight 경로)
+        sites: {엔드포인트: 사이트 이름} 속도 제한 단위
+        concurrency: 동시에 실행할 키워드 수 (BATCH_CONCURRENCY 로 변경 가능)
+        store_path: job 상태/결과를 공유할 SQLite 파일 (None 이면 이 프로세스 메모리에만 보관)
+    """
+
+    def __init__(self, runner: Runner, sites: Dict[str, str], concurrency: int,
+                 store_path: Optional[str] = BATCH_DB_PATH):
+        self.logger = logging.getLogger('uvicorn')
+        self.runner = runner
+        self.sites = sites
+        self.concurrency = max(1, int(os.environ.get('BATCH_CONCURRENCY', concurrency)))
+        rate_limits = parse_rate_limits(BATCH_RATE_LIMITS)
+        self._limiters = {
+            site: RateLimiter(rate_limits.get(site, BATCH_RATE_PER_SEC))
+            for site in set(sites.values())
+        }
+        self._store: Optional[BatchStore] = None
+        if store_path:
+            try:
+                self._store = BatchStore(store_path)
+            except sqlite3.Error as e:
+                self.logger.warning(f"[BATCH] Job store unavailable ({store_path}), keeping jobs in memory: {e}")
+        # 이 프로세스가 실행하는 job
+        self._jobs: 'OrderedDict[str, BatchJob]' = OrderedDict()
+        # job id 별 대기 키워드 (라운드 로빈 순서 유지를 위해 꺼낸 job 은 맨 뒤로 이동)
+        self._queues: 'OrderedDict[str, Deque[str]]' = OrderedDict()
+        self._available: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Future] = []
+        self._stats = {
+            'jobs': 0,
+            'keywords': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled_jobs': 0,
+            'store_errors': 0,
+        }
+
+    def _persist(self, method: str, *args) -> Any:
+        """저장소 호출 (실패해도 실행 중인 배치는 계속 진행)"""
+        if self._store is None:
+            return None
+        try:
+            return getattr(self._store, method)(*args)
+        except sqlite3.Error as e:
+            self._stats['store_errors'] += 1
+            self.logger.warning(f"[BATCH] Job store {method} failed: {e}")
+            return None
+
+    def submit(self, endpoint: Optional[str], keywords: List[str], limit: Optional[int] = None) -> BatchJob:
+        """배치를 대기열에 넣고 job 반환 (잘못된 요청이면 ValueError)"""
+        if endpoint is None and len(self.sites) == 1:
+            endpoint = next(iter(self.sites))
+        if endpoint not in self.sites:
+            raise ValueError(f"Unknown endpoint '{endpoint}', expected one of {sorted(self.sites)}")
+        keywords = [keyword.strip() for keyword in keywords if keyword and keyword.strip()]
+        if not keywords:
+            raise ValueError("Keywords cannot be empty.")
+        if len(keywords) > BATCH_MAX_KEYWORDS:
+            raise ValueError(f"Too many keywords ({len(keywords)} > {BATCH_MAX_KEYWORDS}).")
+        if limit is not None and limit <= 0:
+            raise ValueError("Limit must be greater than 0.")
+
+        self._start()
+        self._prune()
+        job = BatchJob(endpoint, keywords, limit)
+        self._persist('add', job)
+        self._jobs[job.id] = job
+        self._queues[job.id] = deque(keywords)
+        for _ in keywords:
+            self._available.release()
+        self._stats['jobs'] += 1
+        self._stats['keywords'] += len(keywords)
+        self.logger.info(f"[BATCH] Job {job.id} queued: {endpoint}, {len(keywords)} keywords")
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        """job 조회 (다른 워커가 실행 중인 job 은 저장소에서 읽은 현재 상태)"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            # 다른 워커가 받은 DELETE 반영
+            if not job.done and not job.cancelled and self._persist('is_cancelled', job_id):
+                self.cancel(job)
+            return job
+        return self._persist('load', job_id)
+
+    def cancel(self, job: BatchJob):
+        """아직 시작하지 않은 키워드를 대기열에서 제거 (실행 중인 키워드는 끝까지 진행)
+
+        다른 워커가 실행 중인 job 이면 취소 표시만 하고, 실행하는 워커가 다음 키워드를 꺼낼 때 반영한다.
+        """
+        if job.done or job.cancelled:
+            return
+        job.cancelled = True
+        self._stats['cancelled_jobs'] += 1
+        if job.id not in self._jobs:
+            self._persist('cancel', job.id)
+            return
+        self._queues.pop(job.id, None)
+        self._persist('cancel', job.id)
+        if job.running == 0:
+            self._finish(job)
+
+    async def stream(self, job: BatchJob) -> AsyncIterator[Tuple[str, dict]]:
+        """job 결과 이벤트 (받던 쪽이 중간에 끊으면 남은 키워드 취소)"""
+        try:
+            async for event in job.events():
+                yield event
+        finally:
+            self.cancel(job)
+
+    async def throttle(self, endpoint: str):
+        """사이트별 속도 제한 (실제 스크래핑 직전에 호출)"""
+        await self._limiters[self.sites[endpoint]].acquire()
+
+    def _start(self):
+        if self._workers:
+            return
+        self._available = asyncio.Semaphore(0)
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.concurrency)]
+
+    def _next(self) -> Optional[Tuple[BatchJob, str]]:
+        """라운드 로빈으로 다음 job 의 키워드 하나"""
+        while self._queues:
+            job_id, queue = next(iter(self._queues.items()))
+            keyword = queue.popleft()
+            if queue:
+                self._queues.move_to_end(job_id)
+            else:
+                del self._queues[job_id]
+            return self._jobs[job_id], keyword
+        return None
+
+    def _finish(self, job: BatchJob):
+        job.finish()
+        self._persist('finish', job)
+
+    async def _work(self):
+        while True:
+            await self._available.acquire()
+            task = self._next()
+            # 취소된 job 의 몫은 건너뜀
+            if task is None:
+                continue
+            job, keyword = task
+            # 다른 워커가 받은 DELETE 반영
+            if self._persist('is_cancelled', job.id):
+                self.cancel(job)
+                continue
+            if job.started_at is None:
+                job.started_at = time.time()
+                self._persist('start', job)
+            job.running += 1
+            try:
+                result = await self.runner(job.endpoint, keyword, job.limit)
+                record = {'keyword': keyword, 'result': result}
+                self._stats['completed'] += 1
+            except Exception as e:
+                self.logger.error(f"[BATCH] Job {job.id} keyword '{keyword}' failed: {e}")
+                record = {'keyword': keyword, 'error': str(e)[:500]}
+                self._stats['failed'] += 1
+            finally:
+                job.running -= 1
+            job.add_result(record)
+            self._persist('add_result', job, len(job.results) - 1, record)
+            if job.running == 0 and (job.cancelled or len(job.results) == job.total):
+                self._finish(job)
+
+    def _prune(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.done and now - job.finished_at > BATCH_JOB_TTL:
+                del self._jobs[job_id]
+        self._persist('prune', BATCH_JOB_TTL)
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        stats['concurrency'] = self.concurrency
+        stats['queued'] = sum(len(queue) for queue in self._queues.values())
+        stats['running'] = sum(job.running for job in self._jobs.values())
+        stats['active_jobs'] = sum(1 for job in self._jobs.values() if not job.done)
+        stats['shared_store'] = self._store.path if self._store is not None else None
+        stats['rate_limits'] = {
+            site: {'rate_per_sec': limiter.rate, 'waits': limiter.waits}
+            for site, limiter in self._limiters.items()
+        }
+        return stats
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        # 이 워커가 실행하던 job 은 더 진행되지 않으므로 다른 워커에서 조회할 때 끝난 것으로 보이도록 마감
+        for job in self._jobs.values():
+            if not job.done:
+                job.interrupted = not job.cancelled
+                self._finish(job)
+        self._queues.clear()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
@@ -0,0 +1,241 @@
+"""
+상주 브라우저 워커
+검색어마다 새 Python 프로세스를 띄우고(DrissionPage import, Xvfb, Chrome 시작) 끝나면 모두 종료하는 대신,
+브라우저를 띄워 둔 워커 프로세스에 파이프로 검색어를 보내고 결과를 받는다.
+
+- DRISSION_BROWSER_WORKERS 개의 워커 프로세스 (기본 SCRAPER_MAX_WORKERS), 워커마다 Xvfb/Chrome/프로필 디렉터리를 따로 가짐
+- 격리는 감시로 유지: 결과가 timeout 안에 오지 않거나 워커가 죽으면 워커의 프로세스 그룹(Chrome, Xvfb 포함)을
+  종료하고 새 워커를 띄운다 (새 워커는 다음 검색어가 오기 전에 미리 브라우저를 띄워 둠)
+- 크롤링 중 예외가 나면 브라우저 상태를 알 수 없으므로 다음 검색어 전에 브라우저를 다시 띄우고,
+  DRISSION_BROWSER_WORKER_MAX_QUERIES 개를 처리한 워커는 메모리 누적을 막기 위해 교체한다
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from typing import Optional
+
+BROWSER_WORKERS = int(os.getenv("DRISSION_BROWSER_WORKERS", os.getenv("SCRAPER_MAX_WORKERS", "1")))
+BROWSER_WORKER_MAX_QUERIES = int(os.getenv("DRISSION_BROWSER_WORKER_MAX_QUERIES", "200"))
+PROFILE_DIR = os.getenv("DRISSION_PROFILE_DIR", "/tmp/dyoutube_suggestion_chrome_profile")
+
+logger = logging.getLogger("uvicorn")
+# 웹 서버 프로세스의 스레드/이벤트 루프를 물려받지 않도록 새 인터프리터로 시작
+_context = multiprocessing.get_context("spawn")
+
+
+class BrowserWorkerError(Exception):
+    """워커가 시간 안에 결과를 주지 못했거나 죽음 (워커는 교체됨)"""
+
+
+def _quit_page(page):
+    if page is None:
+        return
+    try:
+        page.quit()
+    except Exception as e:
+        logger.debug(f"[BROWSER_WORKER] Error closing DrissionPage: {e}")
+
+
+def _worker_main(conn, index: int):
+    """워커 프로세스: 브라우저를 띄워 두고 검색어를 하나씩 처리 (None 을 받거나 파이프가 닫히면 종료)"""
+    # 감시하는 쪽에서 Chrome/Xvfb 까지 한 번에 종료할 수 있도록 새 프로세스 그룹으로 분리
+    os.setsid()
+    os.environ["YOUTUBE_DRISSION_CHILD"] = "1"
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"%(asctime)s - %(name)s - %(levelname)s - [browser-worker-{index}] - %(message)s"
+    )
+    from scraper import Scraper
+
+    scraper = Scraper()
+    profile_dir = f"{PROFILE_DIR}-{index}"
+    os.makedirs(profile_dir, exist_ok=True)
+    xvfb_proc = scraper._start_xvfb_if_needed()
+    page = None
+    try:
+        # 첫 검색어가 오기 전에 미리 브라우저 시작
+        try:
+            page = scraper._open_page(profile_dir)
+        except Exception as e:
+            logger.warning(f"[BROWSER_WORKER] Failed to start browser, retrying on first query: {e}")
+
+        while True:
+            try:
+                query = conn.recv()
+            except EOFError:
+                # 웹 서버 프로세스가 종료됨
+                break
+            if query is None:
+                break
+
+            try:
+                if page is None:
+                    page = scraper._open_page(profile_dir)
+                suggestions = scraper._crawl_suggestions(page, query)
+                result = scraper._build_suggestion_response(query, suggestions)
+                logger.info(f"[BROWSER_WORKER] Final suggestion result: {result}")
+            except Exception as e:
+                logger.warning(f"[BROWSER_WORKER] DrissionPage suggestion crawl failed: {e}")
+                result = scraper._build_suggestion_response(query, [], error="youtube_unreachable", detail=str(e))
+                # 브라우저 상태를 알 수 없으므로 다음 검색어 전에 다시 띄움
+                _quit_page(page)
+                page = None
+            conn.send(result)
+    finally:
+        _quit_page(page)
+        if xvfb_proc is not None:
+            xvfb_proc.terminate()
+
+
+class BrowserWorker:
+    """워커 프로세스 하나와 파이프 (한 번에 검색어 하나)"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.queries = 0
+
+    def start(self):
+        parent_conn, child_conn = _context.Pipe()
+        self.process = _context.Process(
+            target=_worker_main,
+            args=(child_conn, self.index),
+            name=f"browser-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.queries = 0
+        logger.info(f"[BROWSER_WORKER] browser-worker-{self.index} started (pid: {self.process.pid})")
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def stop(self, graceful: bool = True):
+        """워커 종료 (graceful 이면 브라우저를 닫을 때까지 잠시 기다림), 남은 Chrome/Xvfb 는 프로세스 그룹째 종료"""
+        if self.process is None:
+            return
+        if graceful and self.alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=10)
+            except (OSError, ValueError):
+                pass
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            # setsid 전에 종료하는 경우
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def restart(self, reason: str):
+        logger.warning(f"[BROWSER_WORKER] Restarting browser-worker-{self.index}: {reason}")
+        self.stop(graceful=False)
+        self.start()
+
+    def run(self, query: str, timeout: float) -> dict:
+        self.conn.send(query)
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"browser worker did not answer within {timeout}s")
+        result = self.conn.recv()
+        self.queries += 1
+        return result
+
+
+class BrowserWorkerPool:
+    """상주 브라우저 워커 풀"""
+
+    def __init__(self, size: int = BROWSER_WORKERS):
+        self._idle: "queue.Queue[BrowserWorker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {'queries': 0, 'timeouts': 0, 'crashes': 0, 'recycled': 0, 'total_time': 0.0}
+        self._workers = [BrowserWorker(index) for index in range(max(1, size))]
+        for worker in self._workers:
+            worker.start()
+            self._idle.put(worker)
+
+    def _record(self, key: str, elapsed: Optional[float] = None):
+        with self._lock:
+            self._stats[key] += 1
+            if elapsed is not None:
+                self._stats['total_time'] += elapsed
+
+    def get_suggestions(self, query: str, timeout: float) -> dict:
+        """쉬고 있는 워커에 검색어를 보내고 결과 반환 (시간 초과/워커 종료 시 워커를 교체하고 BrowserWorkerError)"""
+        worker = self._idle.get()
+        start = time.monotonic()
+        try:
+            if not worker.alive():
+                self._record('crashes')
+                worker.restart("process exited while idle")
+            try:
+                result = worker.run(query, timeout)
+            except TimeoutError as e:
+                self._record('timeouts')
+                worker.restart(str(e))
+                raise BrowserWorkerError(f"DrissionPage browser worker timed out after {timeout}s") from e
+            except (EOFError, OSError) as e:
+                self._record('crashes')
+                worker.restart(f"process died during query: {e!r}")
+                raise BrowserWorkerError(f"DrissionPage browser worker died: {e!r}") from e
+
+            self._record('queries', time.monotonic() - start)
+            if worker.queries >= BROWSER_WORKER_MAX_QUERIES:
+                self._record('recycled')
+                # 응답을 늦추지 않도록 교체는 백그라운드에서 (교체가 끝나면 다시 쉬는 워커로 돌아옴)
+                threading.Thread(target=self._recycle, args=(worker,), daemon=True).start()
+                worker = None
+            return result
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+
+    def _recycle(self, worker: BrowserWorker):
+        try:
+            worker.stop()
+            worker.start()
+        finally:
+            self._idle.put(worker)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        total_time = stats.pop('total_time')
+        stats['avg_query_time'] = round(total_time / stats['queries'], 2) if stats['queries'] else 0.0
+        stats['workers'] = len(self._workers)
+        stats['alive'] = sum(worker.alive() for worker in self._workers)
+        return stats
+
+    def close(self):
+        for worker in self._workers:
+            worker.stop()
+
+
+_pool: Optional[BrowserWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_worker_pool() -> BrowserWorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserWorkerPool()
+        return _pool
+
+
+def cleanup_browser_worker_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
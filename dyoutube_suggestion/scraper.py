@@ -10,6 +10,8 @@ import time
 
 from DrissionPage import ChromiumOptions, ChromiumPage
 
+from browser_worker import BrowserWorkerError, get_browser_worker_pool
+
 
 class Scraper:
     USER_AGENT_FALLBACK = (
@@ -37,6 +39,11 @@ class Scraper:
         if self.load_mode == "none":
             self.logger.warning("[YOUTUBE] DRISSION_LOAD_MODE=none is not usable for YouTube DOM crawling; using eager")
             self.load_mode = "eager"
+        # 상주 브라우저 워커(browser_worker.py) 사용, 0 이면 DRISSION_CRAWL_SUBPROCESS 설정에 따라 검색어마다 새 프로세스/브라우저
+        self.use_browser_worker = (
+            os.getenv("DRISSION_BROWSER_WORKER", "1") != "0"
+            and os.getenv("YOUTUBE_DRISSION_CHILD") != "1"
+        )
         self.use_subprocess = (
             os.getenv("DRISSION_CRAWL_SUBPROCESS", "1") != "0"
             and os.getenv("YOUTUBE_DRISSION_CHILD") != "1"
@@ -47,11 +54,26 @@ class Scraper:
         if not query:
             return self._build_suggestion_response(query, [])
 
+        if self.use_browser_worker:
+            return self._get_suggestions_via_worker(query)
+
         if self.use_subprocess:
             return self._get_suggestions_via_subprocess(query)
 
         return self._get_suggestions_direct(query)
 
+    def _get_suggestions_via_worker(self, query: str):
+        try:
+            return get_browser_worker_pool().get_suggestions(query, self.crawl_timeout_seconds)
+        except BrowserWorkerError as e:
+            self.logger.warning(f"[YOUTUBE] {e}")
+            return self._build_suggestion_response(
+                query,
+                [],
+                error="youtube_unreachable",
+                detail=str(e),
+            )
+
     def _get_suggestions_via_subprocess(self, query: str):
         env = os.environ.copy()
         env["YOUTUBE_DRISSION_CHILD"] = "1"
@@ -1,261 +1,654 @@
 """
 Selenium 드라이버 풀 관리
 매 요청마다 드라이버를 생성/삭제하지 않고 재사용하여 성능 향상
+
+고정 개수(SELENIUM_POOL_SIZE)의 드라이버를 모든 워커 스레드가 공유한다.
+요청은 유휴 드라이버를 대여(checkout)하고 작업 후 반납(checkin)하며,
+유휴 드라이버가 없으면 timeout까지 대기한다.
+
+앱 시작 시 드라이버를 미리 띄워두고(prewarm), 재시작이 필요한 드라이버는
+백그라운드에서 교체 드라이버를 먼저 만든 뒤 교체하므로 사용자 요청이 Chrome 구동 비용을 치르지 않는다.
+
+드라이버 교체 기준은 요청 후 측정한 Chrome 프로세스 트리의 RSS/핸들 수이며, 사용 횟수는 안전장치로만 사용한다.
+호스트 메모리가 부족하면 동시에 대여 가능한 드라이버 수를 줄인다.
 """
+import asyncio
+import os
+import queue
 import threading
 import time
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from contextlib import contextmanager
+import psutil
 from selenium_driver import SeleniumDriver
 
+# 동시에 구동할 최대 브라우저 수 (ThreadPoolExecutor 워커 수와 별개로 조정)
+POOL_SIZE = int(os.environ.get('SELENIUM_POOL_SIZE', '1'))
+# 유휴 드라이버를 기다리는 최대 시간 (초)
+CHECKOUT_TIMEOUT = float(os.environ.get('SELENIUM_POOL_CHECKOUT_TIMEOUT', '300'))
+# 앱 시작 시 미리 띄워둘 드라이버 수 (기본값: 풀 크기 전체)
+PREWARM_COUNT = int(os.environ.get('SELENIUM_POOL_PREWARM', str(POOL_SIZE)))
+# chromedriver + Chrome 프로세스 트리의 RSS 합이 이 값을 넘으면 교체 (MB)
+DRIVER_MAX_RSS_MB = float(os.environ.get('SELENIUM_DRIVER_MAX_RSS_MB', '1500'))
+# 프로세스 트리의 열린 파일/핸들 수가 이 값을 넘으면 교체
+DRIVER_MAX_HANDLES = int(os.environ.get('SELENIUM_DRIVER_MAX_HANDLES', '4000'))
+# 메모리 기준 교체가 동작하지 않는 경우를 대비한 최대 사용 횟수
+DRIVER_MAX_USES = int(os.environ.get('SELENIUM_DRIVER_MAX_USES', '500'))
+# 호스트 메모리 사용률이 이 값 이상이면 동시 대여 수를 절반으로 줄임 (%)
+HOST_MEMORY_HIGH_PERCENT = float(os.environ.get('SELENIUM_HOST_MEMORY_HIGH_PERCENT', '85'))
+# 호스트 메모리 사용률이 이 값 이상이면 드라이버를 하나씩만 대여 (%)
+HOST_MEMORY_CRITICAL_PERCENT = float(os.environ.get('SELENIUM_HOST_MEMORY_CRITICAL_PERCENT', '92'))
+# 호스트 메모리 사용률 측정 주기 (초)
+HOST_MEMORY_SAMPLE_INTERVAL = 1.0
+
+
+class PoolTimeoutError(Exception):
+    """checkout timeout 안에 유휴 드라이버를 얻지 못한 경우"""
+    pass
+
+
+def measure_driver_usage(driver: SeleniumDriver) -> Optional[dict]:
+    """chromedriver와 하위 Chrome 프로세스 트리의 RSS 합(MB), 열린 핸들 수 측정
+
+    프로세스 간 공유 메모리도 각각 합산되므로 실제 사용량보다 크게 측정된다 (교체 기준으로는 충분).
+    측정할 수 없으면 None 반환
+    """
+    try:
+        root = psutil.Process(driver.driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+
+    rss = 0
+    handles = 0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+            handles += process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+        except psutil.Error:
+            continue
+    return {
+        'rss_mb': round(rss / 1024 / 1024, 1),
+        'handles': handles,
+        'processes': len(processes)
+    }
+
+
+class PooledDriver:
+    """풀에 속한 드라이버 슬롯 (드라이버 + 사용 횟수 + 교체 대기 드라이버)"""
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.driver: Optional[SeleniumDriver] = None
+        self.use_count = 0
+        # 백그라운드에서 미리 만들어진 교체용 드라이버 (다음 대여 시 교체)
+        self.replacement: Optional[SeleniumDriver] = None
+        self.replacing = False
+        # 마지막 측정값과 교체 사유 ('rss', 'handles', 'uses', 'error')
+        self.usage: Optional[dict] = None
+        self.recycle_reason: Optional[str] = None
+
+    def needs_restart(self, max_uses: int) -> bool:
+        return self.recycle_reason is not None or self.use_count >= max_uses
+
+    def reset(self, driver: Optional[SeleniumDriver]):
+        self.driver = driver
+        self.use_count = 0
+        self.usage = None
+        self.recycle_reason = None
+
+    @property
+    def name(self) -> str:
+        return f"driver-{self.slot_id}"
+
 
 class SeleniumDriverPool:
-    """스레드별 Selenium 드라이버 풀 관리자
-    
-    각 워커 스레드마다 하나의 드라이버를 유지하고 재사용합니다.
+    """공유 Selenium 드라이버 풀 관리자
+
+    최대 pool_size 개의 드라이버를 만들어 두고 요청마다 대여/반납합니다.
     일정 횟수 사용 후 드라이버를 자동으로 재시작하여 메모리 누수를 방지합니다.
     """
-    
-    # 드라이버를 재시작하기 전 최대 사용 횟수
-    MAX_USES_BEFORE_RESTART = 100
+
+    # 드라이버를 재시작하기 전 최대 사용 횟수 (메모리 기준 교체의 안전장치)
+    MAX_USES_BEFORE_RESTART = DRIVER_MAX_USES
     # 드라이버 생성 실패 시 최대 재시도 횟수
     MAX_CREATION_RETRIES = 3
-    
-    def __init__(self):
+
+    def __init__(self, pool_size: int = POOL_SIZE):
         """드라이버 풀 초기화"""
         self.logger = logging.getLogger('uvicorn')
-        
-        # 스레드별 드라이버 저장소
-        self._local = threading.local()
-        
-        # 전역 락 (드라이버 생성 시 동기화)
-        self._lock = threading.Lock()
-        
+        self.pool_size = max(pool_size, 1)
+
+        # 유휴 드라이버 슬롯 (드라이버 생성은 첫 대여 시점에 지연 수행)
+        self._idle: 'queue.Queue[PooledDriver]' = queue.Queue()
+        self._slots: List[PooledDriver] = []
+        for slot_id in range(self.pool_size):
+            slot = PooledDriver(slot_id)
+            self._slots.append(slot)
+            self._idle.put(slot)
+
         # 통계
         self._stats = {
             'total_requests': 0,
             'driver_restarts': 0,
-            'driver_errors': 0
+            'driver_errors': 0,
+            'checkout_timeouts': 0,
+            'prewarmed': 0,
+            'background_replacements': 0,
+            'inline_creations': 0,
+            'recycled_rss': 0,
+            'recycled_handles': 0,
+            'recycled_uses': 0,
+            'recycled_error': 0,
+            'shed_waits': 0,
+            'tab_teardowns': 0,
+            'tab_teardown_time': 0.0,
+            'waiting': 0,
+            'max_waiting': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0
         }
         self._stats_lock = threading.Lock()
-        
-        self.logger.info("[POOL] Selenium driver pool initialized")
-    
-    def _get_thread_id(self) -> str:
-        """현재 스레드 ID 반환"""
-        return f"thread-{threading.get_ident()}"
-    
-    def _initialize_driver(self, force_restart: bool = False) -> SeleniumDriver:
-        """현재 스레드용 드라이버 초기화 또는 재시작
-        
+
+        # 전역 락 (드라이버 생성 시 동기화)
+        self._lock = threading.Lock()
+
+        # 드라이버 미리 띄우기/교체 전용 스레드 (한 번에 하나씩 생성하여 CPU 폭주 방지)
+        self._builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver_builder")
+        self._closed = False
+
+        # 호스트 메모리 상태에 따른 동시 대여 수 제한
+        self._gate = threading.Condition()
+        self._in_use = 0
+        self._host_memory_percent = 0.0
+        self._host_memory_sampled_at = 0.0
+
+        self.logger.info(f"[POOL] Selenium driver pool initialized (size: {self.pool_size})")
+
+    def _create_driver(self, name: str) -> SeleniumDriver:
+        """새 드라이버 생성 (재시도 로직 포함)
+
         Args:
-            force_restart: True일 경우 기존 드라이버를 종료하고 새로 생성
-            
+            name: 로그에 표시할 슬롯 이름
+
         Returns:
-            초기화된 SeleniumDriver 인스턴스
-            
+            헬스체크를 통과한 SeleniumDriver 인스턴스
+
         Raises:
             Exception: 드라이버 생성 실패 시
         """
-        thread_id = self._get_thread_id()
-        
-        # 기존 드라이버 정리
-        if force_restart and hasattr(self._local, 'driver'):
-            self.logger.info(f"[POOL] {thread_id}: Forcing driver restart")
-            try:
-                if self._local.driver:
-                    self._local.driver.remove_driver()
-            except Exception as e:
-                self.logger.warning(f"[POOL] {thread_id}: Error removing old driver: {e}")
-            finally:
-                delattr(self._local, 'driver')
-                delattr(self._local, 'use_count')
-        
-        # 새 드라이버 생성 (재시도 로직 포함)
         last_error = None
         for attempt in range(self.MAX_CREATION_RETRIES):
             try:
-                self.logger.info(f"[POOL] {thread_id}: Creating new driver (attempt {attempt+1}/{self.MAX_CREATION_RETRIES})")
-                
+                self.logger.info(f"[POOL] {name}: Creating new driver (attempt {attempt+1}/{self.MAX_CREATION_RETRIES})")
+
                 # 드라이버 생성 시 외부 페이지를 열면 Docker/headless 환경에서 renderer timeout이 발생할 수 있다.
                 # about:blank로 가볍게 초기화하고, 요청 URL은 get_driver()에서 별도로 로드한다.
                 with self._lock:
                     driver = SeleniumDriver(start_url='about:blank')
                     driver.set_up()
-                
+
                 if not driver.health_check():
                     raise Exception("Driver health check failed after creation")
-                
-                self._local.driver = driver
-                self._local.use_count = 0
-                
+
                 with self._stats_lock:
                     self._stats['driver_restarts'] += 1
-                
-                self.logger.info(f"[POOL] {thread_id}: Driver created successfully")
+
+                self.logger.info(f"[POOL] {name}: Driver created successfully")
                 return driver
-                
+
             except Exception as e:
                 last_error = e
-                self.logger.warning(f"[POOL] {thread_id}: Failed to create driver (attempt {attempt+1}): {e}")
-                
+                self.logger.warning(f"[POOL] {name}: Failed to create driver (attempt {attempt+1}): {e}")
+
                 if attempt < self.MAX_CREATION_RETRIES - 1:
                     time.sleep(2 ** attempt)  # 지수 백오프
-        
+
         # 모든 재시도 실패
         with self._stats_lock:
             self._stats['driver_errors'] += 1
-        
+
         error_msg = f"Failed to create driver after {self.MAX_CREATION_RETRIES} attempts"
         if last_error:
             error_msg += f": {str(last_error)}"
-        
-        self.logger.warning(f"[POOL] {thread_id}: {error_msg}")
+
+        self.logger.warning(f"[POOL] {name}: {error_msg}")
         raise Exception(error_msg)
-    
-    def _get_or_create_driver(self) -> SeleniumDriver:
-        """현재 스레드의 드라이버 반환 (없으면 생성)
-        
+
+    def _retire_driver(self, name: str, driver: Optional[SeleniumDriver]):
+        """사용이 끝난 드라이버 종료"""
+        if driver is None:
+            return
+        try:
+            driver.remove_driver()
+        except Exception as e:
+            self.logger.warning(f"[POOL] {name}: Error removing old driver: {e}")
+
+    def _initialize_driver(self, slot: PooledDriver, force_restart: bool = False) -> SeleniumDriver:
+        """요청 처리 중인 스레드에서 슬롯의 드라이버를 바로 생성 또는 재시작
+
+        교체 드라이버가 준비되지 않은 경우에만 사용되는 경로입니다.
+
+        Args:
+            slot: 드라이버를 생성할 슬롯
+            force_restart: True일 경우 기존 드라이버를 종료하고 새로 생성
+
+        Returns:
+            초기화된 SeleniumDriver 인스턴스
+
+        Raises:
+            Exception: 드라이버 생성 실패 시
+        """
+        # 기존 드라이버 정리
+        if force_restart and slot.driver is not None:
+            self.logger.info(f"[POOL] {slot.name}: Forcing driver restart")
+            self._retire_driver(slot.name, slot.driver)
+            slot.reset(None)
+
+        driver = self._create_driver(slot.name)
+        slot.reset(driver)
+        with self._stats_lock:
+            self._stats['inline_creations'] += 1
+        return driver
+
+    def _swap_in_replacement(self, slot: PooledDriver):
+        """미리 만들어진 교체 드라이버로 바꾸고 이전 드라이버는 백그라운드에서 종료"""
+        old_driver = slot.driver
+        slot.reset(slot.replacement)
+        slot.replacement = None
+        self.logger.info(f"[POOL] {slot.name}: Swapped in pre-built replacement driver")
+        if old_driver is not None and not self._submit(self._retire_driver, slot.name, old_driver):
+            self._retire_driver(slot.name, old_driver)
+
+    def _submit(self, func, *args) -> bool:
+        """드라이버 생성/종료 작업을 백그라운드 스레드에 등록"""
+        if self._closed:
+            return False
+        try:
+            self._builder.submit(func, *args)
+            return True
+        except RuntimeError:
+            # 종료 중인 풀
+            return False
+
+    def _schedule_replacement(self, slot: PooledDriver, hold_slot: bool = False):
+        """교체 드라이버를 백그라운드에서 생성
+
+        Args:
+            slot: 교체할 슬롯
+            hold_slot: True면 교체가 끝날 때까지 슬롯을 대여 대상에서 제외 (기존 드라이버를 쓸 수 없는 경우)
+        """
+        if slot.replacing or slot.replacement is not None:
+            if hold_slot:
+                self._idle.put(slot)
+            return
+        slot.replacing = True
+        if not self._submit(self._build_replacement, slot, hold_slot):
+            slot.replacing = False
+            if hold_slot:
+                self._idle.put(slot)
+
+    def _build_replacement(self, slot: PooledDriver, hold_slot: bool):
+        try:
+            slot.replacement = self._create_driver(slot.name)
+            with self._stats_lock:
+                self._stats['background_replacements'] += 1
+        except Exception as e:
+            # 교체 실패 시 다음 대여 때 요청 스레드에서 재시작 (기존 동작으로 폴백)
+            self.logger.warning(f"[POOL] {slot.name}: Background replacement failed: {e}")
+        finally:
+            slot.replacing = False
+            if hold_slot:
+                if slot.replacement is not None:
+                    self._swap_in_replacement(slot)
+                self._idle.put(slot)
+
+    def prewarm(self, count: int = PREWARM_COUNT):
+        """드라이버를 백그라운드에서 미리 생성 (앱 시작 시 호출)
+
+        생성 중인 슬롯은 대여 대상에서 제외되므로 요청은 Chrome을 직접 띄우지 않고 준비된 드라이버를 기다립니다.
+        """
+        count = min(max(count, 0), self.pool_size)
+        for _ in range(count):
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if slot.driver is not None:
+                self._idle.put(slot)
+                continue
+            if not self._submit(self._prewarm_slot, slot):
+                self._idle.put(slot)
+        self.logger.info(f"[POOL] Prewarming {count} driver(s) in background")
+
+    def _prewarm_slot(self, slot: PooledDriver):
+        try:
+            slot.reset(self._create_driver(slot.name))
+            with self._stats_lock:
+                self._stats['prewarmed'] += 1
+        except Exception as e:
+            self.logger.warning(f"[POOL] {slot.name}: Prewarm failed, driver will be created on first use: {e}")
+        finally:
+            self._idle.put(slot)
+
+    def _ensure_driver(self, slot: PooledDriver) -> SeleniumDriver:
+        """대여한 슬롯의 드라이버 반환 (없으면 생성)
+
         ⚠️ 중요: 이 함수는 새 요청이 시작되기 **전**에 호출됩니다.
         따라서 재시작이 필요한 경우에도 진행 중인 요청에는 영향을 주지 않습니다.
-        
+
         실행 순서:
-        1. 100번째 요청: use_count=99 → 기존 드라이버 사용 → 정상 완료 → use_count=100
-        2. 101번째 요청: use_count=100 → 재시작 체크 → 새 드라이버 생성 → use_count=0
-        
+        1. 요청 완료 후 반납 시 RSS/핸들/사용 횟수를 측정해 교체 필요 여부 기록, 백그라운드 교체 시작
+        2. 다음 대여 시 교체 드라이버가 준비되어 있으면 교체, 아니면 교체 중인 동안 기존 드라이버 사용
+
         Returns:
             SeleniumDriver 인스턴스
         """
-        thread_id = self._get_thread_id()
-        
+        # 백그라운드에서 준비된 교체 드라이버가 있으면 사용
+        if slot.replacement is not None:
+            self._swap_in_replacement(slot)
+            return slot.driver
+
         # 드라이버가 이미 존재하는지 확인
-        if not hasattr(self._local, 'driver') or self._local.driver is None:
-            self.logger.info(f"[POOL] {thread_id}: No driver found, creating new one")
-            return self._initialize_driver(force_restart=False)
-        
-        # 사용 횟수 확인 (주기적 재시작)
-        # ✅ 안전: 이전 요청은 이미 완료되었으며, 새 요청 시작 전에 재시작함
-        if self._local.use_count >= self.MAX_USES_BEFORE_RESTART:
+        if slot.driver is None:
+            self.logger.info(f"[POOL] {slot.name}: No driver found, creating new one")
+            return self._initialize_driver(slot, force_restart=False)
+
+        # 교체 필요 여부 확인 (메모리/핸들 초과, 사용 횟수 초과, 오류)
+        # 교체 드라이버를 만드는 중이면 완료될 때까지 기존 드라이버를 계속 사용
+        if slot.needs_restart(self.MAX_USES_BEFORE_RESTART) and not slot.replacing:
             self.logger.info(
-                f"[POOL] {thread_id}: Driver used {self._local.use_count} times, "
+                f"[POOL] {slot.name}: Driver needs recycling (reason: {slot.recycle_reason}, "
+                f"use_count: {slot.use_count}) and no replacement is ready, "
                 f"restarting before next request (previous request completed safely)"
             )
-            return self._initialize_driver(force_restart=True)
-        
+            return self._initialize_driver(slot, force_restart=True)
+
         # 헬스체크
-        if not self._local.driver.health_check():
-            self.logger.warning(f"[POOL] {thread_id}: Driver health check failed, restarting")
-            return self._initialize_driver(force_restart=True)
-        
+        if not slot.driver.health_check():
+            self.logger.warning(f"[POOL] {slot.name}: Driver health check failed, restarting")
+            return self._initialize_driver(slot, force_restart=True)
+
         # 기존 드라이버 반환
-        return self._local.driver
-    
+        return slot.driver
+
+    def checkout(self, timeout: Optional[float] = CHECKOUT_TIMEOUT) -> PooledDriver:
+        """유휴 드라이버 슬롯을 대여 (없으면 timeout까지 대기)
+
+        반환된 슬롯은 사용 후 반드시 checkin()으로 반납해야 합니다.
+
+        Raises:
+            PoolTimeoutError: timeout 안에 유휴 드라이버를 얻지 못한 경우
+            Exception: 드라이버 생성 실패 시 (슬롯은 자동 반납됨)
+        """
+        with self._stats_lock:
+            self._stats['waiting'] += 1
+            self._stats['max_waiting'] = max(self._stats['max_waiting'], self._stats['waiting'])
+
+        start_time = time.monotonic()
+        deadline = None if timeout is None else start_time + timeout
+        try:
+            self._acquire_concurrency(deadline)
+            try:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                slot = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                self._release_concurrency()
+                raise
+        except queue.Empty:
+            with self._stats_lock:
+                self._stats['checkout_timeouts'] += 1
+            raise PoolTimeoutError(f"No idle driver available within {timeout}s (pool size: {self.pool_size})")
+        finally:
+            wait_time = time.monotonic() - start_time
+            with self._stats_lock:
+                self._stats['waiting'] -= 1
+                self._stats['total_wait_time'] += wait_time
+                self._stats['max_wait_time'] = max(self._stats['max_wait_time'], wait_time)
+
+        try:
+            self._ensure_driver(slot)
+        except Exception:
+            self._idle.put(slot)
+            self._release_concurrency()
+            raise
+        return slot
+
+    def _host_memory_percent_now(self) -> float:
+        """호스트 메모리 사용률 (HOST_MEMORY_SAMPLE_INTERVAL 동안 캐시)"""
+        now = time.monotonic()
+        if now - self._host_memory_sampled_at >= HOST_MEMORY_SAMPLE_INTERVAL:
+            self._host_memory_percent = psutil.virtual_memory().percent
+            self._host_memory_sampled_at = now
+        return self._host_memory_percent
+
+    def concurrency_limit(self) -> int:
+        """호스트 메모리 상태에 따라 동시에 대여 가능한 드라이버 수"""
+        memory_percent = self._host_memory_percent_now()
+        if memory_percent >= HOST_MEMORY_CRITICAL_PERCENT:
+            return 1
+        if memory_percent >= HOST_MEMORY_HIGH_PERCENT:
+            return max(self.pool_size // 2, 1)
+        return self.pool_size
+
+    def _acquire_concurrency(self, deadline: Optional[float]):
+        """동시 대여 수 제한 안에서 대여 권한 획득
+
+        Raises:
+            queue.Empty: deadline까지 권한을 얻지 못한 경우
+        """
+        with self._gate:
+            shed = False
+            while self._in_use >= self.concurrency_limit():
+                if not shed and self._in_use < self.pool_size:
+                    # 드라이버는 남아있지만 메모리 부족으로 대기
+                    shed = True
+                    with self._stats_lock:
+                        self._stats['shed_waits'] += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                # 메모리 상태가 바뀌었는지 주기적으로 다시 확인
+                self._gate.wait(timeout=HOST_MEMORY_SAMPLE_INTERVAL if remaining is None
+                                else min(remaining, HOST_MEMORY_SAMPLE_INTERVAL))
+            self._in_use += 1
+
+    def _release_concurrency(self):
+        with self._gate:
+            self._in_use -= 1
+            self._gate.notify()
+
+    async def checkout_async(self, timeout: Optional[float] = CHECKOUT_TIMEOUT) -> PooledDriver:
+        """이벤트 루프를 막지 않고 드라이버 슬롯을 대여"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.checkout, timeout)
+
+    def checkin(self, slot: PooledDriver, discard: bool = False):
+        """대여한 드라이버 슬롯을 반납
+
+        재시작이 필요한 드라이버는 백그라운드에서 교체 드라이버를 먼저 만든 뒤 교체합니다.
+
+        Args:
+            slot: checkout()으로 받은 슬롯
+            discard: True일 경우 기존 드라이버를 더 이상 사용하지 않고 교체
+        """
+        try:
+            if discard:
+                self._mark_recycle(slot, 'error')
+                # 오류가 난 드라이버는 교체가 끝날 때까지 대여하지 않음
+                self._schedule_replacement(slot, hold_slot=True)
+                return
+            self._check_usage(slot)
+            if slot.needs_restart(self.MAX_USES_BEFORE_RESTART):
+                # 정상 드라이버는 교체 드라이버가 준비될 때까지 계속 사용
+                self._schedule_replacement(slot)
+            self._idle.put(slot)
+        finally:
+            self._release_concurrency()
+
+    def _check_usage(self, slot: PooledDriver):
+        """요청 처리 후 드라이버 프로세스 트리의 자원 사용량을 측정하여 교체 필요 여부 기록"""
+        if slot.driver is None or slot.recycle_reason is not None:
+            return
+        usage = measure_driver_usage(slot.driver)
+        if usage is not None:
+            slot.usage = usage
+            if usage['rss_mb'] >= DRIVER_MAX_RSS_MB:
+                self._mark_recycle(slot, 'rss')
+                return
+            if usage['handles'] >= DRIVER_MAX_HANDLES:
+                self._mark_recycle(slot, 'handles')
+                return
+        if slot.use_count >= self.MAX_USES_BEFORE_RESTART:
+            self._mark_recycle(slot, 'uses')
+
+    def _mark_recycle(self, slot: PooledDriver, reason: str):
+        if slot.recycle_reason is not None:
+            return
+        slot.recycle_reason = reason
+        with self._stats_lock:
+            self._stats[f'recycled_{reason}'] += 1
+        self.logger.info(
+            f"[POOL] {slot.name}: Recycling driver (reason: {reason}, use_count: {slot.use_count}, "
+            f"usage: {slot.usage})"
+        )
+
     @contextmanager
     def get_driver(self, url: str):
         """드라이버를 컨텍스트 매니저로 제공
-        
+
         ⚠️ 안전성 보장:
-        - 드라이버 재시작은 이 함수 시작 시점에 체크됩니다
+        - 드라이버 재시작은 대여 시점에 체크됩니다
         - 따라서 요청 처리 중에는 절대 재시작되지 않습니다
-        - 100번째 요청이 완료된 후, 101번째 요청 시작 전에 재시작됩니다
-        
+        - 교체가 필요한 드라이버는 요청이 완료된 후에 교체됩니다
+
         사용 예:
             with pool.get_driver(url) as driver:
                 driver.scroll_down(5)
                 html = driver.get_page_source()
-        
+
         Args:
             url: 로드할 URL
-            
+
         Yields:
             SeleniumDriver 인스턴스
         """
-        thread_id = self._get_thread_id()
-        driver = None
-        
+        # 드라이버 대여 (재시작이 필요하면 여기서 처리됨)
+        # ✅ 이전 요청은 이미 완료된 상태
+        slot = self.checkout()
+        driver = slot.driver
+        failed = False
+
         try:
-            # 드라이버 가져오기 (재시작이 필요하면 여기서 처리됨)
-            # ✅ 이전 요청은 이미 완료된 상태
-            driver = self._get_or_create_driver()
-            
             # 통계 업데이트
             with self._stats_lock:
                 self._stats['total_requests'] += 1
-            
+
             # 사용 횟수 증가 (이 요청 완료 후에 카운트됨)
-            self._local.use_count += 1
-            
+            slot.use_count += 1
+
             # 다음 재시작까지 남은 요청 수 계산
-            remaining = self.MAX_USES_BEFORE_RESTART - self._local.use_count
-            
+            remaining = self.MAX_USES_BEFORE_RESTART - slot.use_count
+
             self.logger.info(
-                f"[POOL] {thread_id}: Using driver "
-                f"(use_count: {self._local.use_count}/{self.MAX_USES_BEFORE_RESTART}, "
+                f"[POOL] {slot.name}: Using driver "
+                f"(use_count: {slot.use_count}/{self.MAX_USES_BEFORE_RESTART}, "
                 f"restart in {remaining} requests)"
             )
-            
+
             # URL 로드
-            self.logger.info(f"[POOL] {thread_id}: Loading URL: {url}")
+            self.logger.info(f"[POOL] {slot.name}: Loading URL: {url}")
             driver.load_url(url)
-            
+
             # 드라이버를 사용자에게 제공
             yield driver
-            
+
         except Exception as e:
-            self.logger.warning(f"[POOL] {thread_id}: Error using driver: {e}")
-            
-            # 에러 발생 시 드라이버를 재시작하도록 마킹
-            if hasattr(self._local, 'use_count'):
-                self._local.use_count = self.MAX_USES_BEFORE_RESTART
-            
+            self.logger.warning(f"[POOL] {slot.name}: Error using driver: {e}")
+
+            # 에러 발생 시 드라이버를 교체하도록 마킹
+            failed = True
+
             raise
-            
+
         finally:
             # 리소스 정리 (about:blank 로 이동하여 무거운 YouTube 문서 상태를 비움)
+            teardown_start = time.monotonic()
             try:
                 if driver and driver.driver:
-                    self.logger.debug(f"[POOL] {thread_id}: Navigating to about:blank for cleanup")
+                    self.logger.debug(f"[POOL] {slot.name}: Navigating to about:blank for cleanup")
                     driver.reset_to_blank()
-                        
+
             except Exception as e:
-                self.logger.warning(f"[POOL] {thread_id}: Error cleaning up page: {e}")
-                # 정리 실패 시 다음 요청에서 드라이버 재시작
-                if hasattr(self._local, 'use_count'):
-                    self._local.use_count = self.MAX_USES_BEFORE_RESTART
-    
+                self.logger.warning(f"[POOL] {slot.name}: Error cleaning up page: {e}")
+                # 정리 실패 시 드라이버 교체
+                failed = True
+            finally:
+                self._record_tab_timing('teardown', time.monotonic() - teardown_start)
+                self.checkin(slot, discard=failed)
+
+    def _record_tab_timing(self, phase: str, elapsed: float):
+        with self._stats_lock:
+            self._stats[f'tab_{phase}s'] += 1
+            self._stats[f'tab_{phase}_time'] += elapsed
+
     def get_stats(self) -> dict:
         """풀 통계 반환"""
         with self._stats_lock:
-            return self._stats.copy()
-    
+            stats = self._stats.copy()
+        total_wait_time = stats.pop('total_wait_time')
+        tab_teardown_time = stats.pop('tab_teardown_time')
+        checkouts = stats['total_requests'] + stats['checkout_timeouts']
+        idle = self._idle.qsize()
+        stats['pool_size'] = self.pool_size
+        stats['drivers_alive'] = sum(1 for slot in self._slots if slot.driver is not None)
+        stats['replacements_ready'] = sum(1 for slot in self._slots if slot.replacement is not None)
+        stats['idle'] = idle
+        stats['in_use'] = self.pool_size - idle
+        stats['avg_wait_time'] = round(total_wait_time / checkouts, 3) if checkouts > 0 else 0.0
+        stats['avg_tab_teardown_ms'] = round(tab_teardown_time / stats['tab_teardowns'] * 1000, 1) if stats['tab_teardowns'] > 0 else 0.0
+        stats['concurrency_limit'] = self.concurrency_limit()
+        stats['host_memory_percent'] = self._host_memory_percent
+        stats['drivers'] = {
+            slot.name: {'use_count': slot.use_count, 'usage': slot.usage}
+            for slot in self._slots if slot.driver is not None
+        }
+        stats['max_wait_time'] = round(stats['max_wait_time'], 3)
+        return stats
+
     def cleanup_all(self):
         """모든 드라이버 정리 (애플리케이션 종료 시)"""
-        thread_id = self._get_thread_id()
-        self.logger.info(f"[POOL] {thread_id}: Cleaning up all drivers")
-        
-        if hasattr(self._local, 'driver') and self._local.driver:
-            try:
-                self._local.driver.remove_driver()
-            except Exception as e:
-                self.logger.warning(f"[POOL] {thread_id}: Error during cleanup: {e}")
-            finally:
-                delattr(self._local, 'driver')
-                if hasattr(self._local, 'use_count'):
-                    delattr(self._local, 'use_count')
-        
-        self.logger.info(f"[POOL] {thread_id}: Cleanup completed")
+        self.logger.info("[POOL] Cleaning up all drivers")
+        self._closed = True
+        self._builder.shutdown(wait=False)
+
+        for slot in self._slots:
+            for driver in (slot.driver, slot.replacement):
+                if driver is None:
+                    continue
+                try:
+                    driver.remove_driver()
+                except Exception as e:
+                    self.logger.warning(f"[POOL] {slot.name}: Error during cleanup: {e}")
+            slot.reset(None)
+            slot.replacement = None
+
+        self.logger.info("[POOL] Cleanup completed")
 
 
 # 전역 드라이버 풀 인스턴스 (앱 시작 시 한 번만 생성)
 _driver_pool: Optional[SeleniumDriverPool] = None
+_driver_pool_lock = threading.Lock()
 
 
 def get_driver_pool() -> SeleniumDriverPool:
     """전역 드라이버 풀 인스턴스 반환"""
     global _driver_pool
-    if _driver_pool is None:
-        _driver_pool = SeleniumDriverPool()
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = SeleniumDriverPool()
     return _driver_pool
 
 
@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from scraper import Scraper
+from result_cache import ResultCache
 import re
 from urllib.parse import unquote
 import time
@@ -14,6 +15,8 @@ import logging
 app = FastAPI()
 
 executor = ThreadPoolExecutor(max_workers=4)
+# 자동완성 결과 캐시 (fresh 6시간, stale 24시간), 작은 limit은 큰 limit 결과를 잘라서 사용
+result_cache = ResultCache({'google': (6 * 3600, 24 * 3600)})
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
 def google_task(keywords: str, limit: int = 10):
@@ -66,12 +69,25 @@ async def search_google(keywords: str, limit: int = 10):
     
     try:
         loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(executor, google_task, keywords, limit)
+        result = await result_cache.get_or_load(
+            'google',
+            keywords,
+            lambda: loop.run_in_executor(executor, google_task, keywords, limit),
+            limit=limit
+        )
     except Exception as e:
         logger.error(f"Error: {e} keyword : {keywords} at traceback: {traceback.print_exc()}")
         traceback.print_exc()
     finally:
         return result
     
+@app.on_event("shutdown")
+async def shutdown_event():
+    result_cache.close()
+
+@app.get("/stats")
+async def get_stats():
+    return {"result_cache_stats": result_cache.get_stats()}
+
 if __name__ == '__main__':
     print(search_google(keywords='제일기획'))
@@ -0,0 +1,184 @@
+"""
+INNERTUBE_API_KEY / INNERTUBE_CONTEXT 부트스트랩 캐시
+키워드마다 수백 KB 의 검색 결과 HTML 을 받아 api key 와 context 만 잘라내지 않고,
+한 번 받아온 값을 TTL 동안 프로세스 전체에서 재사용한다.
+
+- 첫 페이지 검색은 HTML 대신 /youtubei/v1/search 에 query 로 바로 요청
+- 인증 실패(400/401/403) 응답을 받으면 캐시를 비우고 부트스트랩을 다시 받아 한 번 재시도
+"""
+import asyncio
+import copy
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+import requests
+
+from retry import retry_engine
+
+BOOTSTRAP_TTL = float(os.environ.get('INNERTUBE_BOOTSTRAP_TTL', '3600'))
+YOUTUBE_HOST = "www.youtube.com"
+BOOTSTRAP_URL = "https://www.youtube.com/"
+SEARCH_URL = "https://www.youtube.com/youtubei/v1/search"
+HTTP_TIMEOUT = 20
+# api key / context 가 만료되었을 때 InnerTube 가 반환하는 상태 코드
+AUTH_FAILURE_STATUSES = (400, 401, 403)
+
+HEADERS = {
+    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "accept-language": "ko-KR,ko;q=0.9",
+}
+
+_API_KEY_PATTERN = re.compile(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"')
+_CONTEXT_MARKER = re.compile(r'"INNERTUBE_CONTEXT"\s*:\s*')
+
+
+class BootstrapError(Exception):
+    """페이지에서 api key / context 를 찾지 못함"""
+
+
+class InnerTubeConfig:
+    """부트스트랩으로 얻은 api key 와 context"""
+
+    def __init__(self, api_key: str, context: dict):
+        self.api_key = api_key
+        self.context = context
+        self.fetched_at = time.monotonic()
+
+    def new_context(self) -> dict:
+        """요청별로 수정해도 되는 context 복사본"""
+        return copy.deepcopy(self.context)
+
+
+def parse_config(html: str) -> InnerTubeConfig:
+    """ytcfg 가 포함된 YouTube 페이지에서 api key 와 context 추출"""
+    api_key_match = _API_KEY_PATTERN.search(html)
+    context_match = _CONTEXT_MARKER.search(html)
+    if api_key_match is None or context_match is None:
+        raise BootstrapError("INNERTUBE_API_KEY / INNERTUBE_CONTEXT not found")
+    context, _ = json.JSONDecoder().raw_decode(html, context_match.end())
+    return InnerTubeConfig(api_key_match.group(1), context)
+
+
+def fetch_bootstrap_html() -> str:
+    res = retry_engine.call(
+        YOUTUBE_HOST,
+        lambda: requests.get(BOOTSTRAP_URL, headers=HEADERS, timeout=HTTP_TIMEOUT),
+        retry_on=(requests.RequestException,),
+    )
+    if res.status_code != 200:
+        raise BootstrapError(f"bootstrap page status {res.status_code}")
+    return res.content.decode("utf-8")
+
+
+class BootstrapCache:
+    """TTL 동안 InnerTubeConfig 를 공유하는 캐시 (스레드/이벤트 루프 모두에서 사용)"""
+
+    def __init__(self, ttl: float = BOOTSTRAP_TTL):
+        self.logger = logging.getLogger('uvicorn')
+        self.ttl = ttl
+        self._config: Optional[InnerTubeConfig] = None
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+        self._stats = {
+            'bootstraps': 0,
+            'hits': 0,
+            'invalidations': 0,
+        }
+
+    def _fresh(self) -> Optional[InnerTubeConfig]:
+        config = self._config
+        if config is not None and time.monotonic() - config.fetched_at < self.ttl:
+            return config
+        return None
+
+    def _store(self, html: str) -> InnerTubeConfig:
+        config = parse_config(html)
+        self._config = config
+        self._stats['bootstraps'] += 1
+        self.logger.info("[INNERTUBE] Bootstrapped api key / context")
+        return config
+
+    def get(self, fetch_html: Callable[[], str] = fetch_bootstrap_html) -> InnerTubeConfig:
+        config = self._fresh()
+        if config is not None:
+            self._stats['hits'] += 1
+            return config
+        # 동시에 만료를 확인한 스레드들이 부트스트랩 페이지를 중복으로 받지 않도록 잠금
+        with self._lock:
+            config = self._fresh()
+            if config is None:
+                config = self._store(fetch_html())
+        return config
+
+    async def get_async(self, fetch_html: Callable[[], Awaitable[str]]) -> InnerTubeConfig:
+        config = self._fresh()
+        if config is not None:
+            self._stats['hits'] += 1
+            return config
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            config = self._fresh()
+            if config is None:
+                config = self._store(await fetch_html())
+        return config
+
+    def invalidate(self, config: Optional[InnerTubeConfig] = None):
+        """캐시 무효화 (config 를 주면 그 값이 아직 현재 값일 때만, 이미 다른 요청이 갱신했으면 유지)"""
+        with self._lock:
+            if config is None or self._config is config:
+                self._config = None
+                self._stats['invalidations'] += 1
+
+    def invalidate_key(self, api_key: str):
+        """현재 캐시된 api key 가 api_key 이면 무효화 (후속 요청이 인증 실패했을 때)"""
+        config = self._config
+        if config is not None and config.api_key == api_key:
+            self.invalidate(config)
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        config = self._config
+        stats['age'] = round(time.monotonic() - config.fetched_at, 1) if config is not None else None
+        stats['ttl'] = self.ttl
+        return stats
+
+
+bootstrap_cache = BootstrapCache()
+
+
+def invalidate_on_auth_failure(api_key: str, status_code: int):
+    """continuation/player 등 후속 요청이 인증 실패(400/401/403)면 그 api key 를 캐시에서 비워
+    다음 검색이 새 api key / context 를 받게 함"""
+    if status_code in AUTH_FAILURE_STATUSES:
+        bootstrap_cache.invalidate_key(api_key)
+
+
+def search_first_page(keyword: str) -> Tuple[InnerTubeConfig, dict, dict]:
+    """캐시된 api key / context 로 첫 검색 페이지를 search API 에 바로 요청
+
+    Returns:
+        (config, 이번 검색에 사용한 context 복사본, search 응답 JSON)
+    """
+    for _ in range(2):
+        config = bootstrap_cache.get()
+        context = config.new_context()
+        res = retry_engine.call(YOUTUBE_HOST, lambda: requests.post(
+            f"{SEARCH_URL}?key={config.api_key}&prettyPrint=false",
+            headers={**HEADERS, "content-type": "application/json; charset=UTF-8"},
+            json={"context": context, "query": keyword},
+            timeout=HTTP_TIMEOUT,
+        ), retry_on=(requests.RequestException,))
+        if res.status_code in AUTH_FAILURE_STATUSES:
+            bootstrap_cache.invalidate(config)
+            continue
+        if res.status_code != 200:
+            raise Exception("status code error")
+        return config, context, json.loads(res.content)
+    raise Exception("api 실패")
+
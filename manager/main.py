@@ -1,23 +1,49 @@
 from fastapi import FastAPI, HTTPException, Response, Request
 import logging
-from urllib.parse import quote
 
 from datetime import datetime
 import time
 from concurrent.futures import ThreadPoolExecutor
-import shlex
 import asyncio
 import traceback
 import json
 
+import aiohttp
+
 from scraper import Scraper
+from transport import BackendTransport, TRANSPORT_MODE
+from registry import BackendRegistry
 
 app = FastAPI()
 executor = ThreadPoolExecutor(max_workers=4)
-current_server_index = 0
 max_retries = 3  # 재시도 가능한 최대 횟수 설정
 logger = logging.getLogger("uvicorn")
 
+# 백엔드별 keep-alive 커넥션 풀 (요청마다 ssh 프로세스를 띄우지 않음)
+transport = BackendTransport()
+# 스크래퍼 종류별 노드 목록 (backends.json)
+registry = BackendRegistry.from_file()
+
+@app.on_event("startup")
+async def startup_event():
+    registry.start_health_checks(transport)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await registry.stop_health_checks()
+    await transport.close()
+
+async def forward(service: str, path: str, params: dict) -> Response:
+    """서비스의 노드 하나로 요청을 전달하고 응답 본문을 그대로 반환"""
+    try:
+        backend_response = await registry.get(transport, service, path, params)
+    except (aiohttp.ClientError, ConnectionError, asyncio.TimeoutError) as e:
+        logger.error(f"Backend {service}{path} request failed: {e!r}")
+        return Response(content=str(e) or repr(e), status_code=500)
+
+    # 기존 curl 전달 방식과 동일하게 백엔드 응답 본문을 200으로 전달
+    return Response(content=backend_response.body, media_type='application/json', status_code=200)
+
 def shopping_related(keyword: str):
     result = {
         'keyword': keyword,
@@ -37,320 +63,73 @@ def shopping_related(keyword: str):
 
 @app.get("/youtube")
 async def youtube(keywords: str, limit: int, retry_count: int = 0):
-    global current_server_index
-
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SERVERS = [
-        {'host': '10.128.0.4', 'port': 1234}
-    ]
-
-    # 재시도가 아닐 때에만 서버 인덱스를 업데이트(라운드 로빈)
-    if retry_count == 0:
-        server = SERVERS[current_server_index]
-        current_server_index = (current_server_index + 1) % len(SERVERS)
-    else:
-        # 재시도 중이라면 이전에 선택된 서버로 재시도
-        server = SERVERS[(current_server_index - 1) % len(SERVERS)]
-    print(f"[Server index: {current_server_index}] 서버 정보: {server}")
-
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}&limit={limit}"
-    print(f"쿼리 파라미터: {query_params}")
+    params = {'keywords': keywords, 'limit': limit}
+    print(f"쿼리 파라미터: {params}")
 
-    # Build the full URL
-    url = f"http://localhost:{server['port']}/search/list?{query_params}"
+    # 노드 선택은 레지스트리가 담당 (재시도 시 덜 바쁜 다른 노드로 갈 수 있음)
+    response = await forward('youtube', '/search/list', params)
+    if response.status_code != 200:
+        return response
 
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', f"{SSH_USER}@{server['host']}", '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # stdout 이 비어 있는 경우 재시도 로직
-    content = stdout.decode('utf-8')
+    # 응답 본문이 비어 있는 경우 재시도 로직
+    content = response.body.decode('utf-8')
     if not content.strip():
         # 아직 재시도 횟수가 남아 있으면 다시 호출
         if retry_count < max_retries:
-            print(f"데이터가 비어있어 재시도합니다. (시도 횟수: {retry_count + 1}) (현재 서버: {server}")
+            print(f"데이터가 비어있어 재시도합니다. (시도 횟수: {retry_count + 1})")
             return await youtube(keywords, limit, retry_count=retry_count + 1)
         else:
             # 재시도를 모두 소진했는데도 데이터가 비어 있다면 에러 반환
             print("여러 번 재시도했지만 여전히 데이터가 비어 있습니다.")
             return Response(content="데이터 수신에 실패했습니다.", status_code=500)
 
-    # Return the response from server
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    return response
 
 @app.get("/google")
 async def google(keywords: str, limit: int = 10):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '35.224.25.10'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}&limit={limit}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/google?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keywords': keywords, 'limit': limit}
+    print(params)
+    return await forward('google', '/search/google', params)
 
 
 @app.get("/google_related")
 async def google_related(keywords: str, limit: int = 10):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '10.128.0.7'       # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234            # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}&limit={limit}"
-    print(f"google_related queries: {query_params}")
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/google?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-q', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', '-o', 'LogLevel=ERROR', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keywords': keywords, 'limit': limit}
+    print(f"google_related queries: {params}")
+    return await forward('google_related', '/search/google', params)
 
 
 
 @app.get("/naver_blog")
 async def naverb(keywords: str, limit: int = 10):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '34.68.35.25'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}&limit={limit}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/naver_blog?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keywords': keywords, 'limit': limit}
+    print(params)
+    return await forward('naver_blog', '/search/naver_blog', params)
     
 @app.get("/naver_cafe")
 async def naverb(keywords: str, limit: int = 10):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '34.68.35.25'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}&limit={limit}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/naver_cafe?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keywords': keywords, 'limit': limit}
+    print(params)
+    return await forward('naver_blog', '/search/naver_cafe', params)
     
 @app.get("/naver_related")
 async def naverr(keywords: str):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '10.128.0.3'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/naver_related?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keywords': keywords}
+    print(params)
+    return await forward('naver_keyword', '/search/naver_related', params)
     
 
 @app.get("/naver_popular")
 async def naverp(keywords: str):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '10.128.0.3'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/naver_popular?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keywords': keywords}
+    print(params)
+    return await forward('naver_keyword', '/search/naver_popular', params)
     
 @app.get("/naver_shopping") # naver_together(함께찾은 키워드임)
 async def navers(keywords: str):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '10.128.0.3'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keywords={quote(keywords)}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/naver_together?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keywords': keywords}
+    print(params)
+    return await forward('naver_keyword', '/search/naver_together', params)
 
 @app.get("/naver_shopping_related") # 네이버 쇼핑 연관 검색어
 async def naversr(keywords: str):
@@ -375,72 +154,23 @@ async def naversr(keywords: str):
 
 @app.get("/youtube_suggestion") # 유튜브 예상추천검색어
 async def youtube_suggestion(keywords: str):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '34.123.14.43'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keyword={quote(keywords)}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/suggestions?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-q', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', '-o', 'LogLevel=ERROR', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
-
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+    params = {'keyword': keywords}
+    print(params)
+    return await forward('youtube_suggestion', '/search/suggestions', params)
 
 @app.get("/coupang_related") # 쿠팡 연관검색어
 async def coupang_related(keywords: str):
-    SSH_USER = 'loopit0423'       # Replace with your SSH username
-    SSH_HOST = '34.57.184.127'  # Replace with your server A hostname or IP
-    REMOTE_PORT = 1234          # Port on which server A is running the API
-    # Build the query string
-    query_params = f"keyword={quote(keywords)}"
-    print(query_params)
-
-    # Build the full URL
-    url = f"http://localhost:{REMOTE_PORT}/search/coupang?{query_params}"
-
-    # Build the curl command as a list
-    curl_command = ['curl', '-s', '-q', '-X', 'GET', url]
-
-    # Build the command string
-    curl_cmd_str = shlex.join(curl_command)
-
-    # Build the SSH command
-    ssh_command = ['ssh', '-o', 'LogLevel=ERROR', f'{SSH_USER}@{SSH_HOST}', '--', curl_cmd_str]
-
-    # Execute the SSH command
-    process = await asyncio.create_subprocess_exec(
-        *ssh_command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await process.communicate()
-
-    # Handle errors
-    if process.returncode != 0:
-        return Response(content=stderr.decode('utf-8'), status_code=500)
+    params = {'keyword': keywords}
+    print(params)
+    return await forward('coupang', '/search/coupang', params)
+
+@app.get("/transport/stats") # 백엔드별 커넥션 재사용 통계
+async def transport_stats():
+    return {
+        "mode": TRANSPORT_MODE,
+        "backends": transport.get_stats(),
+    }
 
-    # Return the response from server A
-    return Response(content=stdout.decode('utf-8'), media_type='application/json', status_code=200)
+@app.get("/registry/stats") # 서비스별 노드 부하 및 제외 상태
+async def registry_stats():
+    return registry.get_stats()
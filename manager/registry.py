@@ -0,0 +1,254 @@
+"""
+스크래퍼 종류별 백엔드 노드 레지스트리 및 로드밸런서
+backends.json 설정으로 노드를 관리하므로, 용량 추가는 코드가 아닌 설정 수정으로 한다.
+
+노드 선택 전략 (서비스별 strategy)
+- least_outstanding: (진행 중 요청 수 + 1) / weight 가 가장 작은 노드
+- ewma: 지수이동평균 응답시간 * (진행 중 요청 수 + 1) / weight 가 가장 작은 노드
+
+연속 전송 실패 시 노드를 제외(ejection)하고, 헬스체크 성공 또는 쿨다운 경과 후 다시 투입한다.
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from transport import BackendResponse, BackendTransport
+
+CONFIG_PATH = os.environ.get(
+    'MANAGER_BACKENDS_CONFIG',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backends.json')
+)
+# 연속 실패 횟수가 이 값에 도달하면 노드를 제외
+EJECT_AFTER_FAILURES = int(os.environ.get('MANAGER_EJECT_AFTER_FAILURES', '3'))
+# 제외 후 재투입까지의 기본 대기 시간 (초, 반복 제외 시 2배씩 증가)
+EJECT_COOLDOWN = float(os.environ.get('MANAGER_EJECT_COOLDOWN', '30'))
+EJECT_COOLDOWN_MAX = float(os.environ.get('MANAGER_EJECT_COOLDOWN_MAX', '600'))
+HEALTH_CHECK_INTERVAL = float(os.environ.get('MANAGER_HEALTH_CHECK_INTERVAL', '15'))
+HEALTH_CHECK_TIMEOUT = float(os.environ.get('MANAGER_HEALTH_CHECK_TIMEOUT', '5'))
+# EWMA 가중치 (클수록 최근 응답시간 반영 비율이 높음)
+EWMA_ALPHA = 0.3
+# 실패한 요청을 EWMA에 반영할 때 사용할 응답시간 (초), 실패가 잦은 노드의 선택 확률을 낮춘다
+FAILURE_LATENCY_PENALTY = 10.0
+# 노드 장애로 간주하는 백엔드 상태 코드 (키워드별 스크래핑 실패 500은 제외)
+NODE_FAILURE_STATUSES = (502, 503, 504)
+
+STRATEGIES = ('least_outstanding', 'ewma')
+
+
+class Node:
+    """백엔드 노드 하나의 상태"""
+
+    def __init__(self, host: str, port: int, weight: float = 1):
+        self.host = host
+        self.port = port
+        self.weight = max(float(weight), 0.01)
+        self.outstanding = 0
+        self.ewma_latency = 0.0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until is None or now >= self.ejected_until
+
+    def _update_ewma(self, latency: float):
+        if self.ewma_latency == 0.0:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+
+    def record_success(self, latency: float):
+        self._update_ewma(latency)
+        self.consecutive_failures = 0
+        self.ejected_until = None
+
+    def record_failure(self) -> bool:
+        """실패를 기록하고, 이번 실패로 노드가 제외되면 True 반환"""
+        self._update_ewma(FAILURE_LATENCY_PENALTY)
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= EJECT_AFTER_FAILURES:
+            self.eject()
+            return True
+        return False
+
+    def eject(self):
+        cooldown = min(EJECT_COOLDOWN * (2 ** self.ejections), EJECT_COOLDOWN_MAX)
+        self.ejections += 1
+        self.ejected_until = time.monotonic() + cooldown
+
+    def readmit(self):
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = None
+
+    def snapshot(self, now: float) -> dict:
+        return {
+            'weight': self.weight,
+            'available': self.is_available(now),
+            'outstanding': self.outstanding,
+            'ewma_latency': round(self.ewma_latency, 3),
+            'requests': self.requests,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'ejected_for': round(self.ejected_until - now, 1) if not self.is_available(now) else 0,
+        }
+
+
+class BackendPool:
+    """스크래퍼 종류 하나에 속한 노드 집합"""
+
+    def __init__(self, name: str, nodes: List[Node], strategy: str = 'least_outstanding',
+                 health_path: Optional[str] = None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}' for backend '{name}'")
+        if not nodes:
+            raise ValueError(f"Backend '{name}' has no nodes")
+        self.name = name
+        self.nodes = nodes
+        self.strategy = strategy
+        self.health_path = health_path
+
+    def _score(self, node: Node) -> float:
+        load = (node.outstanding + 1) / node.weight
+        if self.strategy == 'ewma':
+            return node.ewma_latency * load
+        return load
+
+    def pick(self) -> Node:
+        now = time.monotonic()
+        candidates = [node for node in self.nodes if node.is_available(now)]
+        if not candidates:
+            # 모든 노드가 제외된 경우 요청을 버리지 않고 가장 빨리 복귀할 노드로 보냄
+            return min(self.nodes, key=lambda node: node.ejected_until)
+        best_score = min(self._score(node) for node in candidates)
+        best = [node for node in candidates if self._score(node) == best_score]
+        return random.choice(best)
+
+
+class BackendRegistry:
+    """설정 파일 기반 백엔드 레지스트리"""
+
+    def __init__(self, config: Dict[str, dict]):
+        self.logger = logging.getLogger('uvicorn')
+        self.pools: Dict[str, BackendPool] = {}
+        for name, service in config.items():
+            nodes = [
+                Node(node['host'], int(node['port']), node.get('weight', 1))
+                for node in service.get('nodes', [])
+            ]
+            self.pools[name] = BackendPool(
+                name,
+                nodes,
+                strategy=service.get('strategy', 'least_outstanding'),
+                health_path=service.get('health_path'),
+            )
+        self._health_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_file(cls, path: str = CONFIG_PATH) -> 'BackendRegistry':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    async def get(self, transport: BackendTransport, service: str, path: str,
+                  params: Optional[dict] = None) -> BackendResponse:
+        """서비스의 노드 하나를 골라 요청을 전달
+
+        Raises:
+            KeyError: 등록되지 않은 서비스
+            aiohttp.ClientError, ConnectionError, asyncio.TimeoutError: 전송 실패 시
+        """
+        node = self.pools[service].pick()
+        node.requests += 1
+        node.outstanding += 1
+        start_time = time.monotonic()
+        try:
+            response = await transport.get(node.host, node.port, path, params)
+        except (aiohttp.ClientError, ConnectionError, asyncio.TimeoutError):
+            self._record_failure(service, node)
+            raise
+        finally:
+            node.outstanding -= 1
+
+        if response.status in NODE_FAILURE_STATUSES:
+            self._record_failure(service, node)
+        else:
+            node.record_success(time.monotonic() - start_time)
+        return response
+
+    def _record_failure(self, service: str, node: Node):
+        if node.record_failure():
+            self.logger.warning(
+                f"[REGISTRY] {service} node {node.name} ejected after "
+                f"{node.consecutive_failures} consecutive failures"
+            )
+
+    def start_health_checks(self, transport: BackendTransport):
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop(transport))
+
+    async def stop_health_checks(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    async def _health_loop(self, transport: BackendTransport):
+        while True:
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            checks = [
+                self._check_node(transport, pool, node)
+                for pool in self.pools.values()
+                for node in pool.nodes
+            ]
+            await asyncio.gather(*checks, return_exceptions=True)
+
+    async def _check_node(self, transport: BackendTransport, pool: BackendPool, node: Node):
+        now = time.monotonic()
+        if pool.health_path is None:
+            # 헬스체크 경로가 없으면 쿨다운이 끝난 노드를 다시 투입 (다음 실패 시 바로 재제외)
+            if node.ejected_until is not None and node.is_available(now):
+                node.ejected_until = None
+                node.consecutive_failures = EJECT_AFTER_FAILURES - 1
+            return
+
+        try:
+            response = await asyncio.wait_for(
+                transport.get(node.host, node.port, pool.health_path),
+                timeout=HEALTH_CHECK_TIMEOUT
+            )
+            healthy = response.status == 200
+        except (aiohttp.ClientError, ConnectionError, asyncio.TimeoutError):
+            healthy = False
+
+        if healthy and node.ejected_until is not None:
+            self.logger.info(f"[REGISTRY] {pool.name} node {node.name} passed health check, re-admitted")
+            node.readmit()
+        elif not healthy and node.is_available(now):
+            self.logger.warning(f"[REGISTRY] {pool.name} node {node.name} failed health check, ejected")
+            node.eject()
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            name: {
+                'strategy': pool.strategy,
+                'nodes': {node.name: node.snapshot(now) for node in pool.nodes},
+            }
+            for name, pool in self.pools.items()
+        }
@@ -0,0 +1,239 @@
+"""
+백엔드 호스트별 HTTP 커넥션 풀 관리
+요청마다 ssh + curl 프로세스를 띄우지 않고, 백엔드마다 keep-alive 연결을 유지하여 재사용한다.
+
+전송 방식 (MANAGER_TRANSPORT_MODE)
+- tunnel: 백엔드마다 `ssh -N -L` 포트포워딩 터널을 한 번만 띄우고 그 위로 HTTP 요청 (기본값)
+- direct: 백엔드 host:port 로 직접 HTTP 요청 (내부망에서 포트가 열려 있는 경우)
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+SSH_USER = os.environ.get('MANAGER_SSH_USER', 'loopit0423')
+TRANSPORT_MODE = os.environ.get('MANAGER_TRANSPORT_MODE', 'tunnel')
+# 백엔드 스크래핑은 최대 20분까지 걸릴 수 있다
+REQUEST_TIMEOUT = float(os.environ.get('MANAGER_REQUEST_TIMEOUT', '1200'))
+# 백엔드 하나당 동시에 유지할 최대 연결 수
+CONNECTIONS_PER_BACKEND = int(os.environ.get('MANAGER_CONNECTIONS_PER_BACKEND', '16'))
+KEEPALIVE_TIMEOUT = float(os.environ.get('MANAGER_KEEPALIVE_TIMEOUT', '60'))
+TUNNEL_START_TIMEOUT = float(os.environ.get('MANAGER_TUNNEL_START_TIMEOUT', '10'))
+
+
+class BackendResponse:
+    """백엔드 응답 (상태 코드 + 본문)"""
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.body = body
+
+    def text(self) -> str:
+        return self.body.decode('utf-8')
+
+
+class SSHTunnel:
+    """백엔드 하나에 대한 영속 SSH 포트포워딩 터널
+
+    SSH 핸드셰이크는 터널을 띄울 때 한 번만 발생하고,
+    이후 HTTP 연결은 하나의 SSH 연결 위에서 채널로 다중화된다.
+    """
+
+    def __init__(self, host: str, remote_port: int):
+        self.host = host
+        self.remote_port = remote_port
+        self.local_port: Optional[int] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.restarts = 0
+        self._lock = asyncio.Lock()
+        self.logger = logging.getLogger('uvicorn')
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def ensure(self) -> int:
+        """터널이 살아있으면 로컬 포트를 반환하고, 아니면 새로 띄운다."""
+        async with self._lock:
+            if self.is_alive():
+                return self.local_port
+            if self.process is not None:
+                self.restarts += 1
+                self.logger.warning(f"[TRANSPORT] Tunnel to {self.host} exited, restarting")
+            await self._start()
+            return self.local_port
+
+    async def _start(self):
+        self.local_port = _find_free_port()
+        ssh_command = [
+            'ssh', '-N',
+            '-o', 'LogLevel=ERROR',
+            '-o', 'BatchMode=yes',
+            '-o', 'ExitOnForwardFailure=yes',
+            '-o', 'ServerAliveInterval=30',
+            '-o', 'ServerAliveCountMax=3',
+            '-L', f'127.0.0.1:{self.local_port}:localhost:{self.remote_port}',
+            f'{SSH_USER}@{self.host}',
+        ]
+        self.process = await asyncio.create_subprocess_exec(
+            *ssh_command,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        # 로컬 포트가 연결을 받을 때까지 대기
+        deadline = time.monotonic() + TUNNEL_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.returncode is not None:
+                stderr = await self.process.stderr.read()
+                raise ConnectionError(
+                    f"SSH tunnel to {self.host} exited: {stderr.decode('utf-8', 'replace').strip()}"
+                )
+            try:
+                _, writer = await asyncio.open_connection('127.0.0.1', self.local_port)
+                writer.close()
+                self.logger.info(
+                    f"[TRANSPORT] Tunnel ready: 127.0.0.1:{self.local_port} -> "
+                    f"{self.host}:{self.remote_port}"
+                )
+                return
+            except OSError:
+                await asyncio.sleep(0.1)
+
+        await self.close()
+        raise ConnectionError(f"SSH tunnel to {self.host} did not become ready in {TUNNEL_START_TIMEOUT}s")
+
+    async def close(self):
+        if self.is_alive():
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=3)
+            except asyncio.TimeoutError:
+                self.process.kill()
+
+
+class _Backend:
+    """백엔드별 세션, 터널, 통계"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.tunnel = SSHTunnel(host, port) if TRANSPORT_MODE == 'tunnel' else None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = {
+            'requests': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'total_latency': 0.0,
+        }
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(self._on_connection_created)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTIONS_PER_BACKEND,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                trace_configs=[trace_config],
+            )
+        return self.session
+
+    async def _on_connection_created(self, session, ctx, params):
+        self.stats['connections_created'] += 1
+
+    async def _on_connection_reused(self, session, ctx, params):
+        self.stats['connections_reused'] += 1
+
+    async def base_url(self) -> str:
+        if self.tunnel is not None:
+            local_port = await self.tunnel.ensure()
+            return f"http://127.0.0.1:{local_port}"
+        return f"http://{self.host}:{self.port}"
+
+    def snapshot(self) -> dict:
+        stats = dict(self.stats)
+        total_latency = stats.pop('total_latency')
+        completed = stats['requests'] - stats['in_flight']
+        connections = stats['connections_created'] + stats['connections_reused']
+        stats['avg_latency'] = round(total_latency / completed, 3) if completed > 0 else 0.0
+        stats['reuse_ratio'] = round(stats['connections_reused'] / connections, 3) if connections > 0 else 0.0
+        if self.tunnel is not None:
+            stats['tunnel_alive'] = self.tunnel.is_alive()
+            stats['tunnel_restarts'] = self.tunnel.restarts
+        return stats
+
+
+class BackendTransport:
+    """백엔드 호스트별 keep-alive 커넥션 풀"""
+
+    def __init__(self):
+        self._backends: Dict[Tuple[str, int], _Backend] = {}
+        self.logger = logging.getLogger('uvicorn')
+
+    def _get_backend(self, host: str, port: int) -> _Backend:
+        key = (host, port)
+        if key not in self._backends:
+            self._backends[key] = _Backend(host, port)
+        return self._backends[key]
+
+    async def get(self, host: str, port: int, path: str, params: Optional[dict] = None) -> BackendResponse:
+        """백엔드에 GET 요청을 보내고 응답을 반환
+
+        Raises:
+            aiohttp.ClientError, ConnectionError, asyncio.TimeoutError: 전송 실패 시
+        """
+        backend = self._get_backend(host, port)
+        backend.stats['requests'] += 1
+        backend.stats['in_flight'] += 1
+        start_time = time.monotonic()
+        try:
+            try:
+                return await self._get_once(backend, path, params)
+            except aiohttp.ClientConnectionError:
+                # 터널이 끊긴 경우 한 번 재연결 후 재시도
+                if backend.tunnel is None or backend.tunnel.is_alive():
+                    raise
+                self.logger.warning(f"[TRANSPORT] Connection to {host} lost, retrying through a new tunnel")
+                return await self._get_once(backend, path, params)
+        except Exception:
+            backend.stats['errors'] += 1
+            raise
+        finally:
+            backend.stats['in_flight'] -= 1
+            backend.stats['total_latency'] += time.monotonic() - start_time
+
+    async def _get_once(self, backend: _Backend, path: str, params: Optional[dict]) -> BackendResponse:
+        url = f"{await backend.base_url()}{path}"
+        async with backend.get_session().get(url, params=params) as response:
+            body = await response.read()
+            return BackendResponse(response.status, body)
+
+    def get_stats(self) -> dict:
+        return {
+            f"{host}:{port}": backend.snapshot()
+            for (host, port), backend in self._backends.items()
+        }
+
+    async def close(self):
+        for backend in self._backends.values():
+            if backend.session is not None and not backend.session.closed:
+                await backend.session.close()
+            if backend.tunnel is not None:
+                await backend.tunnel.close()
+        self._backends.clear()
+
+
+def _find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
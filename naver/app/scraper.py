@@ -6,7 +6,7 @@ from selenium.webdriver.common.by import By
 
 from selenium_driver import SeleniumDriver
 import time
-from bs4 import BeautifulSoup
+from parsing import parse_html
 import json
 
 
@@ -78,7 +78,7 @@ class Scraper:
     try:
       wait.until(EC.presence_of_all_elements_located((By.ID, 'taglist')))
       page_source = self.driver.page_source
-      soup = BeautifulSoup(page_source, 'html.parser')
+      soup = parse_html(page_source)
       targets = soup.select('.intentKeyword_list_panel__thfp_ a')
       result = [tag.text for target in targets for tag in target.find_all('a')]
 
@@ -119,7 +119,7 @@ class Scraper:
     url = f'https://m.search.naver.com/search.naver?where=nexearch&sm=top_hty&fbm=0&ie=utf8&query={keywords}'
     self.driver.get(url=url)
 
-    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+    soup = parse_html(self.driver.page_source)
     try:
       result = '관련 검색어가 없습니다.'
       items = soup.find_all(class_='keyword_item')
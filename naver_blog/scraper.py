@@ -1,4 +1,4 @@
-from bs4 import BeautifulSoup
+from parsing import parse_html
 import json
 import logging
 import re
@@ -287,7 +287,7 @@ class Scraper:
                     self.logger.error("Failed to fetch page")
                     break
                 
-                soup = BeautifulSoup(html_content, 'html.parser')
+                soup = parse_html(html_content)
                 remaining = limit - len(results['result'])
                 span_texts = self._extract_main_pack_span_texts(soup, remaining)
                 if not span_texts:
@@ -336,7 +336,7 @@ class Scraper:
                     self.logger.error("Failed to fetch page")
                     break
                 
-                soup = BeautifulSoup(html_content, 'html.parser')
+                soup = parse_html(html_content)
                 remaining = limit - len(results['result'])
                 anchor_texts = self._extract_main_pack_anchor_texts(soup, remaining)
                 if not anchor_texts:
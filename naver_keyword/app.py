@@ -1,7 +1,13 @@
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from scraper import Scraper, ScraperException
 from selenium_pool import get_driver_pool, cleanup_driver_pool
+from tab_pool import DRIVER_MODE, get_tab_pool, cleanup_tab_pool
+from singleflight import SingleFlight
+from result_cache import ResultCache
+from batch import BatchRequest, BatchScheduler
+from streaming import negotiate, stream_response
+from waits import get_wait_stats
 import re
 import os
 from urllib.parse import unquote
@@ -24,6 +30,14 @@ app = FastAPI(
 # ThreadPoolExecutor 설정
 SCRAPER_MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "2"))
 executor = ThreadPoolExecutor(max_workers=SCRAPER_MAX_WORKERS, thread_name_prefix="scraper_worker")
+# 동일 키워드 동시 요청은 하나의 스크래핑 결과를 공유
+single_flight = SingleFlight()
+# 키워드 결과 캐시 {엔드포인트: (fresh TTL, stale 허용 시간)} (초)
+result_cache = ResultCache({
+    'naver_related': (6 * 3600, 24 * 3600),
+    'naver_popular': (1 * 3600, 6 * 3600),
+    'naver_together': (6 * 3600, 24 * 3600),
+})
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - [%(threadName)s] - %(message)s"
@@ -31,16 +45,50 @@ logging.basicConfig(
 
 logger = logging.getLogger('uvicorn')
 
+async def run_batch_keyword(endpoint: str, keywords: str, limit=None):
+    """배치 키워드 하나 실행 (단건 엔드포인트와 같은 캐시/single-flight 경로, 스크래핑할 때만 속도 제한)"""
+    loop = asyncio.get_running_loop()
+
+    async def scrape():
+        await batch_scheduler.throttle(endpoint)
+        return await loop.run_in_executor(executor, BATCH_TASKS[endpoint], keywords)
+
+    return await result_cache.get_or_load(
+        endpoint,
+        keywords,
+        lambda: single_flight.do(endpoint, keywords, scrape)
+    )
+
+# 배치 요청은 키워드를 job 별로 돌아가며 실행 (모든 엔드포인트가 네이버 검색을 사용하므로 속도 제한 공유)
+batch_scheduler = BatchScheduler(
+    run_batch_keyword,
+    {'naver_related': 'naver', 'naver_popular': 'naver', 'naver_together': 'naver'},
+    concurrency=SCRAPER_MAX_WORKERS
+)
+
+# 애플리케이션 시작 시 드라이버를 미리 띄워 첫 요청이 Chrome 구동을 기다리지 않도록 함
+@app.on_event("startup")
+async def startup_event():
+    """드라이버 풀 prewarm (백그라운드 진행)"""
+    if DRIVER_MODE == 'tabs':
+        get_tab_pool().prewarm()
+    else:
+        get_driver_pool().prewarm()
+
 # 애플리케이션 종료 시 드라이버 풀 정리
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 리소스 정리"""
     logger.info("Application shutting down, cleaning up driver pool...")
     cleanup_driver_pool()
+    cleanup_tab_pool()
+    await batch_scheduler.close()
+    result_cache.close()
     logger.info("Driver pool cleanup completed")
 
 # 프로세스 종료 시에도 정리
 atexit.register(cleanup_driver_pool)
+atexit.register(cleanup_tab_pool)
 
 def naver_related(keywords: str) -> Dict[str, Any]:
     """연관검색어 스크래핑 (동기 함수)
@@ -96,6 +144,66 @@ def naver_together(keywords: str) -> Dict[str, Any]:
     logger.info(f"[WORKER] Completed naver_together for: {keywords}, found {len(result['result'])} results")
     return result
 
+BATCH_TASKS = {
+    'naver_related': naver_related,
+    'naver_popular': naver_popular,
+    'naver_together': naver_together,
+}
+
+@app.post(
+    "/batch",
+    summary="키워드 배치 스크래핑",
+    description="여러 키워드를 한 번에 받아 서버에서 나눠 실행합니다. job_id로 결과를 조회하거나 NDJSON/SSE로 바로 받습니다.",
+    response_model=None
+)
+async def batch(request: Request, body: BatchRequest):
+    """키워드 배치 엔드포인트
+
+    Args:
+        body: {'endpoint': 'naver_related' | 'naver_popular' | 'naver_together', 'keywords': [str, ...]}
+
+    Returns:
+        {'job_id': str, ...} (GET /batch/{job_id} 로 진행 상황/결과 조회)
+        Accept: application/x-ndjson 또는 text/event-stream 이면 키워드 결과를 완료되는 대로 스트리밍
+
+    Raises:
+        HTTPException: 잘못된 엔드포인트/키워드 목록이면 400 에러
+    """
+    try:
+        job = batch_scheduler.submit(body.endpoint, body.keywords, body.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    media_type = negotiate(request)
+    if media_type is not None:
+        return stream_response(media_type, batch_scheduler.stream(job))
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict(offset=job.total))
+
+@app.get(
+    "/batch/{job_id}",
+    summary="키워드 배치 결과 조회",
+    description="배치 진행 상황과 offset 이후에 완료된 결과를 반환합니다.",
+    response_model=None
+)
+async def batch_status(job_id: str, offset: int = 0):
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return job.to_dict(offset=offset)
+
+@app.delete(
+    "/batch/{job_id}",
+    summary="키워드 배치 취소",
+    description="아직 시작하지 않은 키워드를 취소합니다.",
+    response_model=None
+)
+async def batch_cancel(job_id: str):
+    job = batch_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    batch_scheduler.cancel(job)
+    return job.to_dict(offset=len(job.results))
+
 @app.get(
     "/search/naver_related",
     summary="네이버 연관검색어 스크래핑",
@@ -118,7 +226,15 @@ async def related(keywords: str):
     
     try:
         loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(executor, naver_related, keywords)
+        result = await result_cache.get_or_load(
+            'naver_related',
+            keywords,
+            lambda: single_flight.do(
+                'naver_related',
+                keywords,
+                lambda: loop.run_in_executor(executor, naver_related, keywords)
+            )
+        )
         logger.info(f"[API] Successfully completed naver_related: {keywords}")
         return result
         
@@ -169,7 +285,15 @@ async def popular(keywords: str):
     
     try:
         loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(executor, naver_popular, keywords)
+        result = await result_cache.get_or_load(
+            'naver_popular',
+            keywords,
+            lambda: single_flight.do(
+                'naver_popular',
+                keywords,
+                lambda: loop.run_in_executor(executor, naver_popular, keywords)
+            )
+        )
         logger.info(f"[API] Successfully completed naver_popular: {keywords}")
         return result
         
@@ -220,7 +344,15 @@ async def together(keywords: str):
     
     try:
         loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(executor, naver_together, keywords)
+        result = await result_cache.get_or_load(
+            'naver_together',
+            keywords,
+            lambda: single_flight.do(
+                'naver_together',
+                keywords,
+                lambda: loop.run_in_executor(executor, naver_together, keywords)
+            )
+        )
         logger.info(f"[API] Successfully completed naver_together: {keywords}")
         return result
         
@@ -270,15 +402,32 @@ async def health_check():
 )
 async def get_stats():
     """드라이버 풀 통계 엔드포인트"""
-    pool = get_driver_pool()
+    pool = get_tab_pool() if DRIVER_MODE == 'tabs' else get_driver_pool()
     stats = pool.get_stats()
     
     return {
         "driver_pool_stats": stats,
+        "single_flight_stats": single_flight.get_stats(),
+        "result_cache_stats": result_cache.get_stats(),
+        "batch_stats": batch_scheduler.get_stats(),
+        "wait_stats": get_wait_stats(),
         "description": {
             "total_requests": "총 Selenium 요청 수",
             "driver_restarts": "드라이버 재시작 횟수",
-            "driver_errors": "드라이버 에러 발생 횟수"
+            "driver_errors": "드라이버 에러 발생 횟수",
+            "pool_size": "동시에 구동하는 최대 브라우저 수 (SELENIUM_POOL_SIZE)",
+            "waiting": "유휴 드라이버를 기다리는 요청 수 (대기열 길이)",
+            "avg_wait_time": "드라이버 대여까지의 평균 대기 시간 (초)",
+            "inline_creations": "요청 처리 중 드라이버를 직접 생성한 횟수 (prewarm/백그라운드 교체 실패 시)",
+            "recycled_rss": "Chrome 프로세스 트리 RSS 초과로 교체한 횟수 (SELENIUM_DRIVER_MAX_RSS_MB)",
+            "concurrency_limit": "호스트 메모리 상태에 따른 현재 동시 대여 가능 드라이버 수",
+            "shed_waits": "호스트 메모리 부족으로 대기한 요청 수",
+            "avg_tab_teardown_ms": "요청 후 페이지 정리(about:blank) 평균 시간 (ms)",
+            "coalesced": "진행 중인 동일 요청에 합류한 요청 수",
+            "hit_ratio": "캐시 적중률 (stale 응답 포함)",
+            "avg_served_age": "캐시 응답 결과의 평균 경과 시간 (초)",
+            "queued": "배치 대기 키워드 수 (job 별로 돌아가며 실행)",
+            "rate_limits": "배치 사이트별 초당 스크래핑 수와 속도 제한으로 대기한 횟수"
         }
     }
 
@@ -296,6 +445,7 @@ async def root():
             "related": "/search/naver_related?keywords={keyword}",
             "popular": "/search/naver_popular?keywords={keyword}",
             "together": "/search/naver_together?keywords={keyword}",
+            "batch": "POST /batch {'endpoint': ..., 'keywords': [...]}, GET /batch/{job_id}",
             "health": "/health",
             "stats": "/stats"
         },
@@ -311,11 +461,11 @@ async def root():
         "performance": {
             "all_endpoints": "연관검색어, 인기주제, 함께찾은 키워드 모두 Selenium 사용",
             "driver_pooling": "매 요청마다 Chrome을 열지 않고 재사용",
-            "first_request": "3-10초 (드라이버 생성 포함)",
+            "first_request": "시작 시 미리 띄운 드라이버 사용 (prewarm 완료 전에는 대기)",
             "subsequent_requests": "2-3초 (드라이버 재사용)",
-            "auto_restart": "100개 요청마다 드라이버 자동 재시작"
+            "auto_restart": "Chrome 메모리/핸들 사용량 초과 시 백그라운드에서 교체 드라이버를 만든 뒤 재시작 (최대 사용 횟수는 안전장치)"
         },
-        "note": "첫 요청은 드라이버 생성으로 느릴 수 있지만, 이후 요청은 매우 빠릅니다!"
+        "note": "드라이버는 앱 시작 시 미리 생성되고 재시작도 백그라운드에서 진행되어 요청이 Chrome 구동 시간을 기다리지 않습니다."
     }
 
 if __name__ == '__main__':
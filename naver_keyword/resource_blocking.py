@@ -0,0 +1,187 @@
+"""
+네트워크 단계 리소스 차단 (CDP Network.setBlockedURLs)
+이미지 끄기(blink 설정/prefs)만으로는 폰트, 미디어, 광고, 분석 비콘, XHR 로 받는 썸네일이 계속 다운로드되므로
+요청 자체를 브라우저 네트워크 단계에서 막아 대역폭과 렌더러 CPU 를 줄인다.
+
+- 사이트별 프로필: youtube (dyoutube) / naver (naver_keyword) (공통 차단 목록 + 사이트 전용 차단 목록), none 은 차단 안 함
+  - block: 차단할 URL 패턴 (CDP 와일드카드 '*')
+  - allow: 페이지 동작에 꼭 필요한 요청 URL 예시. 차단 패턴이 이 URL 과 맞으면 그 패턴은 적용하지 않음
+    (Network.setBlockedURLs 는 예외 규칙을 지원하지 않으므로 프로필을 만들 때 걸러냄)
+- 기본 프로필: RESOURCE_BLOCK_PROFILE (기본 youtube, naver_keyword 는 naver), dyoutube 는 요청마다 block= 파라미터로 변경 가능
+- RESOURCE_BLOCK_EXTRA: 모든 프로필에 추가할 차단 패턴 (쉼표 구분)
+- RESOURCE_BLOCK_MEASURE=1 (기본): Chrome 성능 로그(Network 이벤트)로 페이지별 전송 바이트/차단 요청 수를 집계.
+  차단한 요청은 크기를 알 수 없으므로 절약한 바이트는 none 프로필로 받은 페이지의 평균과 비교한 추정치
+
+요청마다 Python 으로 왕복해야 하는 Fetch 도메인 가로채기는 페이지 로드를 느리게 하고,
+selenium execute_cdp_cmd 로는 Fetch.requestPaused 이벤트를 받을 수 없어 사용하지 않는다.
+"""
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_PROFILE = os.environ.get('RESOURCE_BLOCK_PROFILE', 'youtube')
+EXTRA_PATTERNS = [pattern.strip() for pattern in os.environ.get('RESOURCE_BLOCK_EXTRA', '').split(',') if pattern.strip()]
+MEASURE = os.environ.get('RESOURCE_BLOCK_MEASURE', '1') != '0'
+
+# 스크래퍼가 읽지 않는 리소스 (이미지 URL 은 속성에서 읽으므로 다운로드할 필요 없음)
+COMMON_BLOCK = [
+    # 폰트
+    '*.woff*', '*.ttf*', '*.otf*', '*.eot*',
+    # 미디어
+    '*.mp4*', '*.webm*', '*.m4a*', '*.mp3*', '*.m3u8*',
+    # 이미지
+    '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*favicon*',
+    # 광고/분석
+    '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*google-analytics.com*',
+    '*googletagmanager.com*', '*googletagservices.com*', '*facebook.net*', '*criteo.com*', '*criteo.net*',
+]
+
+PROFILES: Dict[str, Dict[str, List[str]]] = {
+    'none': {
+        'block': [],
+        'allow': [],
+    },
+    'youtube': {
+        'block': COMMON_BLOCK + [
+            # 동영상 스트림 (미리보기 자동재생), 썸네일, 채널 아바타
+            '*googlevideo.com/*', '*i.ytimg.com/*', '*i9.ytimg.com/*', '*yt3.ggpht.com/*', '*yt3.googleusercontent.com/*',
+            # 재생/로그 비콘
+            '*youtube.com/api/stats/*', '*youtube.com/ptracking*', '*youtube.com/generate_204*',
+            '*/youtubei/v1/log_event*', '*youtube.com/pagead/*', '*play.google.com/log*',
+        ],
+        'allow': [
+            'https://www.youtube.com/results?search_query=test',
+            'https://www.youtube.com/youtubei/v1/search?prettyPrint=false',
+            'https://www.youtube.com/youtubei/v1/next?prettyPrint=false',
+            'https://www.youtube.com/s/desktop/00000000/jsbin/desktop_polymer.vflset/desktop_polymer.js',
+        ],
+    },
+    'naver': {
+        'block': COMMON_BLOCK + [
+            # 썸네일/본문 이미지, 아이콘
+            '*.svg*', '*.ico*',
+            '*phinf.pstatic.net*', '*search.pstatic.net/common*', '*dthumb-phinf.pstatic.net*',
+            # 광고/로그
+            '*veta.naver.com*', '*ssl.pstatic.net/tveta*', '*nlog.naver.com*', '*lcs.naver.com*',
+            '*wcs.naver.net*', '*tivan.naver.com*',
+        ],
+        'allow': [
+            'https://search.naver.com/search.naver?query=test',
+            'https://m.search.naver.com/search.naver?query=test',
+            'https://ssl.pstatic.net/sstatic/search/pc/js/search.js',
+        ],
+    },
+}
+
+
+def _matches(pattern: str, url: str) -> bool:
+    """CDP 차단 패턴과 같은 방식으로 비교 ('*' 만 와일드카드)"""
+    return re.fullmatch('.*'.join(re.escape(part) for part in pattern.split('*')), url) is not None
+
+
+def blocked_urls(profile: str) -> List[str]:
+    """프로필의 차단 패턴 (allow URL 과 맞는 패턴은 제외, 알 수 없는 프로필이면 ValueError)"""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown block profile '{profile}', expected one of {sorted(PROFILES)}")
+    if profile == 'none':
+        return []
+    config = PROFILES[profile]
+    patterns = []
+    for pattern in config['block'] + EXTRA_PATTERNS:
+        if pattern in patterns or any(_matches(pattern, url) for url in config['allow']):
+            continue
+        patterns.append(pattern)
+    return patterns
+
+
+def resolve_profile(profile: Optional[str]) -> str:
+    """요청 파라미터의 프로필 이름 (없으면 기본 프로필, 알 수 없으면 ValueError)"""
+    profile = (profile or DEFAULT_PROFILE).strip().lower()
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown block profile '{profile}', expected one of {sorted(PROFILES)}")
+    return profile
+
+
+def summarize_performance_log(entries: List[dict]) -> dict:
+    """Chrome 성능 로그(Network 이벤트)에서 요청 수, 전송 바이트, 차단된 요청 수(리소스 종류별) 집계"""
+    summary = {'requests': 0, 'bytes': 0, 'blocked': 0, 'blocked_by_type': {}}
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            summary['requests'] += 1
+        elif method == 'Network.loadingFinished':
+            summary['bytes'] += int(params.get('encodedDataLength') or 0)
+        elif method == 'Network.loadingFailed' and params.get('blockedReason') == 'inspector':
+            # setBlockedURLs 로 차단된 요청
+            summary['blocked'] += 1
+            resource_type = params.get('type', 'Other')
+            summary['blocked_by_type'][resource_type] = summary['blocked_by_type'].get(resource_type, 0) + 1
+    return summary
+
+
+class ResourceBlockStats:
+    """프로필별 페이지 수, 전송 바이트, 차단 요청 수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, dict] = {}
+
+    def _profile(self, profile: str) -> dict:
+        if profile not in self._profiles:
+            self._profiles[profile] = {
+                'pages': 0,
+                'measured_pages': 0,
+                'requests': 0,
+                'bytes': 0,
+                'blocked': 0,
+                'blocked_by_type': {},
+            }
+        return self._profiles[profile]
+
+    def record(self, profile: str, summary: Optional[dict] = None):
+        with self._lock:
+            stats = self._profile(profile)
+            stats['pages'] += 1
+            if summary is None:
+                return
+            stats['measured_pages'] += 1
+            stats['requests'] += summary['requests']
+            stats['bytes'] += summary['bytes']
+            stats['blocked'] += summary['blocked']
+            for resource_type, count in summary['blocked_by_type'].items():
+                stats['blocked_by_type'][resource_type] = stats['blocked_by_type'].get(resource_type, 0) + count
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            profiles = {name: dict(stats, blocked_by_type=dict(stats['blocked_by_type']))
+                        for name, stats in self._profiles.items()}
+        baseline = profiles.get('none')
+        baseline_avg = baseline['bytes'] / baseline['measured_pages'] if baseline and baseline['measured_pages'] else None
+        for name, stats in profiles.items():
+            measured = stats['measured_pages']
+            stats['avg_bytes_per_page'] = round(stats['bytes'] / measured) if measured else None
+            # none 프로필 페이지가 있어야 추정 가능
+            if name != 'none' and measured and baseline_avg is not None:
+                saved_per_page = max(0.0, baseline_avg - stats['bytes'] / measured)
+                stats['estimated_bytes_saved'] = round(saved_per_page * measured)
+            else:
+                stats['estimated_bytes_saved'] = None
+        return {
+            'default_profile': DEFAULT_PROFILE,
+            'measure': MEASURE,
+            'profiles': profiles,
+        }
+
+
+_stats = ResourceBlockStats()
+
+
+def get_block_stats() -> ResourceBlockStats:
+    return _stats
@@ -0,0 +1,279 @@
+"""
+키워드 스크래핑 결과 캐시 (TTL + stale-while-revalidate)
+연관/인기/추천 키워드는 자주 바뀌지 않으므로 같은 키워드에 대해 매번 브라우저 페이지를 열지 않는다.
+
+- 메모리 계층: 바이트 예산 기반 LRU (워커 프로세스별)
+- 디스크 계층: SQLite (gunicorn max_requests 로 워커가 재시작되어도 유지, 워커 간 공유)
+- 엔드포인트별 TTL: fresh 기간에는 그대로 응답, stale 기간에는 기존 결과로 즉시 응답하고
+  백그라운드에서 갱신, 그 이후에는 새로 스크래핑
+- 에러/빈 결과는 캐시하지 않음
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# 캐시 파일 경로 (빈 문자열이면 디스크 계층 비활성화)
+CACHE_PATH = os.environ.get('RESULT_CACHE_PATH', '/tmp/result_cache.sqlite3')
+CACHE_MEMORY_MB = float(os.environ.get('RESULT_CACHE_MEMORY_MB', '32'))
+CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', '1') != '0'
+# 디스크 계층 만료 항목 정리 주기 (쓰기 횟수 기준)
+PRUNE_EVERY_WRITES = 200
+
+
+def normalize_keyword(keyword: str) -> str:
+    """공백/대소문자 차이를 무시한 키워드"""
+    return " ".join((keyword or "").split()).lower()
+
+
+def is_cacheable(result: Any) -> bool:
+    """에러가 아니고 비어있지 않은 결과만 캐시"""
+    if isinstance(result, list):
+        return len(result) > 0
+    if isinstance(result, dict):
+        return not result.get('error') and bool(result.get('result'))
+    return False
+
+
+def slice_result(result: Any, limit: Optional[int]) -> Any:
+    """limit 개수만큼 결과를 잘라 반환 ({'keyword', 'result'} 딕셔너리 또는 리스트)"""
+    if limit is None:
+        return result
+    if isinstance(result, list):
+        return result[:limit]
+    if isinstance(result, dict) and isinstance(result.get('result'), list):
+        sliced = dict(result)
+        sliced['result'] = result['result'][:limit]
+        return sliced
+    return result
+
+
+class _Entry:
+    def __init__(self, payload: str, stored_at: float, limit: Optional[int]):
+        self.payload = payload
+        self.stored_at = stored_at
+        self.limit = limit
+
+    @property
+    def size(self) -> int:
+        return len(self.payload.encode('utf-8'))
+
+    def covers(self, limit: Optional[int]) -> bool:
+        """캐시된 결과로 요청한 limit을 충족할 수 있는지"""
+        if self.limit is None:
+            return True
+        return limit is not None and self.limit >= limit
+
+
+class ResultCache:
+    """엔드포인트별 TTL을 갖는 2계층 결과 캐시
+
+    Args:
+        ttls: {엔드포인트: (fresh TTL 초, stale 허용 초)}
+        path: SQLite 파일 경로 (None 또는 빈 문자열이면 메모리만 사용)
+        memory_budget_mb: 메모리 계층 최대 크기 (MB)
+    """
+
+    def __init__(self, ttls: Dict[str, Tuple[float, float]], path: Optional[str] = CACHE_PATH,
+                 memory_budget_mb: float = CACHE_MEMORY_MB):
+        self.logger = logging.getLogger('uvicorn')
+        self.ttls = ttls
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._memory: 'OrderedDict[Tuple[str, str], _Entry]' = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._refreshing: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._writes = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = self._open_db(path)
+
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'disk_hits': 0,
+            'refreshes': 0,
+            'refresh_failures': 0,
+            'evictions': 0,
+            'served_age_total': 0.0,
+            'served_age_max': 0.0,
+        }
+
+    def _open_db(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS result_cache ('
+                'endpoint TEXT NOT NULL, '
+                'keyword TEXT NOT NULL, '
+                'payload TEXT NOT NULL, '
+                'stored_at REAL NOT NULL, '
+                'result_limit INTEGER, '
+                'PRIMARY KEY (endpoint, keyword))'
+            )
+            return db
+        except sqlite3.Error as e:
+            self.logger.warning(f"[CACHE] Disk cache disabled, failed to open {path}: {e}")
+            return None
+
+    async def get_or_load(self, endpoint: str, keyword: str, loader: Callable[[], Awaitable[Any]],
+                          limit: Optional[int] = None) -> Any:
+        """캐시된 결과를 반환하고, 없거나 만료되었으면 loader()로 스크래핑
+
+        stale 기간의 결과는 즉시 반환하고 백그라운드에서 한 번만 갱신한다.
+        """
+        if not CACHE_ENABLED or endpoint not in self.ttls:
+            return await loader()
+
+        key = (endpoint, normalize_keyword(keyword))
+        fresh_ttl, stale_ttl = self.ttls[endpoint]
+        entry = self._lookup(key)
+        now = time.time()
+
+        if entry is not None and entry.covers(limit):
+            age = now - entry.stored_at
+            if age < fresh_ttl:
+                self._record_hit('hits', age)
+                return slice_result(json.loads(entry.payload), limit)
+            if age < fresh_ttl + stale_ttl:
+                self._record_hit('stale_hits', age)
+                self._schedule_refresh(key, loader, limit)
+                return slice_result(json.loads(entry.payload), limit)
+
+        self._stats['misses'] += 1
+        result = await loader()
+        self._store(key, result, limit)
+        return result
+
+    def _record_hit(self, kind: str, age: float):
+        self._stats[kind] += 1
+        self._stats['served_age_total'] += age
+        self._stats['served_age_max'] = max(self._stats['served_age_max'], age)
+
+    def _schedule_refresh(self, key: Tuple[str, str], loader: Callable[[], Awaitable[Any]],
+                          limit: Optional[int]):
+        if key in self._refreshing:
+            return
+        future = asyncio.ensure_future(self._refresh(key, loader, limit))
+        self._refreshing[key] = future
+        future.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: Tuple[str, str], loader: Callable[[], Awaitable[Any]],
+                       limit: Optional[int]):
+        self._stats['refreshes'] += 1
+        try:
+            self._store(key, await loader(), limit)
+        except Exception as e:
+            # 갱신 실패 시 기존 stale 결과를 그대로 유지
+            self._stats['refresh_failures'] += 1
+            self.logger.warning(f"[CACHE] Background refresh failed for {key}: {e}")
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self._stats['disk_hits'] += 1
+            self._memory_put(key, entry)
+        return entry
+
+    def _store(self, key: Tuple[str, str], result: Any, limit: Optional[int]):
+        if not is_cacheable(result):
+            return
+        entry = _Entry(json.dumps(result, ensure_ascii=False), time.time(), limit)
+        self._memory_put(key, entry)
+        self._disk_put(key, entry)
+
+    def _memory_put(self, key: Tuple[str, str], entry: _Entry):
+        if entry.size > self.memory_budget:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous.size
+            self._memory[key] = entry
+            self._memory_bytes += entry.size
+            while self._memory_bytes > self.memory_budget:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.size
+                self._stats['evictions'] += 1
+
+    def _disk_get(self, key: Tuple[str, str]) -> Optional[_Entry]:
+        if self._db is None:
+            return None
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    'SELECT payload, stored_at, result_limit FROM result_cache '
+                    'WHERE endpoint = ? AND keyword = ?',
+                    key
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"[CACHE] Disk read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return _Entry(row[0], row[1], row[2])
+
+    def _disk_put(self, key: Tuple[str, str], entry: _Entry):
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO result_cache '
+                    '(endpoint, keyword, payload, stored_at, result_limit) VALUES (?, ?, ?, ?, ?)',
+                    (key[0], key[1], entry.payload, entry.stored_at, entry.limit)
+                )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY_WRITES == 0:
+                    self._prune()
+        except sqlite3.Error as e:
+            self.logger.warning(f"[CACHE] Disk write failed: {e}")
+
+    def _prune(self):
+        """stale 기간까지 지난 항목을 디스크에서 삭제 (self._lock 보유 상태에서 호출)"""
+        now = time.time()
+        for endpoint, (fresh_ttl, stale_ttl) in self.ttls.items():
+            self._db.execute(
+                'DELETE FROM result_cache WHERE endpoint = ? AND stored_at < ?',
+                (endpoint, now - fresh_ttl - stale_ttl)
+            )
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        served_age_total = stats.pop('served_age_total')
+        served = stats['hits'] + stats['stale_hits']
+        lookups = served + stats['misses']
+        stats['hit_ratio'] = round(served / lookups, 3) if lookups > 0 else 0.0
+        stats['avg_served_age'] = round(served_age_total / served, 1) if served > 0 else 0.0
+        stats['served_age_max'] = round(stats['served_age_max'], 1)
+        stats['refreshing'] = len(self._refreshing)
+        with self._lock:
+            stats['memory_entries'] = len(self._memory)
+            stats['memory_bytes'] = self._memory_bytes
+        stats['memory_budget_bytes'] = self.memory_budget
+        stats['disk_enabled'] = self._db is not None
+        stats['ttls'] = {
+            endpoint: {'fresh': fresh_ttl, 'stale': stale_ttl}
+            for endpoint, (fresh_ttl, stale_ttl) in self.ttls.items()
+        }
+        return stats
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+            self._db = None
@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from parsing import parse_html
 import logging
 import traceback
 import time
@@ -10,7 +10,19 @@ from functools import wraps
 
 # 개선된 셀레니움 드라이버(사용 환경에 맞춰 구현)
 from selenium_driver import SeleniumDriver
-from selenium_pool import get_driver_pool
+from tab_pool import get_page_pool
+from waits import wait_for_count, wait_for_idle
+
+# 키워드 요소 선택자
+RELATED_SELECTOR = 'ul.lst_related_srch div.tit'
+POPULAR_SELECTOR = 'span.fds-comps-keyword-chip-text'
+TOGETHER_SELECTOR = 'span.sds-comps-ellipsis-content'
+# 키워드 요소가 나타날 때까지 기다리는 최대 시간 (초, 스크롤 한 번마다)
+KEYWORD_WAIT_TIMEOUT = 2.0
+# 요소가 없어도 페이지가 이 시간(초) 동안 변하지 않으면 더 기다리지 않음
+KEYWORD_WAIT_SETTLE = 0.5
+# 하단 섹션까지 스크롤할 때 스크롤마다 페이지가 잠잠해지기를 기다리는 최대 시간 (초, 기존 고정 대기)
+KEYWORD_SCROLL_IDLE_TIMEOUT = 1.0
 
 
 class ScraperException(Exception):
@@ -93,6 +105,32 @@ class Scraper:
         self.session = None
         self._initialize_session()
     
+    def _wait_for_keywords(self, driver, selector: str, nloop: int, key: str, scroll_increment: int = 300) -> int:
+        """키워드 요소가 나타날 때까지 대기하고, 없으면 scroll_increment 씩 최대 nloop 번 스크롤하며 대기
+
+        고정 대기(스크롤마다 1초) 대신 요소가 나타나는 즉시 멈춘다. 찾은 요소 수 반환
+        """
+        count = wait_for_count(driver, selector, timeout=KEYWORD_WAIT_TIMEOUT, key=f'naver_{key}',
+                               settle=KEYWORD_WAIT_SETTLE)
+        for _ in range(nloop):
+            if count:
+                break
+            driver.execute_script("window.scrollBy(0, arguments[0]);", scroll_increment)
+            count = wait_for_count(driver, selector, timeout=KEYWORD_WAIT_TIMEOUT, key=f'naver_{key}_scroll',
+                                   settle=KEYWORD_WAIT_SETTLE)
+        self.logger.info(f"[{key.upper()}] Found {count} keyword elements")
+        return count
+
+    def _scroll_to_bottom_section(self, driver, nloop: int, key: str, scroll_increment: int = 300):
+        """scroll_increment 씩 nloop 번 모두 스크롤하고, 스크롤마다 지연 로딩이 잠잠해질 때까지 대기
+
+        하단 섹션의 선택자는 위쪽 섹션에도 있어서 요소 수로 멈출 수 없으므로 스크롤 횟수는 줄이지 않고
+        스크롤 사이의 고정 대기(1초)만 wait_for_idle 로 바꾼다.
+        """
+        for _ in range(nloop):
+            driver.execute_script("window.scrollBy(0, arguments[0]);", scroll_increment)
+            wait_for_idle(driver, timeout=KEYWORD_SCROLL_IDLE_TIMEOUT, key=f'naver_{key}_scroll')
+
     def _initialize_session(self):
         """세션 초기화 또는 재생성"""
         if self.session:
@@ -347,22 +385,18 @@ class Scraper:
             self.logger.info(f"[RELATED] Starting Selenium scrape for keyword: {query}")
             self.logger.info(f"[RELATED] URL: {base_url}")
             
-            # 드라이버 풀에서 드라이버 가져오기 (새 탭에서 실행)
-            pool = get_driver_pool()
+            # 드라이버 풀(또는 SCRAPER_DRIVER_MODE=tabs 인 경우 탭 풀)에서 드라이버 가져오기
+            pool = get_page_pool()
             
             with pool.get_driver(base_url) as driver_wrapper:
                 driver = driver_wrapper.driver
                 
                 self.logger.info("[RELATED] Driver obtained from pool. Page loaded.")
                 
-                # 페이지가 완전히 로드될 때까지 대기
-                time.sleep(1)
-                
-                # 연관검색어는 약간만 스크롤 (2회)
-                self.logger.info("[RELATED] Scrolling to load related keywords...")
+                # 연관검색어가 나타날 때까지 대기 (없으면 약간만 스크롤, 2회)
+                self.logger.info("[RELATED] Waiting for related keywords...")
                 try:
-                    driver_wrapper.scroll_down(nloop=2, scroll_increment=300)
-                    time.sleep(0.5)  # 스크롤 후 로딩 대기
+                    self._wait_for_keywords(driver, RELATED_SELECTOR, nloop=2, key='related')
                 except Exception as e:
                     self.logger.warning(f"[RELATED] Error during scroll: {e}, continuing anyway...")
                 
@@ -372,8 +406,8 @@ class Scraper:
                 if not html_content or len(html_content) < 100:
                     raise ScraperException("[RELATED] Page source is empty or too short")
                 
-                soup = BeautifulSoup(html_content, 'html.parser')
-                self.logger.info("[RELATED] Page content parsed with BeautifulSoup")
+                soup = parse_html(html_content)
+                self.logger.info("[RELATED] Page content parsed")
 
                 # 연관검색어 추출
                 ul = soup.find('ul', class_='lst_related_srch _list_box')
@@ -442,22 +476,18 @@ class Scraper:
             self.logger.info(f"[POPULAR] Starting Selenium scrape for keyword: {query}")
             self.logger.info(f"[POPULAR] URL: {base_url}")
             
-            # 드라이버 풀에서 드라이버 가져오기 (새 탭에서 실행)
-            pool = get_driver_pool()
+            # 드라이버 풀(또는 SCRAPER_DRIVER_MODE=tabs 인 경우 탭 풀)에서 드라이버 가져오기
+            pool = get_page_pool()
             
             with pool.get_driver(base_url) as driver_wrapper:
                 driver = driver_wrapper.driver
                 
                 self.logger.info("[POPULAR] Driver obtained from pool. Page loaded.")
                 
-                # 페이지가 완전히 로드될 때까지 대기
-                time.sleep(1)
-                
-                # 인기주제도 약간 스크롤 (1회)
-                self.logger.info("[POPULAR] Scrolling to load popular keywords...")
+                # 인기주제가 나타날 때까지 대기 (없으면 약간 스크롤, 1회)
+                self.logger.info("[POPULAR] Waiting for popular keywords...")
                 try:
-                    driver_wrapper.scroll_down(nloop=1, scroll_increment=300)
-                    time.sleep(0.5)  # 스크롤 후 로딩 대기
+                    self._wait_for_keywords(driver, POPULAR_SELECTOR, nloop=1, key='popular')
                 except Exception as e:
                     self.logger.warning(f"[POPULAR] Error during scroll: {e}, continuing anyway...")
                 
@@ -467,11 +497,11 @@ class Scraper:
                 if not html_content or len(html_content) < 100:
                     raise ScraperException("[POPULAR] Page source is empty or too short")
                 
-                soup = BeautifulSoup(html_content, 'html.parser')
-                self.logger.info("[POPULAR] Page content parsed with BeautifulSoup")
+                soup = parse_html(html_content)
+                self.logger.info("[POPULAR] Page content parsed")
 
                 # 인기주제 키워드 추출
-                keyword_spans = soup.select('span.fds-comps-keyword-chip-text')
+                keyword_spans = soup.select(POPULAR_SELECTOR)
                 
                 if not keyword_spans:
                     self.logger.warning(f"[POPULAR] No popular keywords found for: {query}")
@@ -534,17 +564,14 @@ class Scraper:
             self.logger.info(f"[TOGETHER] Starting Selenium scrape for keyword: {query}")
             self.logger.info(f"[TOGETHER] URL: {base_url}")
             
-            # 드라이버 풀에서 드라이버 가져오기 (새 탭에서 실행)
-            pool = get_driver_pool()
+            # 드라이버 풀(또는 SCRAPER_DRIVER_MODE=tabs 인 경우 탭 풀)에서 드라이버 가져오기
+            pool = get_page_pool()
             
             with pool.get_driver(base_url) as driver_wrapper:
                 driver = driver_wrapper.driver
                 
                 self.logger.info("[TOGETHER] Driver obtained from pool. Page loaded.")
                 
-                # 페이지가 완전히 로드될 때까지 대기
-                time.sleep(1)
-                
                 # 현재 페이지 정보 로깅
                 try:
                     page_title = driver.title
@@ -557,8 +584,7 @@ class Scraper:
                 # 함께찾은 키워드가 페이지 하단에 있는 경우까지 동적 콘텐츠 로드
                 self.logger.info("[TOGETHER] Start scrolling deeper...")
                 try:
-                    driver_wrapper.scroll_down(nloop=6)  # 기존보다 약 2배 더 아래로 스크롤
-                    time.sleep(1)  # 페이지 로딩이 완전히 끝날 때까지 대기
+                    self._scroll_to_bottom_section(driver, nloop=6, key='together')
                 except Exception as e:
                     self.logger.warning(f"[TOGETHER] Error during scroll: {e}, continuing anyway...")
                 
@@ -568,11 +594,11 @@ class Scraper:
                 if not html_content or len(html_content) < 100:
                     raise ScraperException("[TOGETHER] Page source is empty or too short")
                 
-                soup = BeautifulSoup(html_content, 'html.parser')
-                self.logger.info("[TOGETHER] Page content parsed with BeautifulSoup")
+                soup = parse_html(html_content)
+                self.logger.info("[TOGETHER] Page content parsed")
 
                 # 새로운 HTML 구조에서 키워드 추출
-                keyword_spans = soup.select('span.sds-comps-ellipsis-content')
+                keyword_spans = soup.select(TOGETHER_SELECTOR)
                 self.logger.info(f"[TOGETHER] Found {len(keyword_spans)} keyword spans")
                 
                 if not keyword_spans:
@@ -11,7 +11,12 @@ import os
 import traceback
 import logging
 
+from resource_blocking import blocked_urls, resolve_profile
+from waits import wait_for_idle
+
 CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH', '/usr/local/bin/chromedriver')
+# 네트워크 단계 리소스 차단 프로필 (resource_blocking.py)
+BLOCK_PROFILE = resolve_profile(os.environ.get('RESOURCE_BLOCK_PROFILE', 'naver'))
 
 
 def _chrome_service() -> Service:
@@ -27,8 +32,10 @@ class SeleniumDriver:
     SCRIPT_TIMEOUT = int(os.environ.get('SELENIUM_SCRIPT_TIMEOUT', '5'))
     # 명시적 페이지 준비 대기 시간 (초)
     DOCUMENT_READY_TIMEOUT = float(os.environ.get('SELENIUM_DOCUMENT_READY_TIMEOUT', '10'))
-    # URL 전환 후 동적 DOM이 채워질 최소 대기 시간 (초)
+    # URL 전환 후 동적 DOM이 채워질 때까지 기다리는 최대 시간 (초, DOM/요청이 멈추면 바로 진행)
     PAGE_STABILIZE_DELAY = float(os.environ.get('SELENIUM_PAGE_STABILIZE_DELAY', '2.0'))
+    # DOM 변경과 요청이 이 시간(초) 동안 없으면 페이지가 안정된 것으로 판단
+    PAGE_IDLE_QUIET = float(os.environ.get('SELENIUM_PAGE_IDLE_QUIET', '0.3'))
     # URL 로드 실패 시 드라이버 재시작 후 재시도 횟수
     NAVIGATION_RETRIES = int(os.environ.get('SELENIUM_NAVIGATION_RETRIES', '2'))
     NAVIGATION_RETRY_DELAY = float(os.environ.get('SELENIUM_NAVIGATION_RETRY_DELAY', '1.0'))
@@ -193,13 +200,7 @@ class SeleniumDriver:
             self.driver.execute_cdp_cmd("Page.enable", {})
             self.driver.execute_cdp_cmd("DOM.enable", {})
             self.driver.execute_cdp_cmd("Network.enable", {})
-            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {
-                "urls": [
-                    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
-                    "*.ico", "*.woff", "*.woff2", "*.ttf", "*.otf",
-                    "*.mp4", "*.webm", "*.avi", "*.mov"
-                ]
-            })
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls(BLOCK_PROFILE)})
             self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
                 "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
             })
@@ -231,7 +232,9 @@ class SeleniumDriver:
                     self._stop_loading()
 
                 self._wait_for_document_ready(url)
-                time.sleep(self.PAGE_STABILIZE_DELAY)
+                wait_for_idle(
+                    self.driver, quiet=self.PAGE_IDLE_QUIET, timeout=self.PAGE_STABILIZE_DELAY, key='page_stabilize'
+                )
                 self._stop_loading()
                 self._validate_page_source(url)
                 self.logger.info("[SELENIUM] Target URL loaded successfully")
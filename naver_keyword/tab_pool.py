@@ -0,0 +1,395 @@
+"""
+단일 Chrome 인스턴스의 여러 탭으로 동시에 스크래핑하는 탭 풀 (DrissionPage)
+SCRAPER_DRIVER_MODE=tabs 일 때 SeleniumDriverPool 대신 사용한다.
+
+요청마다 브라우저 하나를 점유하는 대신 브라우저 하나에 SCRAPER_TABS_PER_BROWSER 개의 탭을 열어
+각 탭에서 키워드 하나씩 병렬로 처리한다. 브라우저 프로세스/GPU/네트워크 서비스를 공유하므로
+같은 메모리로 더 많은 요청을 동시에 처리할 수 있다.
+
+- 탭마다 독립된 timeout (SCRAPER_TAB_TIMEOUT): 초과 시 해당 탭만 닫고 새 탭으로 교체
+- 탭 격리: 탭마다 별도 브라우저 컨텍스트(쿠키/스토리지)를 사용 (지원하지 않는 버전은 일반 탭)
+- 브라우저가 죽으면 다음 대여 시 재시작
+- 탭마다 SeleniumDriver 와 같은 리소스 차단 프로필 적용 (RESOURCE_BLOCK_PROFILE, 기본 naver)
+"""
+import os
+import queue
+import shutil
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from resource_blocking import blocked_urls
+from selenium_driver import BLOCK_PROFILE
+
+# 드라이버 방식 (selenium: 요청마다 브라우저 하나, tabs: 브라우저 하나에 여러 탭)
+DRIVER_MODE = os.environ.get('SCRAPER_DRIVER_MODE', 'selenium')
+# 브라우저 하나에서 동시에 사용하는 탭 수
+TABS_PER_BROWSER = int(os.environ.get('SCRAPER_TABS_PER_BROWSER', '4'))
+# 탭 하나가 요청 하나를 처리할 수 있는 최대 시간 (초)
+TAB_TIMEOUT = float(os.environ.get('SCRAPER_TAB_TIMEOUT', '120'))
+# 페이지 로드 타임아웃 (초)
+TAB_PAGE_LOAD_TIMEOUT = float(os.environ.get('SCRAPER_TAB_PAGE_LOAD_TIMEOUT', '30'))
+# 유휴 탭을 기다리는 최대 시간 (초)
+TAB_CHECKOUT_TIMEOUT = float(os.environ.get('SCRAPER_TAB_CHECKOUT_TIMEOUT', '300'))
+# 브라우저를 재시작하기 전 최대 처리 요청 수 (모든 탭이 반납된 시점에 재시작)
+BROWSER_MAX_USES = int(os.environ.get('SCRAPER_BROWSER_MAX_USES', '1000'))
+
+_CHROME_PATHS = [
+    "/usr/bin/google-chrome",
+    "/usr/bin/google-chrome-stable",
+    "/usr/bin/chromium-browser",
+    "/usr/bin/chromium",
+]
+
+
+class TabTimeoutError(TimeoutError):
+    """탭 하나의 처리 시간이 SCRAPER_TAB_TIMEOUT 을 넘은 경우"""
+    pass
+
+
+class TabDriver:
+    """DrissionPage 탭을 SeleniumDriver와 같은 방식으로 사용하기 위한 래퍼
+
+    스크래퍼가 사용하는 driver_wrapper.scroll_down(), get_page_source(), driver.execute_script() 등을 제공하며,
+    모든 호출에서 탭별 deadline을 확인한다. 호출 하나가 멈춰 돌아오지 않으면 확인할 기회가 없으므로
+    deadline 이 지나면 watchdog 이 탭을 닫아 진행 중인 호출을 끊는다.
+    """
+
+    def __init__(self, tab, deadline: float):
+        self.tab = tab
+        self.deadline = deadline
+        self.timeout = max(0.0, deadline - time.monotonic())
+        self.logger = logging.getLogger('uvicorn')
+        self.expired = False
+        self._closed = False
+        self._lock = threading.Lock()
+        self._watchdog = threading.Timer(self.timeout, self._expire)
+        self._watchdog.daemon = True
+        self._watchdog.start()
+
+    def _expire(self):
+        with self._lock:
+            if self._closed:
+                return
+            self.expired = True
+        self.logger.warning(f"[TABS] Tab {self.tab.tab_id} exceeded {self.timeout:.1f}s timeout, closing it")
+        try:
+            self.tab.close()
+        except Exception as e:
+            self.logger.debug(f"[TABS] Error closing expired tab: {e}")
+
+    def close(self):
+        """watchdog 중지 (탭 반납 전에 호출, 이후 expired 는 바뀌지 않음)"""
+        with self._lock:
+            self._closed = True
+        self._watchdog.cancel()
+
+    @property
+    def driver(self) -> 'TabDriver':
+        # 스크래퍼의 driver_wrapper.driver 접근과 호환
+        return self
+
+    def remaining(self) -> float:
+        remaining = self.deadline - time.monotonic()
+        if self.expired or remaining <= 0:
+            raise TabTimeoutError(f"Tab exceeded {self.timeout:.1f}s timeout")
+        return remaining
+
+    @property
+    def title(self) -> str:
+        self.remaining()
+        return self.tab.title
+
+    @property
+    def current_url(self) -> str:
+        self.remaining()
+        return self.tab.url
+
+    @property
+    def current_window_handle(self) -> str:
+        return self.tab.tab_id
+
+    def get(self, url: str):
+        timeout = min(TAB_PAGE_LOAD_TIMEOUT, self.remaining())
+        if not self.tab.get(url, timeout=timeout, retry=0):
+            raise TabTimeoutError(f"Failed to load {url} within {timeout:.1f}s")
+
+    def execute_script(self, script: str, *args):
+        return self.tab.run_js(script, *args, timeout=self.remaining())
+
+    def add_cookie(self, cookie: dict):
+        self.remaining()
+        self.tab.set.cookies(cookie)
+
+    def sleep(self, seconds: float):
+        """deadline을 넘기지 않는 범위에서 대기"""
+        time.sleep(min(seconds, self.remaining()))
+
+    def scroll_down(self, nloop: int = 1, scroll_increment: int = 300, delay: float = 1.0):
+        for _ in range(nloop):
+            self.execute_script(f"window.scrollBy(0, {scroll_increment});")
+            self.sleep(delay)
+
+    def get_page_source(self) -> str:
+        self.remaining()
+        return self.tab.html
+
+
+class ChromiumTabPool:
+    """브라우저 하나의 탭들을 대여/반납하는 풀"""
+
+    def __init__(self, tab_count: int = TABS_PER_BROWSER):
+        self.logger = logging.getLogger('uvicorn')
+        self.tab_count = max(tab_count, 1)
+        self._browser = None
+        self._browser_uses = 0
+        # 브라우저 재시작 세대 (이전 브라우저의 탭은 반납 시 폐기)
+        self._generation = 0
+        # 브라우저 생성/재시작 동기화
+        self._lock = threading.Lock()
+        # 탭 수만큼만 동시에 대여
+        self._slots = threading.BoundedSemaphore(self.tab_count)
+        self._idle: 'queue.Queue' = queue.Queue()
+        self._in_use = 0
+        self._draining = False
+        self._drained = threading.Condition(self._lock)
+
+        self._stats = {
+            'total_requests': 0,
+            'browser_restarts': 0,
+            'tabs_created': 0,
+            'tab_timeouts': 0,
+            'tab_errors': 0,
+            'checkout_timeouts': 0,
+        }
+        self._stats_lock = threading.Lock()
+
+        self.logger.info(f"[TABS] Chromium tab pool initialized (tabs per browser: {self.tab_count})")
+
+    def _start_browser(self):
+        """브라우저 시작 (self._lock 보유 상태에서 호출)"""
+        from DrissionPage import ChromiumOptions, ChromiumPage
+
+        co = ChromiumOptions()
+        co.headless(True)
+        co.auto_port(True)
+        chrome_path = next((path for path in _CHROME_PATHS if os.path.isfile(path)), None) or shutil.which('google-chrome')
+        if chrome_path:
+            co.set_browser_path(chrome_path)
+        for arg in (
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-gpu',
+            '--window-size=1920,1080',
+            '--mute-audio',
+            '--disable-notifications',
+            '--disable-extensions',
+            '--blink-settings=imagesEnabled=false',
+            # 백그라운드 탭도 포그라운드와 같은 속도로 동작하도록 설정
+            '--disable-renderer-backgrounding',
+            '--disable-background-timer-throttling',
+            '--disable-backgrounding-occluded-windows',
+        ):
+            co.set_argument(arg)
+        co.set_user_agent(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+        )
+        co.set_pref("profile.managed_default_content_settings.images", 2)
+        co.set_load_mode('eager')
+
+        self._browser = ChromiumPage(co)
+        self._browser.set.timeouts(base=10, page_load=TAB_PAGE_LOAD_TIMEOUT)
+        self._browser_uses = 0
+        self._generation += 1
+        with self._stats_lock:
+            self._stats['browser_restarts'] += 1
+        self.logger.info(f"[TABS] Browser started (chrome: {chrome_path or 'default'})")
+
+    def _quit_browser(self):
+        """브라우저 종료 (self._lock 보유 상태에서 호출)"""
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        if self._browser is not None:
+            try:
+                self._browser.quit()
+            except Exception as e:
+                self.logger.warning(f"[TABS] Error quitting browser: {e}")
+            self._browser = None
+
+    def _browser_alive(self) -> bool:
+        if self._browser is None:
+            return False
+        try:
+            return bool(self._browser.states.is_alive)
+        except Exception:
+            return False
+
+    def _new_tab(self):
+        """새 격리 탭 생성 (self._lock 보유 상태에서 호출)"""
+        try:
+            tab = self._browser.new_tab(new_context=True)
+        except TypeError:
+            # new_context 를 지원하지 않는 DrissionPage 버전
+            tab = self._browser.new_tab()
+        with self._stats_lock:
+            self._stats['tabs_created'] += 1
+        return tab
+
+    def _acquire_tab(self) -> Tuple[object, int]:
+        with self._lock:
+            # 브라우저 재시작 대기 중이면 진행 중인 탭이 모두 반납될 때까지 대기
+            while self._draining:
+                self._drained.wait()
+            if not self._browser_alive():
+                if self._browser is not None:
+                    self.logger.warning("[TABS] Browser is not alive, restarting")
+                self._quit_browser()
+                self._start_browser()
+            try:
+                tab = self._idle.get_nowait()
+            except queue.Empty:
+                tab = self._new_tab()
+            self._in_use += 1
+            self._browser_uses += 1
+            return tab, self._generation
+
+    def _release_tab(self, tab, generation: int, healthy: bool):
+        with self._lock:
+            self._in_use -= 1
+            if healthy and generation == self._generation:
+                self._idle.put(tab)
+            else:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+
+            if self._browser_uses >= BROWSER_MAX_USES:
+                self._draining = True
+            if self._draining and self._in_use == 0:
+                self.logger.info(f"[TABS] Browser served {self._browser_uses} requests, restarting")
+                self._quit_browser()
+                self._draining = False
+                self._drained.notify_all()
+
+    def prewarm(self):
+        """브라우저를 미리 시작 (앱 시작 시 호출)"""
+        threading.Thread(target=self._prewarm, name="tab_pool_prewarm", daemon=True).start()
+
+    def _prewarm(self):
+        try:
+            with self._lock:
+                if not self._browser_alive():
+                    self._start_browser()
+                for _ in range(self.tab_count - self._idle.qsize()):
+                    self._idle.put(self._new_tab())
+        except Exception as e:
+            self.logger.warning(f"[TABS] Prewarm failed, browser will be started on first use: {e}")
+
+    @contextmanager
+    def get_driver(self, url: str, timeout: float = TAB_TIMEOUT):
+        """탭을 대여하여 URL을 로드하고 TabDriver로 제공 (SeleniumDriverPool.get_driver와 같은 사용법)
+
+        Raises:
+            TabTimeoutError: 유휴 탭 대기 또는 탭 처리 시간이 timeout을 넘은 경우
+        """
+        if not self._slots.acquire(timeout=TAB_CHECKOUT_TIMEOUT):
+            with self._stats_lock:
+                self._stats['checkout_timeouts'] += 1
+            raise TabTimeoutError(f"No idle tab available within {TAB_CHECKOUT_TIMEOUT}s")
+
+        tab = None
+        driver = None
+        generation = 0
+        healthy = True
+        try:
+            tab, generation = self._acquire_tab()
+            with self._stats_lock:
+                self._stats['total_requests'] += 1
+
+            tab.run_cdp('Network.enable')
+            tab.run_cdp('Network.setBlockedURLs', urls=blocked_urls(BLOCK_PROFILE))
+            driver = TabDriver(tab, time.monotonic() + timeout)
+            self.logger.info(f"[TABS] Loading URL in tab {driver.current_window_handle}: {url}")
+            driver.get(url)
+            yield driver
+            # 스크래퍼가 끊긴 호출의 예외를 처리하고 정상 종료했더라도 탭은 이미 닫힘
+            if driver.expired:
+                raise TabTimeoutError(f"Tab exceeded {driver.timeout:.1f}s timeout")
+
+        except TabTimeoutError as e:
+            healthy = False
+            with self._stats_lock:
+                self._stats['tab_timeouts'] += 1
+            self.logger.warning(f"[TABS] Tab timed out: {e}")
+            raise
+
+        except Exception as e:
+            healthy = False
+            with self._stats_lock:
+                self._stats['tab_errors'] += 1
+            self.logger.error(f"[TABS] Error using tab: {e}")
+            raise
+
+        finally:
+            try:
+                if driver is not None:
+                    driver.close()
+                    healthy = healthy and not driver.expired
+                if tab is not None:
+                    if healthy:
+                        try:
+                            # 다음 요청을 위해 가볍게 초기화
+                            tab.get('about:blank', timeout=5, retry=0)
+                        except Exception as e:
+                            self.logger.warning(f"[TABS] Error resetting tab: {e}")
+                            healthy = False
+                    self._release_tab(tab, generation, healthy)
+            finally:
+                self._slots.release()
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            stats = self._stats.copy()
+        stats['mode'] = 'tabs'
+        stats['tabs_per_browser'] = self.tab_count
+        stats['in_use'] = self._in_use
+        stats['idle_tabs'] = self._idle.qsize()
+        stats['browser_alive'] = self._browser_alive()
+        stats['browser_uses'] = self._browser_uses
+        return stats
+
+    def cleanup_all(self):
+        self.logger.info("[TABS] Cleaning up browser")
+        with self._lock:
+            self._quit_browser()
+
+
+_tab_pool: Optional[ChromiumTabPool] = None
+_tab_pool_lock = threading.Lock()
+
+
+def get_tab_pool() -> ChromiumTabPool:
+    """전역 탭 풀 인스턴스 반환"""
+    global _tab_pool
+    with _tab_pool_lock:
+        if _tab_pool is None:
+            _tab_pool = ChromiumTabPool()
+    return _tab_pool
+
+
+def cleanup_tab_pool():
+    """전역 탭 풀 정리"""
+    if _tab_pool is not None:
+        _tab_pool.cleanup_all()
+
+
+def get_page_pool():
+    """SCRAPER_DRIVER_MODE에 맞는 풀 반환 (get_driver(url) 컨텍스트 매니저 제공)"""
+    if DRIVER_MODE == 'tabs':
+        return get_tab_pool()
+    from selenium_pool import get_driver_pool
+    return get_driver_pool()
@@ -0,0 +1,159 @@
+"""
+HTTP 요청 재시도 엔진
+예외가 나면 같은 함수를 지연 없이 재귀 호출하던 방식을 대신해, 재시도 횟수와 간격을 제한한다.
+
+- 최대 시도 횟수 제한 (RETRY_MAX_ATTEMPTS)
+- 지터(full jitter)를 준 지수 백오프, 429/503 의 Retry-After 헤더 우선
+- 호스트별 재시도 예산: RETRY_BUDGET_WINDOW 초 동안 RETRY_BUDGET_PER_HOST 회를 넘으면 재시도하지 않고 바로 실패
+  (차단/장애 상황에서 모든 요청이 재시도를 반복해 부하를 키우지 않도록)
+- 호스트별 요청/재시도/실패 횟수 통계
+
+요청 함수는 status_code 와 headers 를 가진 응답 객체(requests/httpx)를 반환하면 된다.
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Type
+
+RETRY_MAX_ATTEMPTS = int(os.environ.get('RETRY_MAX_ATTEMPTS', '4'))
+RETRY_BASE_DELAY = float(os.environ.get('RETRY_BASE_DELAY', '0.5'))
+RETRY_MAX_DELAY = float(os.environ.get('RETRY_MAX_DELAY', '8'))
+RETRY_BUDGET_PER_HOST = int(os.environ.get('RETRY_BUDGET_PER_HOST', '30'))
+RETRY_BUDGET_WINDOW = float(os.environ.get('RETRY_BUDGET_WINDOW', '60'))
+# 재시도해도 되는 상태 코드 (일시적 차단/서버 오류)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _retry_after(response: Any) -> Optional[float]:
+    """Retry-After 헤더(초 단위)가 있으면 반환"""
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RetryEngine:
+    """호스트별 예산을 공유하는 재시도 엔진 (스레드/이벤트 루프 모두에서 사용)"""
+
+    def __init__(self, max_attempts: int = RETRY_MAX_ATTEMPTS, base_delay: float = RETRY_BASE_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY, budget_per_host: int = RETRY_BUDGET_PER_HOST,
+                 budget_window: float = RETRY_BUDGET_WINDOW):
+        self.logger = logging.getLogger('uvicorn')
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_per_host = budget_per_host
+        self.budget_window = budget_window
+        self._lock = threading.Lock()
+        self._retry_times: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _host_stats(self, host: str) -> Dict[str, int]:
+        return self._stats.setdefault(host, {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'budget_denied': 0,
+        })
+
+    def _count(self, host: str, key: str):
+        with self._lock:
+            self._host_stats(host)[key] += 1
+
+    def _take_budget(self, host: str) -> bool:
+        """재시도 예산이 남아 있으면 하나 사용하고 True"""
+        now = time.monotonic()
+        with self._lock:
+            retry_times = self._retry_times.setdefault(host, deque())
+            while retry_times and now - retry_times[0] > self.budget_window:
+                retry_times.popleft()
+            if len(retry_times) >= self.budget_per_host:
+                self._host_stats(host)['budget_denied'] += 1
+                return False
+            retry_times.append(now)
+            self._host_stats(host)['retries'] += 1
+            return True
+
+    def _delay(self, attempt: int, response: Any = None) -> float:
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, backoff)
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _next_delay(self, host: str, attempt: int, response: Any = None,
+                    error: Optional[BaseException] = None) -> Optional[float]:
+        """재시도할 경우 대기 시간, 재시도하지 않으면 None"""
+        if attempt + 1 >= self.max_attempts or not self._take_budget(host):
+            self._count(host, 'failures')
+            return None
+        reason = error if error is not None else f"status {response.status_code}"
+        delay = self._delay(attempt, response)
+        self.logger.warning(f"[RETRY] {host} attempt {attempt + 1} failed ({reason}), retrying in {delay:.2f}s")
+        return delay
+
+    def call(self, host: str, func: Callable[[], Any],
+             retry_on: Tuple[Type[BaseException], ...] = (Exception,)) -> Any:
+        """func() 를 실행하고 retry_on 예외 또는 재시도 대상 상태 코드면 백오프 후 재시도
+
+        재시도가 끝나면 마지막 응답을 반환하거나 마지막 예외를 다시 발생시킨다.
+        """
+        self._count(host, 'requests')
+        attempt = 0
+        while True:
+            try:
+                response = func()
+            except retry_on as e:
+                delay = self._next_delay(host, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = self._next_delay(host, attempt, response=response)
+                if delay is None:
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, host: str, func: Callable[[], Awaitable[Any]],
+                         retry_on: Tuple[Type[BaseException], ...] = (Exception,)) -> Any:
+        """call() 의 비동기 버전 (func 는 코루틴을 반환하는 함수)"""
+        self._count(host, 'requests')
+        attempt = 0
+        while True:
+            try:
+                response = await func()
+            except retry_on as e:
+                delay = self._next_delay(host, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = self._next_delay(host, attempt, response=response)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    **stats,
+                    'budget_used': sum(1 for t in self._retry_times.get(host, ()) if now - t <= self.budget_window),
+                }
+                for host, stats in self._stats.items()
+            }
+
+
+retry_engine = RetryEngine()
@@ -1,5 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from crawler import Crawler
+from innertube_config import bootstrap_cache
+from retry import retry_engine
+from streaming import iterate_in_thread, keyword_events, negotiate, stream_response
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 
@@ -30,8 +33,20 @@ def shorts_task(keyword:str, limit:int):
             result.append(data)
     return result
 
+async def shorts_stream(keywords:str, limit:int):
+    """shorts_task 의 스트리밍 버전 (키워드를 순서대로 검색하며 결과를 만들어지는 대로 이벤트로 반환)"""
+    for keyword in keywords.split(','):
+        crawler = Crawler()
+        items = iterate_in_thread(executor, crawler.get_info_by_keyword, keyword, limit, 0.2)
+        async for event in keyword_events(keyword, items):
+            yield event
+
 @app.get("/search/shorts")
-async def search_youtube(keywords: str, limit:int=150):
+async def search_youtube(request: Request, keywords: str, limit:int=150):
+    """Accept: application/x-ndjson 또는 text/event-stream 이면 결과를 하나씩 스트리밍 (streaming.py 참고)"""
+    media_type = negotiate(request)
+    if media_type is not None:
+        return stream_response(media_type, shorts_stream(keywords, limit))
     loop = asyncio.get_event_loop()
     try:
         result = await loop.run_in_executor(executor, shorts_task, keywords, limit)
@@ -39,4 +54,10 @@ async def search_youtube(keywords: str, limit:int=150):
     except Exception as e:
         print(f'Error: {e}')
         return {'error':str(e)}
-    
\ No newline at end of file
+
+@app.get("/stats")
+async def get_stats():
+    return {
+        'bootstrap': bootstrap_cache.get_stats(),
+        'retries': retry_engine.get_stats(),
+    }
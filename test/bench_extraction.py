@@ -0,0 +1,59 @@
+"""
+검색 결과 추출 벤치마크
+page_sources 에 저장한 페이지로 기존 방식(페이지 전체 소스를 받아 파싱)과 페이지 안 추출 방식(필드만 JSON 으로 받음)의
+전송 크기와 Python 처리 시간을 비교한다. 페이지 안 추출 결과(JSON)는 같은 명세를 HTML 에 적용해서 만든다
+(dyoutube/extraction.py extract_from_html, 페이지 안 스크립트와 결과가 같음).
+
+    python bench_extraction.py [반복 횟수]
+"""
+import glob
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'dyoutube'))
+
+from extraction import extract_from_page_source  # noqa: E402
+from scraper import RESULT_SPEC, Scraper  # noqa: E402
+
+REPEAT = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+
+def best_time(func):
+    """REPEAT 회 중 가장 빠른 시간(초)과 결과"""
+    best, result = None, None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+scraper = Scraper()
+totals = {'page_bytes': 0, 'json_bytes': 0, 'page_time': 0.0, 'json_time': 0.0}
+
+print(f"{'file':<30}{'page_source':>14}{'records':>12}{'parse':>12}{'json':>12}{'items':>8}")
+for path in sorted(glob.glob(os.path.join(ROOT, 'page_sources', '*'))):
+    with open(path, encoding='utf-8') as file:
+        html = file.read()
+
+    page_time, records = best_time(lambda: extract_from_page_source(html, RESULT_SPEC))
+    payload = json.dumps(records, ensure_ascii=False)
+    json_time, _ = best_time(lambda: json.loads(payload))
+    items = len(scraper._parse_items(records, len(records)))
+
+    page_bytes, json_bytes = len(html.encode()), len(payload.encode())
+    totals['page_bytes'] += page_bytes
+    totals['json_bytes'] += json_bytes
+    totals['page_time'] += page_time
+    totals['json_time'] += json_time
+    print(f"{os.path.basename(path)[:28]:<30}{page_bytes // 1024:>12}KB{json_bytes // 1024:>10}KB"
+          f"{page_time * 1000:>10.1f}ms{json_time * 1000:>10.2f}ms{items:>8}")
+
+print(f"{'total':<30}{totals['page_bytes'] // 1024:>12}KB{totals['json_bytes'] // 1024:>10}KB"
+      f"{totals['page_time'] * 1000:>10.1f}ms{totals['json_time'] * 1000:>10.2f}ms")
+print(f"{'reduction':<30}{totals['page_bytes'] / max(totals['json_bytes'], 1):>13.0f}x{'':>12}"
+      f"{totals['page_time'] / max(totals['json_time'], 1e-9):>11.0f}x")
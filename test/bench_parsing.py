@@ -0,0 +1,72 @@
+"""
+HTML 파서 벤치마크
+page_sources 에 저장한 페이지를 파서별로 파싱하고 검색 결과 아이템을 선택하는 시간을 비교한다.
+스크래퍼와 같은 파싱 레이어(dyoutube/parsing.py)를 사용하고, 파서마다 찾은 아이템 수가 같은지도 확인한다.
+
+    python bench_parsing.py [반복 횟수]
+"""
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'dyoutube'))
+
+from parsing import LexborHTMLParser, parse_html  # noqa: E402
+
+# dyoutube/scraper.py RESULT_SELECTOR 와 같음
+RESULT_SELECTOR = "ytd-video-renderer, ytd-reel-item-renderer, ytm-shorts-lockup-view-model"
+PARSERS = ['html.parser', 'lxml', 'selectolax']
+REPEAT = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+
+def available(parser: str) -> bool:
+    if parser == 'selectolax':
+        return LexborHTMLParser is not None
+    if parser == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+def measure(html: str, parser: str):
+    """REPEAT 회 중 가장 빠른 시간(초)과 아이템 수"""
+    best = None
+    count = 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        soup = parse_html(html, parser)
+        items = soup.select(RESULT_SELECTOR)
+        titles = [item.get_text(' ', strip=True) for item in items]
+        elapsed = time.perf_counter() - start
+        count = len(titles)
+        best = elapsed if best is None else min(best, elapsed)
+        soup.decompose()
+    return best, count
+
+
+parsers = [parser for parser in PARSERS if available(parser)]
+totals = {parser: 0.0 for parser in parsers}
+
+print(f"{'file':<30}{'size':>10}" + ''.join(f"{parser:>16}" for parser in parsers) + f"{'items':>8}")
+for path in sorted(glob.glob(os.path.join(ROOT, 'page_sources', '*'))):
+    with open(path, encoding='utf-8') as file:
+        html = file.read()
+
+    row = f"{os.path.basename(path)[:28]:<30}{len(html) // 1024:>8}KB"
+    counts = set()
+    for parser in parsers:
+        elapsed, count = measure(html, parser)
+        totals[parser] += elapsed
+        counts.add(count)
+        row += f"{elapsed * 1000:>14.1f}ms"
+    # 파서마다 아이템 수가 다르면 표시
+    row += f"{'/'.join(str(count) for count in sorted(counts)):>8}"
+    print(row)
+
+baseline = totals['html.parser']
+print(f"{'total':<40}" + ''.join(f"{totals[parser] * 1000:>14.1f}ms" for parser in parsers))
+print(f"{'speedup vs html.parser':<40}" + ''.join(f"{baseline / totals[parser]:>15.1f}x" for parser in parsers))
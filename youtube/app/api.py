@@ -6,95 +6,52 @@ import traceback
 from bs4 import BeautifulSoup
 import logging
 
-class Scraper:
-    def __init__(self):
-        self.keyword = ""
+from innertube_config import build_detail_payload, invalidate_on_auth_failure, search_first_page
+from renderer import merge_missing, missing_fields, parse_reel_renderer, parse_video_renderer
+from retry import retry_engine
+
+YOUTUBE_HOST = "www.youtube.com"
+# 요청 하나의 최대 대기 시간 (초), 실패 시 재시도는 retry_engine 이 담당
+HTTP_TIMEOUT = 20
+
+
+class SearchContext:
+    """검색 한 번의 상태
+
+    Scraper 인스턴스는 상태를 갖지 않고 검색마다 SearchContext 를 새로 만들어 넘기므로,
+    하나의 Scraper 를 여러 스레드에서 동시에 사용할 수 있고 키워드 사이에 결과가 섞이지 않는다.
+    """
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.api_key = ""
+        self.context = {}
         self.click_tracking_params = ""
         self.continuation_command = ""
-        self.api_key = ""
-        self.post_json = {
-            "continuation": "",
-            "context": {},
-        }
         self.result = []
-        self.detail_json = {
-            "contentCheckOk": False,
-            "context": {},
-            # 넣기
-            "params": "",
-            "playbackContext": {
-                "contentPlaybackContext": {
-                    "autoCaptionsDefaultOn": False,
-                    "autonav": False,
-                    "autonavState": "STATE_NONE",
-                    "autoplay": True,
-                    # 넣기
-                    "currentUrl": "",
-                    "html5Preference": "HTML5_PREF_WANTS",
-                    "lactMilliseconds": "-1",
-                    # 넣기
-                    "referer": "",
-                    "signatureTimestamp": 19590,
-                    "splay": False,
-                    "vis": 5,
-                },
-                "watchAmbientModeContext": {
-                    "hasShownAmbientMode": True,
-                    "watchAmbientModeEnabled": True,
-                },
-            },
-            "racyCheckOk": False,
-            # 넣기
-            "videoId": "",
+
+    @property
+    def referer(self) -> str:
+        return f"https://www.youtube.com/results?search_query={self.keyword}"
+
+    @property
+    def post_json(self) -> dict:
+        return {
+            "continuation": self.continuation_command,
+            "context": self.context,
         }
+
+
+class Scraper:
+    def __init__(self):
         self.logger = logging.getLogger('uvicorn')
-    def _api_search_page(self, keyword: str):
-            self.detail_json["playbackContext"]["contentPlaybackContext"][
-                "referer"
-            ] = f"https://www.youtube.com/results?search_query={keyword}"
-            self.keyword = keyword
-            try:
-                res = requests.get(
-                    f"https://www.youtube.com/results?search_query={keyword}",
-                    headers={
-                        "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
-                        "accept-language": "ko-KR,ko;q=0.9",
-                        "content-type": "text/html; charset=utf-8",
-                    },
-                )
-
-                if res.status_code != 200:
-                    raise Exception("stauts code error")
-                
-                return res.content.decode("utf-8")
-            except:
-                # raise Exception("api 실패")
-                self._api_search_page(keyword=keyword)
-
-    def first_page_setting(self, keyword: str):
-        # first page api 요청
-        res = self._api_search_page(keyword=keyword)
-
-        # api key 가져오기
-        api_key_raw_start = res.find("INNERTUBE_API_KEY")
-        api_key_raw = res[api_key_raw_start : api_key_raw_start + 130]
-        startPoint = api_key_raw.find(":")
-        endPoint = api_key_raw.find(",")
-        self.api_key = api_key_raw[startPoint + 2 : endPoint - 1]
-
-        # 설정파일 만들기.
-        startPoint = res.find("INNERTUBE_CONTEXT") + 2 + len("INNERTUBE_CONTEXT")
-        endPoint = res.find("INNERTUBE_CONTEXT_CLIENT_NAME") - 2
-        config_data_raw = res[startPoint:endPoint]
-        config_data = json.loads(config_data_raw)
+
+    def first_page_setting(self, search: SearchContext):
+        # first page api 요청 (캐시된 api key / context 로 검색 결과 HTML 없이 search API 에 바로 요청)
+        config, context, initial_data_json = search_first_page(search.keyword)
+        search.api_key = config.api_key
         # context에 넣기
-        self.post_json["context"] = config_data
-        self.detail_json["context"] = config_data
-        # 결과 json으로 변형
-        initial_data = res.split("ytInitialData = ")[1]
-        splited = initial_data.split(";</script>")
-        initial_data_json_raw = splited[0]
-        initial_data_json = json.loads(initial_data_json_raw)
+        search.context = context
 
         # 다음 페이지 정보 가져오기
         try:
@@ -116,19 +73,16 @@ class Scraper:
             next_page_info_json = {}
 
         # 값 넣어주기
-        is_break = False
         try:
-            self.click_tracking_params = next_page_info_json[
+            search.click_tracking_params = next_page_info_json[
                 "continuationEndpoint"
             ]["clickTrackingParams"]
-            self.continuation_command = next_page_info_json["continuationEndpoint"][
+            search.continuation_command = next_page_info_json["continuationEndpoint"][
                 "continuationCommand"
             ]["token"]
-            self.post_json["continuation"] = self.continuation_command
         except:
-            self.click_tracking_params = ""
-            self.continuation_command = ""
-            is_break = True
+            search.click_tracking_params = ""
+            search.continuation_command = ""
 
         # 데이터 가공
         youtube_list_json = initial_data_json["contents"][
@@ -139,33 +93,50 @@ class Scraper:
             "contents"
         ]
         return youtube_list_json
-        # 유튜브 리스트 json 저장
-        # with open("youtube_list.json", 'w') as json_file:
-        #     json.dump(youtube_list_json, json_file, ensure_ascii=False, indent=4)
 
-    def scrape_page_list(self, page_list, limit:int):
+    def scrape_page_list(self, search: SearchContext, page_list, limit:int, mode:str='full', enrich:bool=False,
+                         on_result=None):
+        def add(kind, json_data):
+            record = self.get_result(search, json_data, kind, mode, enrich)
+            search.result.append(record)
+            # 스트리밍 응답은 결과가 만들어지는 대로 바로 전달
+            if on_result is not None:
+                on_result(record)
+
         for item in page_list:
             try:
-                if len(self.result) >= limit:
+                if len(search.result) >= limit:
                     break
                 if "videoRenderer" in item:
-                    self.result.append(self.get_video_detail(item))
+                    add("video", item)
                 elif "reelShelfRenderer" in item:
                     for short in item["reelShelfRenderer"]["items"]:
-                        if len(self.result) >= limit:
+                        if len(search.result) >= limit:
                             break
-                        self.result.append(self.get_reel_detail(short))
+                        add("shorts", short)
                 elif "reelItemRenderer" in item:
-                    self.result.append(self.get_reel_detail(item))
+                    add("shorts", item)
             except Exception as e:
                 print(f"예기치 못한 에러 \n 에러코드 : {sys.exc_info.__name__}", e)
                 traceback.print_exc()
                 self.logger.error(f"예기치 못한 에러 \n 에러코드 : {sys.exc_info.__name__}", traceback.print_exc())
                 continue
-        return self.result
+        return search.result
+
+    def get_result(self, search: SearchContext, json_data, kind:str, mode:str='full', enrich:bool=False):
+        """full 모드는 player 요청으로, fast 모드는 renderer 만으로 결과 생성 (enrich 시 누락 필드만 보강)"""
+        get_detail = self.get_video_detail if kind == "video" else self.get_reel_detail
+        if mode != 'fast':
+            return get_detail(search, json_data)
+        if kind == "video":
+            record = parse_video_renderer(json_data["videoRenderer"])
+        else:
+            record = parse_reel_renderer(json_data["reelItemRenderer"])
+        if enrich and missing_fields(record):
+            merge_missing(record, get_detail(search, json_data))
+        return record
 
-        
-    def get_video_detail(self, json_data):
+    def get_video_detail(self, search: SearchContext, json_data):
         video_id = ""
         title = ""
         description = ""
@@ -173,10 +144,10 @@ class Scraper:
         author = ""
         publish_date = ""
         try:
-            response = self.request_video_detail(json_data)
+            video_id = json_data["videoRenderer"]["videoId"]
+            response = self.request_video_detail(search, json_data)
             # with open("video_detail.json", 'w', encoding='utf-8') as json_file:
             #     json.dump(response, json_file, ensure_ascii=False, indent=4)
-            video_id = self.detail_json["videoId"]
             try:
                 title = response["videoDetails"]["title"]
                 description = response["videoDetails"]["shortDescription"]
@@ -204,7 +175,7 @@ class Scraper:
                 "publishDate"   : publish_date,
             }
 
-    def get_reel_detail(self, json_data):
+    def get_reel_detail(self, search: SearchContext, json_data):
         video_id = ""
         title = ""
         description = ""
@@ -212,8 +183,8 @@ class Scraper:
         author = ""
         publish_date = ""
         try:
-            response = self.request_shorts_detail(json_data)
-            video_id = self.detail_json["videoId"]
+            video_id = json_data["reelItemRenderer"]["videoId"]
+            response = self.request_shorts_detail(search, json_data)
             try:
                 title = response["videoDetails"]["title"]
                 description = response["videoDetails"]["shortDescription"]
@@ -242,103 +213,60 @@ class Scraper:
                 "author"      : author,
                 "publish_date": publish_date,
             }
-        
-    def _api_detail_page(self, key):
+
+    def _api_detail_page(self, key, detail_json):
         try:
-            session = requests.Session()
-            session.cookies.clear()
-            res = session.post(
+            res = retry_engine.call(YOUTUBE_HOST, lambda: requests.post(
                 f"https://www.youtube.com/youtubei/v1/player?key={key}&prettyPrint=false",
                 headers={
                     "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
                     "accept-language": "ko-KR,ko;q=0.9",
                     "content-type": "application/json; charset=UTF-8",
                 },
-                json=self.detail_json,
-            )
+                json=detail_json,
+                timeout=HTTP_TIMEOUT,
+            ), retry_on=(requests.RequestException,))
 
+            # api key / context 가 만료되었으면 다음 검색부터 새로 받아 사용
+            invalidate_on_auth_failure(key, res.status_code)
             if res.status_code != 200:
                 raise Exception("stauts code error")
 
             return json.loads(res.content)
         except:
             raise Exception("api 실패")
-    def request_video_detail(self, json_data):
-        self.detail_json["context"][
-            "clickTracking"][
-            "clickTrackingParams"
-            ] = json_data["videoRenderer"][
-            "navigationEndpoint"][
-            "clickTrackingParams"
-            ]
-        self.detail_json["videoId"] = json_data["videoRenderer"]["videoId"]
-        try:
-            self.detail_json["params"] = json_data["videoRenderer"][
-                "navigationEndpoint"][
-                "watchEndpoint"][
-                "playerParams"]
-        except:
-            self.detail_json["params"] = json_data["videoRenderer"][
-            "navigationEndpoint"][
-            "reelWatchEndpoint"][
-            "playerParams"]
-        
-        self.detail_json["playbackContext"][
-            "contentPlaybackContext"][
-            "currentUrl"
-        ] = json_data["videoRenderer"][
-            "navigationEndpoint"][
-            "commandMetadata"][
-            "webCommandMetadata"][
-            "url"
-        ]
-        response = self._api_detail_page(self.api_key)
-        return response
-    
-    def request_shorts_detail(self, json_data):
-        self.detail_json["context"]["clickTracking"][
-            "clickTrackingParams"
-        ] = json_data["reelItemRenderer"]["navigationEndpoint"][
-            "clickTrackingParams"
-        ]
-        self.detail_json["videoId"] = json_data["reelItemRenderer"]["videoId"]
 
-        try:
-            self.detail_json["params"] = json_data["reelItemRenderer"][
-                "navigationEndpoint"][
-                "reelWatchEndpoint"][
-                "playerParams"]
-        except:
-            self.detail_json["params"] = json_data["reelItemRenderer"][
-                "navigationEndpoint"][
-                "watchEndpoint"][
-                "playerParams"]
-
-        self.detail_json["playbackContext"]["contentPlaybackContext"][
-            "currentUrl"
-        ] = json_data["reelItemRenderer"]["navigationEndpoint"][
-            "commandMetadata"
-        ][
-            "webCommandMetadata"
-        ][
-            "url"
-        ]
+    def request_video_detail(self, search: SearchContext, json_data):
+        # 요청마다 독립된 player 요청 본문을 만들어 동시에 여러 검색이 진행되어도 서로 덮어쓰지 않음
+        detail_json = build_detail_payload(search.context, "video", json_data["videoRenderer"], search.referer)
+        return self._api_detail_page(search.api_key, detail_json)
 
-        self.detail_json["playbackContext"]["contentPlaybackContext"][
-            "referer"
-        ] = f"https://www.youtube.com/results?search_query={self.keyword}"
+    def request_shorts_detail(self, search: SearchContext, json_data):
+        detail_json = build_detail_payload(search.context, "shorts", json_data["reelItemRenderer"], search.referer)
+        return self._api_detail_page(search.api_key, detail_json)
 
-        response = self._api_detail_page(self.api_key)
-        return response
-    def _get_next_page(self):
+    def _get_next_page(self, search: SearchContext):
         # 다음 페이지 가져오기
-        initial_data_json = self._api_search_page_next(self.api_key)
         try:
-            self.click_tracking_params = initial_data_json[
+            initial_data_json = self._api_search_page_next(search.api_key, search.post_json)
+            # 데이터 가져오기
+            youtube_list_json = initial_data_json["onResponseReceivedCommands"][0][
+                "appendContinuationItemsAction"][
+                "continuationItems"][0][
+                "itemSectionRenderer"][
+                "contents"]
+        except Exception as e:
+            # 재시도 후에도 실패하면 지금까지의 결과만 반환
+            self.logger.error(f"keyword: {search.keyword} next page failed: {e}")
+            return None
+
+        # 마지막 페이지에는 다음 페이지 토큰이 없음
+        try:
+            search.click_tracking_params = initial_data_json[
                 "onResponseReceivedCommands"][0][
                 "clickTrackingParams"]
 
-            self.continuation_command = initial_data_json[
+            search.continuation_command = initial_data_json[
                 "onResponseReceivedCommands"][0][
                 "appendContinuationItemsAction"][
                 "continuationItems"][1][
@@ -346,60 +274,56 @@ class Scraper:
                 "continuationEndpoint"][
                 "continuationCommand"][
                 "token"]
-
-            self.post_json["continuation"] = self.continuation_command
-
-            # 데이터 가져오기
-            youtube_list_json = initial_data_json["onResponseReceivedCommands"][0][
-                "appendContinuationItemsAction"][
-                "continuationItems"][0][
-                "itemSectionRenderer"][
-                "contents"]
-            return youtube_list_json
         except:
-            pass
-    def _api_search_page_next(self, key: str):
+            search.continuation_command = ""
+        return youtube_list_json
+
+    def _api_search_page_next(self, key: str, post_json: dict):
         try:
-            session = requests.Session()
-            session.cookies.clear()
-            res = session.post(
+            res = retry_engine.call(YOUTUBE_HOST, lambda: requests.post(
                 f"https://www.youtube.com/youtubei/v1/search?key={key}&prettyPrint=false",
                 headers={
                     "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
                     "accept-language": "ko-KR,ko;q=0.9",
                     "content-type": "application/json; charset=UTF-8",
                 },
-                json=self.post_json,
-            )
+                json=post_json,
+                timeout=HTTP_TIMEOUT,
+            ), retry_on=(requests.RequestException,))
 
+            # api key / context 가 만료되었으면 다음 검색부터 새로 받아 사용
+            invalidate_on_auth_failure(key, res.status_code)
             if res.status_code != 200:
                 raise Exception("stauts code error")
 
             return json.loads(res.content)
         except:
-            self._api_search_page_next(key=key)
-    def search_list(self, keyword: str, limit: int = 200):
-        youtube_list = self.first_page_setting(keyword=keyword)
-        self.scrape_page_list(youtube_list, limit=limit)
-        while len(self.result) < limit:
-            youtube_list = self._get_next_page()
-            self.scrape_page_list(youtube_list, limit=limit)
-        self.logger.info(f"keyword: {keyword} limit: {limit} result: {len(self.result)}")
-        return self.result
+            raise Exception("api 실패")
+
+    def search_list(self, keyword: str, limit: int = 200, mode: str = 'full', enrich: bool = False,
+                    on_result=None):
+        """on_result 를 주면 결과를 하나 만들 때마다 바로 호출 (스트리밍 응답용)"""
+        search = SearchContext(keyword)
+        youtube_list = self.first_page_setting(search)
+        self.scrape_page_list(search, youtube_list, limit=limit, mode=mode, enrich=enrich, on_result=on_result)
+        while len(search.result) < limit and search.continuation_command:
+            youtube_list = self._get_next_page(search)
+            # 더 이상 결과가 없으면 중단
+            if not youtube_list:
+                break
+            self.scrape_page_list(search, youtube_list, limit=limit, mode=mode, enrich=enrich, on_result=on_result)
+        self.logger.info(f"keyword: {keyword} limit: {limit} result: {len(search.result)}")
+        return search.result
 
 
 if __name__ == "__main__":
     api = Scraper()
-    # youtube_list = api.first_page_setting(keyword="떡볶이")
-    # result = api.scrape_page_list(youtube_list)
-    # # 다음 페이지 가져오기
-    # youtube_list2 = api._get_next_page()
-    # result2 = api.scrape_page_list(youtube_list2)
+    # youtube_list = api.first_page_setting(SearchContext("떡볶이"))
 
     result = api.search_list(keyword="검은콩", limit=400)
 
     # 다음 페이지를 위한 파라메터 저장
 
-    
+
     with open("result.json", 'w', encoding='utf-8') as json_file:
-        json.dump(result, json_file, ensure_ascii=False, indent=4)
\ No newline at end of file
+        json.dump(result, json_file, ensure_ascii=False, indent=4)
@@ -1,8 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from crawler import Crawler
 from api import Scraper
+from async_api import AsyncScraper, SEARCH_MODE
+from streaming import iterate_in_thread, keyword_events, merge, negotiate, stream_response
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import os
 
 import re
 import time
@@ -11,37 +14,69 @@ from datetime import datetime
 
 app = FastAPI()
 executor = ThreadPoolExecutor(max_workers=4)
+# async: 공유 HTTP/2 커넥션 위에서 상세 정보 동시 요청 (기본값), sync: 기존 api.Scraper 순차 요청
+YOUTUBE_CLIENT = os.environ.get('YOUTUBE_CLIENT', 'async')
+# 요청 하나에서 동시에 검색할 최대 키워드 수 (sync 는 executor 워커 수로도 제한됨)
+KEYWORD_CONCURRENCY = int(os.environ.get('YOUTUBE_KEYWORD_CONCURRENCY', '4'))
+scraper = Scraper()
+async_scraper = AsyncScraper()
 
-def youtube_task(keyword:str, limit:int):
-    keyword = keyword.split(',')
-    result = []
-    scraper = Scraper()
-    for index, keyword in enumerate(keyword):
-        data = {
+async def youtube_task(keywords:str, limit:int, mode:str=SEARCH_MODE, enrich:bool=False):
+    """쉼표로 구분한 키워드를 동시에 검색 (검색별 상태가 분리되어 있어 키워드 사이에 결과가 섞이지 않음)"""
+    loop = asyncio.get_event_loop()
+    semaphore = asyncio.Semaphore(KEYWORD_CONCURRENCY)
+
+    async def search(keyword:str):
+        async with semaphore:
+            if YOUTUBE_CLIENT == 'async':
+                result = await async_scraper.search_list(keyword=keyword, limit=limit, mode=mode, enrich=enrich)
+            else:
+                result = await loop.run_in_executor(executor, scraper.search_list, keyword, limit, mode, enrich)
+        return {
             'keyword':keyword,
-            'result':scraper.search_list(keyword=keyword, limit=limit)
+            'result':result
         }
-        # print(f'{index}   {data}')
-        result.append(data)
-    if len(result) == 0 :
-        for index, keyword in enumerate(keyword):
-            data = {
-                'keyword':keyword,
-                'result':scraper.search_list(keyword=keyword, limit=limit)
-            }
-            # print(f'{index}   {data}')
-            result.append(data)
-    return result
+
+    return await asyncio.gather(*(search(keyword) for keyword in keywords.split(',')))
+
+def youtube_stream(keywords:str, limit:int, mode:str=SEARCH_MODE, enrich:bool=False):
+    """youtube_task 의 스트리밍 버전 (키워드별 결과를 도착하는 대로 이벤트로 반환)"""
+    def search(keyword:str):
+        if YOUTUBE_CLIENT == 'async':
+            items = async_scraper.iter_search(keyword=keyword, limit=limit, mode=mode, enrich=enrich)
+        else:
+            items = iterate_in_thread(executor, scraper.search_list, keyword, limit, mode, enrich)
+        return keyword_events(keyword, items)
+
+    return merge([search(keyword) for keyword in keywords.split(',')], KEYWORD_CONCURRENCY)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await async_scraper.aclose()
 
 @app.get("/search/youtube")
-async def search_youtube(keywords: str, limit:int=250):
-    loop = asyncio.get_event_loop()
+async def search_youtube(request: Request, keywords: str, limit:int=250, mode:str=SEARCH_MODE, enrich:bool=False):
+    """
+    mode=fast 이면 player 요청 없이 검색 결과 renderer 만으로 응답 (정확한 게시일 등은 빈 값)
+    enrich=true 이면 fast 모드에서 누락된 필드가 있는 결과만 상세 정보로 보강
+    Accept: application/x-ndjson 또는 text/event-stream 이면 결과를 하나씩 스트리밍 (streaming.py 참고)
+    """
+    media_type = negotiate(request)
+    if media_type is not None:
+        return stream_response(media_type, youtube_stream(keywords, limit, mode, enrich))
     try:
-        result = await loop.run_in_executor(executor, youtube_task, keywords, limit)
+        result = await youtube_task(keywords, limit, mode, enrich)
         return result
     except Exception as e:
         print(f'Error: {e}')
         return {'error':str(e)}
+
+@app.get("/stats")
+async def get_stats():
+    return {
+        'client': YOUTUBE_CLIENT,
+        'innertube': async_scraper.get_stats(),
+    }
     
 @app.middleware("http")
 async def log_requests(request, call_next):
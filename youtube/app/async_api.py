@@ -0,0 +1,374 @@
+"""
+YouTube InnerTube 비동기 클라이언트
+api.Scraper 와 같은 형식의 결과를 반환하지만, 검색 결과마다 requests 세션을 새로 만들어
+/youtubei/v1/player 를 순차로 호출하지 않는다.
+
+- 하나의 httpx.AsyncClient (HTTP/2, h2 미설치 시 HTTP/1.1 keep-alive) 커넥션 풀을 프로세스 전체에서 공유
+- 상세 정보(player) 요청은 세마포어로 동시 요청 수를 제한하여 병렬로 전송
+- 다음 페이지(continuation)는 별도 작업이 앞서 받아 두고(최대 PREFETCH_PAGES), 페이지가 도착하는 대로
+  상세 정보 요청을 시작하며 결과를 순서대로 하나씩 내보냄 (iter_search), limit 에 도달하면 즉시 중단
+- api key / context 는 innertube_config.bootstrap_cache 에서 재사용하고, 첫 페이지는 검색 결과 HTML 대신
+  /youtubei/v1/search 에 query 로 바로 요청 (INNERTUBE_DIRECT_SEARCH=0 이면 검색 결과 HTML 의 ytInitialData 를 ytdata 로 추출)
+- 요청 실패(연결 오류, 429/5xx)는 retry.retry_engine 의 백오프/호스트별 예산에 따라 재시도
+- fast 모드: player 요청 없이 검색 응답의 renderer 만으로 결과를 만들고,
+  enrich 옵션이 있으면 누락된 필드(정확한 게시일 등)가 있는 결과만 상세 정보로 보강
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, List, Optional, Tuple, Union
+
+import httpx
+
+from innertube_config import (AUTH_FAILURE_STATUSES, BOOTSTRAP_URL, HEADERS, YOUTUBE_HOST, InnerTubeConfig,
+                              bootstrap_cache, build_detail_payload)
+from renderer import merge_missing, missing_fields, parse_renderer
+from retry import retry_engine
+from ytdata import InitialDataNotFound, search_contents
+
+# 동시에 진행할 최대 player 요청 수 (프로세스 전체)
+DETAIL_CONCURRENCY = int(os.environ.get('YOUTUBE_DETAIL_CONCURRENCY', '16'))
+HTTP_TIMEOUT = float(os.environ.get('YOUTUBE_HTTP_TIMEOUT', '20'))
+MAX_CONNECTIONS = int(os.environ.get('YOUTUBE_MAX_CONNECTIONS', '20'))
+# h2 패키지가 있을 때만 HTTP/2 사용
+HTTP2_ENABLED = (
+    os.environ.get('YOUTUBE_HTTP2', '1') != '0'
+    and importlib.util.find_spec('h2') is not None
+)
+# full: 결과마다 player 요청 (기본값), fast: 검색 응답의 renderer 만 사용
+SEARCH_MODE = os.environ.get('YOUTUBE_SEARCH_MODE', 'full')
+SEARCH_MODES = ('full', 'fast')
+# 결과를 내보내는 동안 미리 받아 둘 최대 continuation 페이지 수
+PREFETCH_PAGES = int(os.environ.get('YOUTUBE_PREFETCH_PAGES', '2'))
+DIRECT_SEARCH = os.environ.get('INNERTUBE_DIRECT_SEARCH', '1') != '0'
+
+YOUTUBE_URL = "https://www.youtube.com"
+
+class InnerTubeError(Exception):
+    """InnerTube 요청/응답 처리 실패"""
+
+
+class InnerTubeAuthError(InnerTubeError):
+    """api key / context 만료로 인한 요청 거부"""
+
+
+def parse_search_response(data: dict) -> Tuple[list, str]:
+    """ytInitialData 또는 search API 첫 페이지 응답에서 (결과 목록, 다음 페이지 토큰) 추출"""
+    try:
+        contents = data["contents"]["twoColumnSearchResultsRenderer"][
+            "primaryContents"]["sectionListRenderer"]["contents"]
+    except (KeyError, TypeError):
+        raise InnerTubeError("search results not found in response")
+    return _split_contents(contents)
+
+
+def parse_next_page(response: dict) -> Tuple[list, str]:
+    """continuation 응답에서 (결과 목록, 다음 페이지 토큰) 추출"""
+    try:
+        continuation_items = response["onResponseReceivedCommands"][0][
+            "appendContinuationItemsAction"]["continuationItems"]
+    except (KeyError, IndexError, TypeError):
+        return [], ""
+    return _split_contents(continuation_items)
+
+
+def _split_contents(contents: list) -> Tuple[list, str]:
+    """sectionListRenderer/continuationItems 에서 itemSectionRenderer 결과와 continuation 토큰 분리"""
+    items = []
+    token = ""
+    for content in contents:
+        if "itemSectionRenderer" in content:
+            items.extend(content["itemSectionRenderer"].get("contents", []))
+        elif "continuationItemRenderer" in content:
+            try:
+                token = content["continuationItemRenderer"]["continuationEndpoint"][
+                    "continuationCommand"]["token"]
+            except KeyError:
+                pass
+    return items, token
+
+
+def collect_renderers(items: list, remaining: int) -> List[Tuple[str, dict]]:
+    """결과 목록에서 상세 정보를 요청할 (종류, renderer) 목록을 최대 remaining 개 추출"""
+    renderers = []
+    for item in items:
+        if len(renderers) >= remaining:
+            break
+        if "videoRenderer" in item:
+            renderers.append(("video", item["videoRenderer"]))
+        elif "reelShelfRenderer" in item:
+            for short in item["reelShelfRenderer"].get("items", []):
+                if len(renderers) >= remaining:
+                    break
+                if "reelItemRenderer" in short:
+                    renderers.append(("shorts", short["reelItemRenderer"]))
+        elif "reelItemRenderer" in item:
+            renderers.append(("shorts", item["reelItemRenderer"]))
+    return renderers
+
+
+def format_detail(kind: str, video_id: str, response: Optional[dict]) -> dict:
+    """player 응답을 api.Scraper 와 같은 형식의 결과로 변환 (실패 시 빈 값)"""
+    response = response or {}
+    video_details = response.get("videoDetails", {})
+    microformat = response.get("microformat", {}).get("playerMicroformatRenderer", {})
+    if kind == "video":
+        return {
+            "VideoID"       : video_id,
+            "type"          : "video",
+            "title"         : video_details.get("title", ""),
+            "description"   : video_details.get("shortDescription", ""),
+            "viewCount"     : video_details.get("viewCount", 0),
+            "author"        : video_details.get("author", ""),
+            "publishDate"   : microformat.get("publishDate", ""),
+        }
+    return {
+        "videoId"     : video_id,
+        "title"       : video_details.get("title", ""),
+        "type"        : "shorts",
+        "description" : video_details.get("shortDescription", ""),
+        "view_count"  : microformat.get("viewCount", 0),
+        "author"      : video_details.get("author", ""),
+        "publish_date": microformat.get("publishDate", ""),
+    }
+
+
+class AsyncScraper:
+    """프로세스 전체에서 공유하는 InnerTube 비동기 검색 클라이언트
+
+    검색별 상태는 search_list 호출 안에서만 유지하므로, 하나의 인스턴스로 여러 키워드를 동시에 처리할 수 있다.
+    """
+
+    def __init__(self, detail_concurrency: int = DETAIL_CONCURRENCY):
+        self.logger = logging.getLogger('uvicorn')
+        self.detail_concurrency = detail_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = {
+            'searches': 0,
+            'search_pages': 0,
+            'html_pages': 0,
+            'continuation_pages': 0,
+            'detail_requests': 0,
+            'detail_failures': 0,
+            'fast_results': 0,
+            'enriched_results': 0,
+            'detail_time_total': 0.0,
+            'first_results': 0,
+            'first_result_time_total': 0.0,
+        }
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_ENABLED,
+                headers=HEADERS,
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.detail_concurrency)
+        return self._client
+
+    async def _fetch_page(self, url: str, params: Optional[dict] = None, raw: bool = False) -> Union[str, bytes]:
+        """GET 요청 (raw 이면 디코딩하지 않은 bytes 반환)"""
+        client = self._get_client()
+        try:
+            res = await retry_engine.call_async(
+                YOUTUBE_HOST, lambda: client.get(url, params=params), retry_on=(httpx.HTTPError,)
+            )
+        except httpx.HTTPError as e:
+            raise InnerTubeError(f"page request failed: {e}")
+        if res.status_code != 200:
+            raise InnerTubeError(f"page status {res.status_code}")
+        self._stats['html_pages'] += 1
+        return res.content if raw else res.text
+
+    async def _fetch_bootstrap_html(self) -> str:
+        return await self._fetch_page(BOOTSTRAP_URL)
+
+    async def _post(self, endpoint: str, config: InnerTubeConfig, payload: dict) -> dict:
+        client = self._get_client()
+        # 기존 Scraper 와 같이 이전 요청의 쿠키를 실어 보내지 않음
+        client.cookies.clear()
+        res = await retry_engine.call_async(YOUTUBE_HOST, lambda: client.post(
+            f"{YOUTUBE_URL}/youtubei/v1/{endpoint}",
+            params={"key": config.api_key, "prettyPrint": "false"},
+            json=payload,
+        ), retry_on=(httpx.HTTPError,))
+        if res.status_code in AUTH_FAILURE_STATUSES:
+            # 다음 요청부터 새 api key / context 를 받아 사용
+            bootstrap_cache.invalidate(config)
+            raise InnerTubeAuthError(f"{endpoint} status {res.status_code}")
+        if res.status_code != 200:
+            raise InnerTubeError(f"{endpoint} status {res.status_code}")
+        return res.json()
+
+    async def _fetch_first_page(self, keyword: str) -> Tuple[InnerTubeConfig, list, str]:
+        """첫 검색 페이지의 (config, 결과 목록, 다음 페이지 토큰)"""
+        if not DIRECT_SEARCH:
+            config = await bootstrap_cache.get_async(self._fetch_bootstrap_html)
+            page = await self._fetch_page(f"{YOUTUBE_URL}/results", {"search_query": keyword}, raw=True)
+            try:
+                items, token = _split_contents(search_contents(page))
+            except InitialDataNotFound as e:
+                raise InnerTubeError(f"search page parse failed: {e}")
+            return config, items, token
+
+        # 캐시된 값이 만료되어 거부되면 부트스트랩을 다시 받아 한 번 재시도
+        for _ in range(2):
+            config = await bootstrap_cache.get_async(self._fetch_bootstrap_html)
+            try:
+                response = await self._post("search", config, {"context": config.context, "query": keyword})
+            except InnerTubeAuthError:
+                continue
+            self._stats['search_pages'] += 1
+            items, token = parse_search_response(response)
+            return config, items, token
+        raise InnerTubeError("search request rejected after bootstrap refresh")
+
+    async def _fetch_next_page(self, config: InnerTubeConfig, token: str) -> Tuple[list, str]:
+        try:
+            response = await self._post("search", config, {"context": config.context, "continuation": token})
+        except (httpx.HTTPError, InnerTubeError, ValueError) as e:
+            self.logger.warning(f"[INNERTUBE] Continuation request failed: {e}")
+            return [], ""
+        self._stats['continuation_pages'] += 1
+        return parse_next_page(response)
+
+    async def _fetch_detail(self, config: InnerTubeConfig, kind: str, renderer: dict,
+                            referer: str) -> dict:
+        video_id = renderer.get("videoId", "")
+        response = None
+        start_time = time.monotonic()
+        try:
+            payload = build_detail_payload(config.context, kind, renderer, referer)
+            async with self._semaphore:
+                response = await self._post("player", config, payload)
+        except (httpx.HTTPError, InnerTubeError, KeyError, ValueError) as e:
+            self._stats['detail_failures'] += 1
+            self.logger.error(f"[INNERTUBE] {kind} detail failed for {video_id}: {e}")
+        finally:
+            self._stats['detail_requests'] += 1
+            self._stats['detail_time_total'] += time.monotonic() - start_time
+        return format_detail(kind, video_id, response)
+
+    async def _fast_result(self, config: InnerTubeConfig, kind: str, renderer: dict,
+                           referer: str, enrich: bool) -> dict:
+        record = parse_renderer(kind, renderer)
+        self._stats['fast_results'] += 1
+        if enrich and missing_fields(record):
+            detail = await self._fetch_detail(config, kind, renderer, referer)
+            merge_missing(record, detail)
+            self._stats['enriched_results'] += 1
+        return record
+
+    async def _build_result(self, config: InnerTubeConfig, kind: str, renderer: dict, referer: str,
+                            mode: str, enrich: bool) -> dict:
+        if mode == 'fast':
+            return await self._fast_result(config, kind, renderer, referer, enrich)
+        return await self._fetch_detail(config, kind, renderer, referer)
+
+    async def _produce_pages(self, config: InnerTubeConfig, items: list, token: str, limit: int,
+                             pages: asyncio.Queue):
+        """continuation 토큰을 앞서 따라가며 페이지별 (종류, renderer) 목록을 큐에 넣음 (끝나면 None)
+
+        큐 크기(PREFETCH_PAGES)만큼만 앞서 가고, limit 개의 renderer 를 모으면 더 요청하지 않는다.
+        """
+        collected = 0
+        try:
+            while True:
+                renderers = collect_renderers(items, limit - collected)
+                collected += len(renderers)
+                if renderers:
+                    await pages.put(renderers)
+                if collected >= limit or not token:
+                    break
+                items, token = await self._fetch_next_page(config, token)
+                if not items:
+                    break
+        except Exception as e:
+            self.logger.error(f"[INNERTUBE] Page producer failed: {e}")
+        await pages.put(None)
+
+    async def iter_search(self, keyword: str, limit: int = 200, mode: str = SEARCH_MODE,
+                          enrich: bool = False) -> AsyncIterator[dict]:
+        """키워드 검색 결과를 limit 개까지 검색 순서대로 하나씩 반환
+
+        다음 페이지는 별도 작업이 앞서 받아 두고, 페이지가 도착하는 대로 상세 정보 요청을 시작한다.
+        호출자가 중간에 멈추면(limit 도달, 연결 종료) 진행 중인 페이지/상세 정보 요청을 모두 취소한다.
+
+        Args:
+            mode: 'full' 이면 결과마다 player 요청, 'fast' 이면 renderer 만으로 결과 생성
+            enrich: fast 모드에서 누락된 필드가 있는 결과만 player 요청으로 보강
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}'")
+        self._stats['searches'] += 1
+        start_time = time.monotonic()
+        config, items, token = await self._fetch_first_page(keyword)
+        referer = f"{YOUTUBE_URL}/results?search_query={keyword}"
+
+        pages: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_PAGES)
+        producer = asyncio.ensure_future(self._produce_pages(config, items, token, limit, pages))
+        pending: Deque[asyncio.Future] = deque()
+        finished = False
+        first = True
+        try:
+            while pending or not finished:
+                # 다음 페이지가 도착해 있거나 내보낼 결과가 없으면 페이지를 받아 상세 정보 요청 시작
+                if not finished and (not pending or not pages.empty()):
+                    renderers = await pages.get()
+                    if renderers is None:
+                        finished = True
+                        continue
+                    for kind, renderer in renderers:
+                        pending.append(asyncio.ensure_future(
+                            self._build_result(config, kind, renderer, referer, mode, enrich)
+                        ))
+                    continue
+                result = await pending.popleft()
+                if first:
+                    first = False
+                    self._stats['first_results'] += 1
+                    self._stats['first_result_time_total'] += time.monotonic() - start_time
+                yield result
+        finally:
+            producer.cancel()
+            for task in pending:
+                task.cancel()
+
+    async def search_list(self, keyword: str, limit: int = 200, mode: str = SEARCH_MODE,
+                          enrich: bool = False) -> list:
+        """키워드 검색 결과를 limit 개까지 리스트로 반환 (iter_search 참고)"""
+        result = [item async for item in self.iter_search(keyword, limit, mode, enrich)]
+        self.logger.info(f"keyword: {keyword} limit: {limit} mode: {mode} result: {len(result)}")
+        return result
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        detail_time_total = stats.pop('detail_time_total')
+        requests_done = stats['detail_requests']
+        stats['avg_detail_ms'] = round(detail_time_total / requests_done * 1000, 1) if requests_done > 0 else 0.0
+        first_result_time_total = stats.pop('first_result_time_total')
+        first_results = stats.pop('first_results')
+        stats['avg_first_result_ms'] = (
+            round(first_result_time_total / first_results * 1000, 1) if first_results > 0 else 0.0
+        )
+        stats['detail_concurrency'] = self.detail_concurrency
+        stats['http2'] = HTTP2_ENABLED
+        stats['direct_search'] = DIRECT_SEARCH
+        stats['bootstrap'] = bootstrap_cache.get_stats()
+        stats['retries'] = retry_engine.get_stats()
+        return stats
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
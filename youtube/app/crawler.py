@@ -5,6 +5,14 @@ import json
 import time
 import traceback
 
+from innertube_config import invalidate_on_auth_failure, search_first_page
+from retry import retry_engine
+from ytdata import load_initial_data
+
+YOUTUBE_HOST = "www.youtube.com"
+# 요청 하나의 최대 대기 시간 (초), 실패 시 재시도는 retry_engine 이 담당
+HTTP_TIMEOUT = 20
+
 
 class Crawler:
     def __init__(self):
@@ -66,10 +74,7 @@ class Crawler:
             self.post_json["context"] = config_data
             self.detail_json["context"] = config_data
             # 결과 json으로 변형
-            initial_data = res.split("ytInitialData = ")[1]
-            splited = initial_data.split(";</script>")
-            initial_data_json_raw = splited[0]
-            initial_data_json = json.loads(initial_data_json_raw)
+            initial_data_json = load_initial_data(res)
 
             # 다음 페이지 정보 가져오기
             try:
@@ -114,29 +119,12 @@ class Crawler:
 
     def get_info_by_keyword(self, keyword: str, limit: int, sleep_sec: float = 1.5):
         try:
-            # first page api 요청
-            res = self._api_search_page(keyword=keyword)
-
-            # api key 가져오기
-            api_key_raw_start = res.find("INNERTUBE_API_KEY")
-            api_key_raw = res[api_key_raw_start : api_key_raw_start + 130]
-            startPoint = api_key_raw.find(":")
-            endPoint = api_key_raw.find(",")
-            self.api_key = api_key_raw[startPoint + 2 : endPoint - 1]
-
-            # 설정파일 만들기.
-            startPoint = res.find("INNERTUBE_CONTEXT") + 2 + len("INNERTUBE_CONTEXT")
-            endPoint = res.find("INNERTUBE_CONTEXT_CLIENT_NAME") - 2
-            config_data_raw = res[startPoint:endPoint]
-            config_data = json.loads(config_data_raw)
+            # first page api 요청 (캐시된 api key / context 로 검색 결과 HTML 없이 search API 에 바로 요청)
+            config, context, initial_data_json = search_first_page(keyword)
+            self.api_key = config.api_key
             # context에 넣기
-            self.post_json["context"] = config_data
-            self.detail_json["context"] = config_data
-            # 결과 json으로 변형
-            initial_data = res.split("ytInitialData = ")[1]
-            splited = initial_data.split(";</script>")
-            initial_data_json_raw = splited[0]
-            initial_data_json = json.loads(initial_data_json_raw)
+            self.post_json["context"] = context
+            self.detail_json["context"] = context
 
             # 다음 페이지 정보 가져오기
             try:
@@ -483,28 +471,26 @@ class Crawler:
 
     def _api_search_page(self, keyword: str):
         try:
-            res = requests.get(
+            res = retry_engine.call(YOUTUBE_HOST, lambda: requests.get(
                 f"https://www.youtube.com/results?search_query={keyword}",
                 headers={
                     "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
                     "accept-language": "ko-KR,ko;q=0.9",
                     "content-type": "text/html; charset=utf-8",
                 },
-            )
+                timeout=HTTP_TIMEOUT,
+            ), retry_on=(requests.RequestException,))
 
             if res.status_code != 200:
                 raise Exception("stauts code error")
             
             return res.content.decode("utf-8")
         except:
-            # raise Exception("api 실패")
-            self._api_search_page(keyword=keyword)
+            raise Exception("api 실패")
 
     def _api_detail_page(self, key):
         try:
-            session = requests.Session()
-            session.cookies.clear()
-            res = session.post(
+            res = retry_engine.call(YOUTUBE_HOST, lambda: requests.post(
                 f"https://www.youtube.com/youtubei/v1/player?key={key}&prettyPrint=false",
                 headers={
                     "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
@@ -512,8 +498,11 @@ class Crawler:
                     "content-type": "application/json; charset=UTF-8",
                 },
                 json=self.detail_json,
-            )
+                timeout=HTTP_TIMEOUT,
+            ), retry_on=(requests.RequestException,))
 
+            # api key / context 가 만료되었으면 다음 검색부터 새로 받아 사용
+            invalidate_on_auth_failure(key, res.status_code)
             if res.status_code != 200:
                 raise Exception("stauts code error")
 
@@ -523,9 +512,7 @@ class Crawler:
 
     def _api_search_page_next(self, key: str):
         try:
-            session = requests.Session()
-            session.cookies.clear()
-            res = session.post(
+            res = retry_engine.call(YOUTUBE_HOST, lambda: requests.post(
                 f"https://www.youtube.com/youtubei/v1/search?key={key}&prettyPrint=false",
                 headers={
                     "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
@@ -533,20 +520,21 @@ class Crawler:
                     "content-type": "application/json; charset=UTF-8",
                 },
                 json=self.post_json,
-            )
+                timeout=HTTP_TIMEOUT,
+            ), retry_on=(requests.RequestException,))
 
+            # api key / context 가 만료되었으면 다음 검색부터 새로 받아 사용
+            invalidate_on_auth_failure(key, res.status_code)
             if res.status_code != 200:
                 raise Exception("stauts code error")
 
             return json.loads(res.content)
         except:
-            self._api_search_page_next(key=key)
+            raise Exception("api 실패")
         
     def _api_detail_comment(self, key:str):
         try:
-            session = requests.Session()
-            session.cookies.clear()
-            res = session.post(
+            res = retry_engine.call(YOUTUBE_HOST, lambda: requests.post(
                 # f"https://www.youtube.com/youtubei/v1/player?key={key}&prettyPrint=false",
                 f"https://www.youtube.com/youtubei/v1/next?key={key}&prettyPrint=false",
                 headers={
@@ -555,8 +543,11 @@ class Crawler:
                     "content-type": "application/json; charset=UTF-8",
                 },
                 json=self.detail_json,
-            )
+                timeout=HTTP_TIMEOUT,
+            ), retry_on=(requests.RequestException,))
 
+            # api key / context 가 만료되었으면 다음 검색부터 새로 받아 사용
+            invalidate_on_auth_failure(key, res.status_code)
             if res.status_code != 200:
                 raise Exception("stauts code error")
 
@@ -566,9 +557,7 @@ class Crawler:
         
     def _api_comments(self, key:str):
         try:
-            session = requests.Session()
-            session.cookies.clear()
-            res = session.post(
+            res = retry_engine.call(YOUTUBE_HOST, lambda: requests.post(
                 f"https://www.youtube.com/youtubei/v1/next?key={key}&prettyPrint=false",
                 headers={
                     "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
@@ -576,8 +565,11 @@ class Crawler:
                     "content-type": "application/json; charset=UTF-8",
                 },
                 json=self.comment_json,
-            )
+                timeout=HTTP_TIMEOUT,
+            ), retry_on=(requests.RequestException,))
 
+            # api key / context 가 만료되었으면 다음 검색부터 새로 받아 사용
+            invalidate_on_auth_failure(key, res.status_code)
             if res.status_code != 200:
                 raise Exception("status code error")
 
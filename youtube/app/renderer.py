@@ -0,0 +1,86 @@
+"""
+검색/continuation 응답의 renderer JSON 에서 결과 필드 추출 (fast 모드)
+videoRenderer 에는 제목, 채널명, 조회수, 게시 시점이 이미 들어 있으므로 /youtubei/v1/player 를 호출하지 않고 결과를 만든다.
+
+- 결과 형식은 player 응답 기반 결과(api.Scraper, async_api.format_detail)와 같은 키를 사용
+- 정확한 게시일, 축약된 조회수(예: '조회수 5만회'), 쇼츠 채널명/설명처럼 renderer 에 없는 값은 빈 값으로 두고
+  missing_fields() 로 알려, 필요한 경우에만 상세 정보 요청으로 채운다
+- 상대 게시 시점(예: '3일 전')은 publishedTime 필드로 추가 제공
+"""
+import re
+from typing import List, Optional
+
+# 축약 표기 단위 (정확한 조회수가 아니므로 상세 정보로 보강 대상)
+_ABBREVIATED_COUNT = re.compile(r'[0-9.,]+\s*(천|만|억|K|M|B)', re.IGNORECASE)
+
+# 종류별 결과 필드 (빈 값이면 누락으로 간주)
+VIDEO_FIELDS = ("title", "description", "viewCount", "author", "publishDate")
+SHORTS_FIELDS = ("title", "description", "view_count", "author", "publish_date")
+
+
+def text_of(node: Optional[dict]) -> str:
+    """simpleText 또는 runs 형식의 텍스트 노드를 문자열로 변환"""
+    if not node:
+        return ""
+    if "simpleText" in node:
+        return node["simpleText"]
+    return "".join(run.get("text", "") for run in node.get("runs", []))
+
+
+def parse_view_count(text: str) -> int:
+    """'조회수 1,234회' 같은 정확한 조회수 텍스트를 정수로 변환 (축약 표기이거나 숫자가 없으면 0)"""
+    if not text or _ABBREVIATED_COUNT.search(text):
+        return 0
+    digits = re.sub(r'[^0-9]', '', text)
+    return int(digits) if digits else 0
+
+
+def parse_video_renderer(renderer: dict) -> dict:
+    """videoRenderer 를 동영상 결과로 변환"""
+    snippets = renderer.get("detailedMetadataSnippets") or [{}]
+    view_count = parse_view_count(text_of(renderer.get("viewCountText")))
+    return {
+        "VideoID"       : renderer.get("videoId", ""),
+        "type"          : "video",
+        "title"         : text_of(renderer.get("title")),
+        "description"   : text_of(snippets[0].get("snippetText")),
+        # player 응답과 같이 문자열로 반환
+        "viewCount"     : str(view_count) if view_count else 0,
+        "author"        : text_of(renderer.get("ownerText") or renderer.get("longBylineText")),
+        "publishDate"   : "",
+        "publishedTime" : text_of(renderer.get("publishedTimeText")),
+    }
+
+
+def parse_reel_renderer(renderer: dict) -> dict:
+    """reelItemRenderer 를 쇼츠 결과로 변환"""
+    return {
+        "videoId"       : renderer.get("videoId", ""),
+        "title"         : text_of(renderer.get("headline")),
+        "type"          : "shorts",
+        "description"   : "",
+        "view_count"    : parse_view_count(text_of(renderer.get("viewCountText"))),
+        "author"        : "",
+        "publish_date"  : "",
+        "publishedTime" : text_of(renderer.get("publishedTimeText")),
+    }
+
+
+def parse_renderer(kind: str, renderer: dict) -> dict:
+    if kind == "video":
+        return parse_video_renderer(renderer)
+    return parse_reel_renderer(renderer)
+
+
+def missing_fields(record: dict) -> List[str]:
+    """renderer 만으로 채우지 못한 필드 목록"""
+    fields = VIDEO_FIELDS if record.get("type") == "video" else SHORTS_FIELDS
+    return [field for field in fields if not record.get(field)]
+
+
+def merge_missing(record: dict, detail: dict) -> dict:
+    """상세 정보 결과로 누락된 필드만 채움"""
+    for field in missing_fields(record):
+        if detail.get(field):
+            record[field] = detail[field]
+    return record
@@ -0,0 +1,164 @@
+"""
+스트리밍 응답 (NDJSON / SSE)
+목록을 모두 모은 뒤 JSON 하나로 응답하지 않고, 결과가 파싱되는 대로 이벤트 하나씩 바로 내보낸다.
+요청의 Accept 헤더가 application/x-ndjson 또는 text/event-stream 일 때만 사용하고, 그 외에는 기존 JSON 응답.
+
+이벤트
+- item : {"keyword": 키워드, "item": 결과 하나}
+- done : {"keyword": 키워드, "count": 해당 키워드 결과 수}
+- error: {"keyword": 키워드, "error": 메시지} (전체 타임아웃은 keyword 없이 전송, 그 전에 보낸 결과는 유효)
+- end  : {"count": 전체 결과 수} 스트림의 마지막 이벤트
+
+NDJSON 은 한 줄에 {"event": 이벤트 이름, ...데이터}, SSE 는 event: / data: 필드로 보낸다.
+"""
+import asyncio
+import functools
+import json
+import threading
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+NDJSON = 'application/x-ndjson'
+SSE = 'text/event-stream'
+STREAM_MEDIA_TYPES = (NDJSON, SSE)
+# 프록시(nginx)가 응답을 모아서 보내지 않도록
+STREAM_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no',
+}
+
+Event = Tuple[str, dict]
+
+_DONE = object()
+
+
+class StreamCancelled(BaseException):
+    """스트림을 받던 쪽이 중단됨
+
+    크롤러 내부의 except Exception 에 잡혀 작업이 계속되지 않도록 BaseException 을 상속한다.
+    """
+
+
+def negotiate(request: Request) -> Optional[str]:
+    """Accept 헤더에 스트리밍 형식이 있으면 그 media type, 없으면 None"""
+    accept = request.headers.get('accept', '')
+    for media_type in STREAM_MEDIA_TYPES:
+        if media_type in accept:
+            return media_type
+    return None
+
+
+def encode_event(media_type: str, event: str, data: dict) -> bytes:
+    if media_type == SSE:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8')
+    return (json.dumps({'event': event, **data}, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+async def iterate_in_thread(executor: Executor, func: Callable[..., Any], *args: Any) -> AsyncIterator[dict]:
+    """동기 함수 func(*args, on_result=콜백) 를 executor 에서 실행하며 콜백으로 넘어온 결과를 하나씩 반환
+
+    func 의 반환값은 사용하지 않는다. 호출자가 중간에 멈추면(연결 종료, 타임아웃) 다음 결과를 넘길 때
+    StreamCancelled 를 발생시켜 작업 스레드를 멈춘다.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def on_result(item: dict):
+        if cancelled.is_set():
+            raise StreamCancelled()
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def finished(future: asyncio.Future):
+        # 중단된 작업의 예외(StreamCancelled 등)는 여기서 소비
+        if not future.cancelled():
+            future.exception()
+        queue.put_nowait(_DONE)
+
+    future = loop.run_in_executor(executor, functools.partial(func, *args, on_result=on_result))
+    future.add_done_callback(finished)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            yield item
+        future.result()
+    finally:
+        cancelled.set()
+
+
+async def keyword_events(keyword: str, items: AsyncIterator[dict]) -> AsyncIterator[Event]:
+    """키워드 하나의 결과를 item 이벤트로 바꾸고 마지막에 done (실패 시 error 후 done)"""
+    count = 0
+    try:
+        async for item in items:
+            count += 1
+            yield 'item', {'keyword': keyword, 'item': item}
+    except Exception as e:
+        yield 'error', {'keyword': keyword, 'error': str(e)}
+    yield 'done', {'keyword': keyword, 'count': count}
+
+
+async def merge(streams: List[AsyncIterator[Event]], concurrency: int) -> AsyncIterator[Event]:
+    """여러 스트림을 최대 concurrency 개씩 동시에 진행하며 도착 순서대로 반환"""
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def drain(stream: AsyncIterator[Event]):
+        try:
+            async with semaphore:
+                async for event in stream:
+                    await queue.put(event)
+        finally:
+            await stream.aclose()
+            queue.put_nowait(_DONE)
+
+    tasks = [asyncio.ensure_future(drain(stream)) for stream in streams]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            event = await queue.get()
+            if event is _DONE:
+                remaining -= 1
+                continue
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def stream_response(media_type: str, events: AsyncIterator[Event],
+                    timeout: Optional[float] = None) -> StreamingResponse:
+    """events 를 media_type 형식으로 바로바로 내보내는 응답
+
+    timeout(초)을 넘기면 error 이벤트를 보내고 종료한다 (이미 보낸 결과는 그대로 유효).
+    """
+    async def body():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        count = 0
+        try:
+            while True:
+                remaining = deadline - loop.time() if deadline is not None else None
+                try:
+                    event, data = await asyncio.wait_for(events.__anext__(), remaining)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    yield encode_event(media_type, 'error', {'error': 'The operation took too long and timed out.'})
+                    break
+                except Exception as e:
+                    yield encode_event(media_type, 'error', {'error': str(e)})
+                    break
+                if event == 'item':
+                    count += 1
+                yield encode_event(media_type, event, data)
+            yield encode_event(media_type, 'end', {'count': count})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(body(), media_type=media_type, headers=STREAM_HEADERS)
@@ -0,0 +1,78 @@
+"""
+ytInitialData 추출기
+검색 결과 HTML 전체를 split() 으로 여러 번 복사한 뒤 json.loads 하지 않고,
+JSON 이 시작/끝나는 위치(offset)만 찾아 원본 버퍼에서 바로 디코딩한다.
+
+- bytes: 끝 위치(';</script>')까지 memoryview 로 잘라 orjson 으로 디코딩 (복사 없음, orjson 미설치 시 json)
+- str: json.JSONDecoder.raw_decode 로 시작 위치부터 바로 디코딩 (끝 위치 탐색/복사 없음)
+- search_contents(): 결과 목록 경로(sectionListRenderer.contents)만 반환하고 나머지 트리는 바로 버림
+"""
+import json
+from typing import Any, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+Page = Union[bytes, bytearray, str]
+
+MARKERS = ("ytInitialData = ", 'window["ytInitialData"] = ')
+END_MARKER = ";</script>"
+SEARCH_CONTENTS_PATH = (
+    "contents", "twoColumnSearchResultsRenderer", "primaryContents", "sectionListRenderer", "contents",
+)
+
+_decoder = json.JSONDecoder()
+
+
+class InitialDataNotFound(ValueError):
+    """페이지에 ytInitialData 가 없음"""
+
+
+def find_span(page: Page) -> Tuple[int, int]:
+    """page 안에서 ytInitialData JSON 의 (시작, 끝) offset
+
+    str 은 raw_decode 가 끝을 스스로 찾으므로 끝 위치로 len(page) 를 반환한다.
+    """
+    is_text = isinstance(page, str)
+    for marker in MARKERS:
+        needle = marker if is_text else marker.encode()
+        index = page.find(needle)
+        if index < 0:
+            continue
+        start = index + len(needle)
+        if is_text:
+            return start, len(page)
+        end = page.find(END_MARKER.encode(), start)
+        if end < 0:
+            raise InitialDataNotFound("end of ytInitialData not found")
+        return start, end
+    raise InitialDataNotFound("ytInitialData not found")
+
+
+def load_initial_data(page: Page) -> dict:
+    """페이지 버퍼를 복사하지 않고 ytInitialData 디코딩"""
+    start, end = find_span(page)
+    if isinstance(page, str):
+        data, _ = _decoder.raw_decode(page, start)
+        return data
+    view = memoryview(page)[start:end]
+    if orjson is not None:
+        return orjson.loads(view)
+    return json.loads(bytes(view))
+
+
+def get_path(data: Any, path: Sequence[str]) -> Any:
+    """중첩된 딕셔너리에서 path 경로의 값 (없으면 InitialDataNotFound)"""
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            raise InitialDataNotFound(f"'{key}' not found in ytInitialData")
+    return data
+
+
+def search_contents(page: Page) -> list:
+    """검색 결과 페이지의 sectionListRenderer.contents 만 반환"""
+    return get_path(load_initial_data(page), SEARCH_CONTENTS_PATH)
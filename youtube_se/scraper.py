@@ -12,7 +12,7 @@ import pytz
 import time
 import datetime
 import traceback
-from bs4 import BeautifulSoup
+from parsing import parse_html
 import json
 import re
 import logging
@@ -37,7 +37,7 @@ class Scraper:
                 self.scroll_down(driver)
                 wait = WebDriverWait(driver, 10)
                 wait.until(EC.presence_of_all_elements_located((By.ID, 'thumbnail')))
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
+                soup = parse_html(driver.page_source)
                 dismiss = soup.find_all(id='dismissible')
                 for dis in dismiss:
                     try:
@@ -172,7 +172,7 @@ class Scraper:
         driver.get(url)
         wait = WebDriverWait(driver, 10)
         wait.until(EC.presence_of_element_located((By.ID, 'microformat')))
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = parse_html(driver.page_source)
         
         try:
             # title = soup.find(class_='ytp-title').text
@@ -219,7 +219,7 @@ class Scraper:
         wait = WebDriverWait(driver, 10)
         wait.until(EC.presence_of_element_located((By.ID, 'menu-button')))
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = parse_html(driver.page_source)
         videoid = driver.current_url.split('shorts/')[1]
         try:
             panel = soup.find(class_='short-video-container')